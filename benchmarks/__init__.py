@@ -0,0 +1,6 @@
+"""Benchmarks for `getdera`, run on synthetic DERA datasets.
+
+Run a benchmark from the repository root, e.g.:
+
+    python -m benchmarks.bench_schemas
+"""
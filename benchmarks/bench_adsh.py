@@ -0,0 +1,56 @@
+"""Reports memory footprint of accession number (adsh) keys and the
+speed of joining a synthetic NUM table to its SUB table, with adsh as
+strings, as categoricals (the default NUM schema) and encoded as int64
+(encode_adsh=True).
+
+    python -m benchmarks.bench_adsh --rows 5000000 --subs 50000
+"""
+
+import time
+import argparse
+import tempfile
+
+from getdera.dera import process
+from benchmarks.synthetic import make_notes_zip
+
+
+VARIANTS = {
+    'str': {'dtype': {'adsh': str}},
+    'category': {},
+    'int64': {'encode_adsh': True},
+}  # Variant : process kwargs of NUM table
+
+
+def main(rows: int, subs: int, repeat: int = 3):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        make_notes_zip(f'{tmpdir}/2020q2_notes.zip',
+                       n_sub=subs, n_num=rows, n_txt=0)
+        args = (tmpdir, 'statements')
+        dates = ('13-03-2020', '13-06-2020')
+        print(f'num.tsv: {rows} rows, sub.tsv: {subs} rows')
+        print(f'{"adsh":<10}{"sub index MB":>14}{"num adsh MB":>13}'
+              f'{"join s":>9}')
+        for variant, kwargs in VARIANTS.items():
+            sub = process(*args, 'sub', *dates, stream=True,
+                          columns=['name'],
+                          encode_adsh=variant == 'int64')
+            num = process(*args, 'num', *dates, stream=True,
+                          columns=['adsh', 'value'], **kwargs)
+            index_mb = sub.index.memory_usage(deep=True) / 1e6
+            adsh_mb = num['adsh'].memory_usage(deep=True, index=False) / 1e6
+            seconds = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                num.join(sub, on='adsh')
+                seconds.append(time.perf_counter() - start)
+            print(f'{variant:<10}{index_mb:>14.1f}{adsh_mb:>13.1f}'
+                  f'{min(seconds):>9.3f}')
+            del sub, num
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=2000000)
+    parser.add_argument('--subs', type=int, default=20000)
+    args = parser.parse_args()
+    main(args.rows, args.subs)
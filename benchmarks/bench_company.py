@@ -0,0 +1,52 @@
+"""Reports time of building a company index of a synthetic Financial
+Statements and Notes zipfile, and of processing a few companies' rows
+with `process(..., cik=[...])` compared to processing the full tables.
+
+    python -m benchmarks.bench_company --rows 5000000 --companies 3
+"""
+
+import time
+import argparse
+import tempfile
+
+from getdera.dera import process
+from getdera.company import CompanyIndex
+from benchmarks.synthetic import make_notes_zip
+
+
+def main(rows: int, companies: int):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        zipfile = make_notes_zip(f'{tmpdir}/2020q2_notes.zip', n_num=rows)
+        args = (tmpdir, 'statements')
+        dates = ('13-03-2020', '13-06-2020')
+        sub = process(*args, 'sub', *dates, stream=True)
+        cik = sub['cik'].iloc[:companies].tolist()
+
+        start = time.perf_counter()
+        CompanyIndex(tmpdir, 'statements').build(zipfile)
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        index = CompanyIndex(tmpdir, 'statements')
+        index.build(zipfile)
+        load = time.perf_counter() - start
+        print(f'num.tsv: {rows} rows; index built in {build:.2f}s, '
+              f'loaded in {load:.3f}s')
+
+        print(f'{"table":<8}{"rows":>8}{"cik s":>10}{"full s":>10}')
+        for table in ['sub', 'num', 'txt']:
+            start = time.perf_counter()
+            data = process(*args, table, *dates, cik=cik,
+                           company_index=index)
+            seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            process(*args, table, *dates, stream=True)
+            full = time.perf_counter() - start
+            print(f'{table:<8}{len(data):>8}{seconds:>10.3f}{full:>10.3f}')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=2000000)
+    parser.add_argument('--companies', type=int, default=3)
+    args = parser.parse_args()
+    main(args.rows, args.companies)
@@ -0,0 +1,105 @@
+"""Reports throughput and client CPU time of downloading a large file
+from a local HTTP server (in a separate process) with the former writer
+(fixed 128-byte chunks) and with `_get`'s writer, with and without
+hashing.
+
+    python -m benchmarks.bench_download --mb 512
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import tempfile
+import subprocess
+import urllib.request
+
+from requests_toolbelt import sessions
+
+from getdera.scrapper.client import _TokenBucket
+from getdera.scrapper.client import _get
+
+
+GBIT = 125  # MB/s of a 1 Gbit/s link
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def serve(directory: str) -> (subprocess.Popen, str):
+    """Serves directory with `http.server` in a separate process and
+    returns the process and its base URL.
+    """
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'http.server', str(port),
+         '--bind', '127.0.0.1', '--directory', directory],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f'http://127.0.0.1:{port}'
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(base_url).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    return server, base_url
+
+
+def _get_fixed_chunks(urls, dir, session, chunk_size=128, **kwargs):
+    """Former writer: streams each file in fixed-size chunks.
+    """
+    for url in urls:
+        r = session.get(url, stream=True)
+        with open(f'{dir}/{url}', 'wb') as fd:
+            for chunk in r.iter_content(chunk_size=chunk_size):
+                fd.write(chunk)
+
+
+def download(base_url: str, dir: str, get=_get, **kwargs) -> (float, float):
+    """Downloads file.bin and returns (wall, CPU) seconds.
+    """
+    session = sessions.BaseUrlSession(base_url=f'{base_url}/')
+    start, cpu = time.perf_counter(), time.process_time()
+    get(['file.bin'], dir, session, limiter=_TokenBucket(100), **kwargs)
+    return time.perf_counter() - start, time.process_time() - cpu
+
+
+def main(mb: int):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        served = os.path.join(tmpdir, 'served')
+        os.makedirs(served)
+        with open(os.path.join(served, 'file.bin'), 'wb') as f:
+            for _ in range(mb):
+                f.write(os.urandom(1024 ** 2))
+        server, base_url = serve(served)
+        print(f'file.bin: {mb} MiB (1 Gbit/s = {GBIT} MB/s)')
+        print(f'{"writer":<20}{"MB/s":>10}{"CPU s":>10}{"CPU s/GB":>10}')
+        try:
+            for name, kwargs in [
+                    ('fixed 128 B chunks', {'get': _get_fixed_chunks}),
+                    ('chunk_size=128', {'chunk_size': 128}),
+                    ('default', {}),
+                    ('default + sha256', {'checksum': 'sha256'})]:
+                out = os.path.join(tmpdir, str(len(os.listdir(tmpdir))))
+                os.makedirs(out)
+                wall, cpu = download(base_url, out, **kwargs)
+                assert os.path.getsize(os.path.join(out, 'file.bin')) \
+                    == mb * 1024 ** 2
+                size = mb * 1024 ** 2 / 1e6
+                print(f'{name:<20}{size / wall:>10.0f}{cpu:>10.2f}'
+                      f'{cpu / size * 1000:>10.2f}')
+                os.remove(os.path.join(out, 'file.bin'))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--mb', type=int, default=256)
+    args = parser.parse_args()
+    main(args.mb)
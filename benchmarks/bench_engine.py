@@ -0,0 +1,66 @@
+"""Reports parse time, peak memory and result size of processing
+synthetic NUM and TXT tables with the pandas and pyarrow engines.
+
+Each run is measured in a fresh process, as peak memory is the
+process' maximum resident set size above its size before parsing
+(the zipfile is also generated in a separate process, since processes
+inherit their parent's maximum resident set size).
+
+    python -m benchmarks.bench_engine --num 2000000 --txt 200000
+"""
+
+import time
+import argparse
+import resource
+import tempfile
+import multiprocessing
+
+from getdera.dera import process
+from benchmarks.synthetic import make_notes_zip
+
+
+DATES = ('13-03-2020', '13-06-2020')  # 2020q2
+
+
+def _maxrss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run(dir: str, table: str, engine: str, stream: bool):
+    """Processes table and returns (seconds, peak MB, result MB).
+    """
+    before = _maxrss_mb()
+    start = time.perf_counter()
+    data = process(dir, 'statements', table, *DATES, stream=stream,
+                   engine=engine)
+    seconds = time.perf_counter() - start
+    return (seconds, _maxrss_mb() - before,
+            data.memory_usage(deep=True).sum() / 1e6)
+
+
+def main(n_num: int, n_txt: int):
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with context.Pool(1) as pool:
+            pool.apply(make_notes_zip, (f'{tmpdir}/2020q2_notes.zip',),
+                       {'n_num': n_num, 'n_txt': n_txt})
+        print(f'NUM: {n_num} rows, TXT: {n_txt} rows, '
+              f'{multiprocessing.cpu_count()} CPUs')
+        print(f'{"table":<6}{"stream":>8}{"engine":>10}{"seconds":>10}'
+              f'{"peak MB":>10}{"MB":>10}')
+        for table in ['num', 'txt']:
+            for stream in [False, True]:
+                for engine in ['pandas', 'pyarrow']:
+                    with context.Pool(1) as pool:
+                        seconds, peak, mb = pool.apply(
+                            _run, (tmpdir, table, engine, stream))
+                    print(f'{table:<6}{str(stream):>8}{engine:>10}'
+                          f'{seconds:>10.2f}{peak:>10.0f}{mb:>10.0f}')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num', type=int, default=2000000)
+    parser.add_argument('--txt', type=int, default=200000)
+    args = parser.parse_args()
+    main(args.num, args.txt)
@@ -0,0 +1,77 @@
+"""Reports time and peak memory of joining SUB and TAG columns to a
+synthetic NUM table with `getdera.dera.join` and with pandas merge,
+and of pre-filtering NUM by a filtered SUB table (10-K submissions)
+with `getdera.dera.semi_join`, isin and an inner merge.
+
+    python -m benchmarks.bench_join --rows 5000000 --subs 50000
+"""
+
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+from getdera.dera import join
+from getdera.dera import process
+from getdera.dera import semi_join
+from benchmarks.synthetic import make_notes_zip
+
+
+SUB_COLUMNS = ['cik', 'name', 'form', 'period']
+TAG_COLUMNS = ['datatype', 'tlabel']
+TAG_KEY = ['tag', 'version']
+
+
+def joins(num, sub, tag, sub_10k):
+    """Returns benchmark name : function of the join strategies."""
+    return {
+        'merge': lambda: num.merge(
+            sub[SUB_COLUMNS], how='left', left_on='adsh', right_index=True
+        ).merge(
+            tag[TAG_COLUMNS], how='left', left_on=TAG_KEY, right_index=True),
+        'join': lambda: join(
+            join(num, sub, 'adsh', columns=SUB_COLUMNS),
+            tag, TAG_KEY, columns=TAG_COLUMNS),
+        'semi: merge': lambda: num.merge(
+            sub_10k[[]], how='inner', left_on='adsh', right_index=True),
+        'semi: isin': lambda: num[num['adsh'].isin(sub_10k.index)],
+        'semi: semi_join': lambda: semi_join(num, sub_10k, 'adsh'),
+    }
+
+
+def main(rows: int, subs: int, repeat: int = 3):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        make_notes_zip(f'{tmpdir}/2020q2_notes.zip',
+                       n_sub=subs, n_num=rows, n_txt=0)
+        args = (tmpdir, 'statements')
+        dates = ('13-03-2020', '13-06-2020')
+        sub = process(*args, 'sub', *dates, stream=True)
+        tag = process(*args, 'tag', *dates, stream=True)
+        num = process(*args, 'num', *dates, stream=True)
+        sub_10k = sub[sub['form'] == '10-K']
+        print(f'num.tsv: {rows} rows, sub.tsv: {subs} rows '
+              f'({len(sub_10k)} 10-K), tag.tsv: {len(tag)} rows')
+        print(f'{"strategy":<18}{"seconds":>10}{"peak MB":>10}{"rows":>10}')
+        for name, f in joins(num, sub, tag, sub_10k).items():
+            # Timed runs
+            seconds = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                f()
+                seconds.append(time.perf_counter() - start)
+            # Traced run (tracemalloc slows down joins)
+            tracemalloc.start()
+            result = f()
+            peak = tracemalloc.get_traced_memory()[1] / 1e6
+            tracemalloc.stop()
+            print(f'{name:<18}{min(seconds):>10.3f}{peak:>10.0f}'
+                  f'{len(result):>10}')
+            del result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=2000000)
+    parser.add_argument('--subs', type=int, default=20000)
+    args = parser.parse_args()
+    main(args.rows, args.subs)
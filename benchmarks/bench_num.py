@@ -0,0 +1,54 @@
+"""Reports memory footprint and parse throughput of processing a
+synthetic NUM table with the compact NUM schema (the default) and
+with pandas' default type inference (schema=False).
+
+The fixture size is set by the number of NUM rows, e.g. a multi-GB
+(uncompressed) fixture:
+
+    python -m benchmarks.bench_num --rows 30000000
+"""
+
+import os
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+from zipfile import ZipFile
+
+from getdera.dera import process
+from benchmarks.synthetic import make_notes_zip
+
+
+def main(rows: int):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = make_notes_zip(f'{tmpdir}/2020q2_notes.zip', n_num=rows)
+        with ZipFile(path) as zipObj:
+            size = zipObj.getinfo('num.tsv').file_size / 1e6
+        print(f'num.tsv: {rows} rows, {size:.0f} MB uncompressed, '
+              f'{os.path.getsize(path) / 1e6:.0f} MB compressed')
+        print(f'{"schema":<8}{"frame MB":>10}{"peak MB":>10}'
+              f'{"seconds":>10}{"MB/s":>8}{"rows/s":>12}')
+        args = (tmpdir, 'statements', 'num', '13-03-2020', '13-06-2020')
+        for schema in [False, True]:
+            # Timed run
+            start = time.perf_counter()
+            data = process(*args, stream=True, schema=schema)
+            seconds = time.perf_counter() - start
+            mb = data.memory_usage(deep=True).sum() / 1e6
+            del data
+            # Traced run (tracemalloc slows down parsing)
+            tracemalloc.start()
+            data = process(*args, stream=True, schema=schema)
+            peak = tracemalloc.get_traced_memory()[1] / 1e6
+            tracemalloc.stop()
+            print(f'{str(schema):<8}{mb:>10.0f}{peak:>10.0f}'
+                  f'{seconds:>10.2f}{size / seconds:>8.0f}'
+                  f'{rows / seconds:>12.0f}')
+            del data
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=2000000)
+    main(parser.parse_args().rows)
@@ -0,0 +1,105 @@
+"""Reports time of downloading synthetic Financial Statements and Notes
+zipfiles from a local bandwidth-limited server and processing them
+one stage after the other, compared to `get_and_process` overlapping
+the two stages (saving zipfiles to disk or keeping them in memory).
+
+    python -m benchmarks.bench_pipeline --rows 500000 --mbps 20
+"""
+
+import os
+import time
+import argparse
+import tempfile
+import threading
+
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+from getdera.dera import process
+from getdera.pipeline import get_and_process
+from getdera.scrapper.client import _dera_session
+from getdera.scrapper.client import _get
+from getdera.scrapper.client import _get_urls
+from benchmarks.synthetic import make_notes_zip
+
+
+DATES = ('13-03-2019', '13-12-2019')  # 2019q2 to 2019q4
+CHUNK_SIZE = 64 * 1024
+
+
+def serve(directory: str, mbps: float) -> ThreadingHTTPServer:
+    """Serves the files in directory (by name, under any path) at no
+    more than mbps megabytes per second per connection.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = os.path.join(directory, os.path.basename(self.path))
+            if not os.path.isfile(path):
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Length', str(os.path.getsize(path)))
+            self.end_headers()
+            with open(path, 'rb') as f:
+                while True:
+                    chunk = f.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+                    time.sleep(len(chunk) / (mbps * 1024 ** 2))
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(rows: int, mbps: float):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        served = os.path.join(tmpdir, 'served')
+        urls = _get_urls('statements', *DATES)
+        for seed, url in enumerate(urls):
+            make_notes_zip(os.path.join(served, url), n_num=rows, seed=seed)
+        size = sum(os.path.getsize(os.path.join(served, u)) for u in urls)
+        server = serve(served, mbps)
+        base_url = 'http://{}:{}'.format(*server.server_address)
+        print(f'{len(urls)} zipfiles, {size / 1024 ** 2:.1f} MiB at '
+              f'{mbps} MiB/s')
+
+        download = os.path.join(tmpdir, 'download')
+        os.makedirs(download)
+        start = time.perf_counter()
+        _get(urls, download, _dera_session('statements', base_url))
+        downloading = time.perf_counter() - start
+        start = time.perf_counter()
+        expected = process(download, 'statements', 'num', *DATES)
+        processing = time.perf_counter() - start
+        print(f'{"download":<12}{downloading:>8.2f}s')
+        print(f'{"process":<12}{processing:>8.2f}s')
+        print(f'{"sequential":<12}{downloading + processing:>8.2f}s')
+
+        start = time.perf_counter()
+        data = get_and_process('statements', os.path.join(tmpdir, 'pipe'),
+                               'num', *DATES, base_url=base_url)
+        pipelined = time.perf_counter() - start
+        assert len(data) == len(expected)
+        print(f'{"pipelined":<12}{pipelined:>8.2f}s')
+
+        start = time.perf_counter()
+        data = get_and_process('statements', None, 'num', *DATES,
+                               base_url=base_url)
+        in_memory = time.perf_counter() - start
+        assert len(data) == len(expected)
+        print(f'{"in memory":<12}{in_memory:>8.2f}s')
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=500000)
+    parser.add_argument('--mbps', type=float, default=20.0)
+    args = parser.parse_args()
+    main(args.rows, args.mbps)
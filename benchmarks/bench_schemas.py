@@ -0,0 +1,30 @@
+"""Reports memory savings of processing tables with the compact
+schemas in `getdera.schemas` (the default) against pandas' default
+type inference (schema=False).
+"""
+
+import time
+import tempfile
+
+from getdera.dera import process
+from benchmarks.synthetic import make_notes_zip
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        make_notes_zip(f'{tmpdir}/2020q2_notes.zip')
+        print(f'{"table":<6}{"schema":>8}{"MB":>10}{"seconds":>10}')
+        for table in ['sub', 'tag', 'txt']:
+            for schema in [False, True]:
+                start = time.perf_counter()
+                data = process(tmpdir, 'statements', table,
+                               '13-03-2020', '13-06-2020', stream=True,
+                               schema=schema)
+                seconds = time.perf_counter() - start
+                mb = data.memory_usage(deep=True).sum() / 1e6
+                print(f'{table:<6}{str(schema):>8}{mb:>10.2f}'
+                      f'{seconds:>10.2f}')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Reports the build throughput of a `TextIndex` over the TXT tables
+of synthetic Financial Statements and Notes zipfiles (with a Zipfian
+vocabulary of VOCABULARY words), and latency of term and phrase
+queries compared to scanning the processed TXT values with pandas.
+
+    python -m benchmarks.bench_search --periods 4 --rows 100000
+"""
+
+import os
+import time
+import argparse
+import tempfile
+import numpy as np
+
+from zipfile import ZipFile
+from zipfile import ZIP_DEFLATED
+
+from getdera.dera import process
+from getdera.search import TextIndex
+from benchmarks.synthetic import WORDS
+from benchmarks.synthetic import adsh
+from benchmarks.synthetic import txt
+
+
+PERIODS = ['2019q1', '2019q2', '2019q3', '2019q4']
+DATES = ('13-12-2018', '13-12-2019')  # 2019q1 to 2019q4
+VOCABULARY = 50000
+QUERIES = [
+    ('cyber', False),  # Term
+    ('supply chain', False),  # Terms
+    ('supply chain', True),  # Phrase
+    ('exchange rate risk', True),  # Rare phrase
+]
+
+
+def make_txt_zip(path: str, rows: int, words: int = 100,
+                 seed: int = 0) -> str:
+    """Writes a zipfile with a synthetic TXT table whose values draw
+    words from a Zipfian vocabulary (the most frequent being WORDS).
+    """
+    rng = np.random.default_rng(seed)
+    letters = np.array(list('abcdefghijklmnopqrstuvwxyz'))
+    vocabulary = np.concatenate([WORDS, [
+        ''.join(rng.choice(letters, rng.integers(4, 12)))
+        for _ in range(VOCABULARY - len(WORDS))]])
+    ranks = np.minimum(rng.zipf(1.1, (rows, words)), VOCABULARY) - 1
+    data = txt(rows, rng, adsh(rows // 10 + 1, rng), np.array(['Tag']), 1)
+    data['value'] = [' '.join(v) for v in vocabulary[ranks]]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with ZipFile(path, 'w', ZIP_DEFLATED) as zipObj:
+        zipObj.writestr('txt.tsv', data.to_csv(sep='\t', index=False))
+    return path
+
+
+def _latency(query, repeat: int = 20) -> float:
+    """Returns the median seconds of calling query repeat times.
+    """
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        query()
+        seconds.append(time.perf_counter() - start)
+    return float(np.median(seconds))
+
+
+def main(periods: int, rows: int):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data = os.path.join(tmpdir, 'data')
+        zipfiles = [make_txt_zip(f'{data}/{p}_notes.zip', rows, seed=i)
+                    for i, p in enumerate(PERIODS[:periods])]
+        size = 0
+        for zipfile in zipfiles:
+            with ZipFile(zipfile) as zipObj:
+                size += zipObj.getinfo('txt.tsv').file_size
+        print(f'{len(zipfiles)} periods, {rows * len(zipfiles)} TXT rows, '
+              f'{size / 1e6:.0f} MB')
+
+        index = TextIndex(os.path.join(tmpdir, 'index'), 'statements')
+        start = time.perf_counter()
+        index.update(zipfiles)
+        seconds = time.perf_counter() - start
+        print(f'build: {seconds:.2f}s, {size / 1e6 / seconds:.1f} MB/s, '
+              f'{len(index) / seconds:.0f} rows/s')
+
+        txt = process(data, 'statements', 'txt', *DATES, stream=True,
+                      columns=['value'])
+        values = txt['value'].str.lower()
+        print(f'{"query":<24}{"phrase":>8}{"rows":>10}{"index ms":>10}'
+              f'{"scan ms":>10}')
+        for query, phrase in QUERIES:
+            index = TextIndex(os.path.join(tmpdir, 'index'), 'statements')
+            start = time.perf_counter()
+            result = index.search(query, phrase)
+            cold = time.perf_counter() - start
+            warm = _latency(lambda: index.search(query, phrase))
+            if phrase:
+                scan = _latency(lambda: values.str.contains(query), 3)
+            else:
+                scan = _latency(lambda: np.logical_and.reduce(
+                    [values.str.contains(t) for t in query.split()]), 3)
+            print(f'{query:<24}{str(phrase):>8}{len(result):>10}'
+                  f'{warm * 1000:>10.1f}{scan * 1000:>10.1f}'
+                  f'  (first query {cold * 1000:.1f} ms)')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--periods', type=int, default=4)
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+    main(args.periods, args.rows)
@@ -0,0 +1,59 @@
+"""Reports memory, load time and pickled size (the cost of sending a
+column to worker processes) of synthetic TXT values held as Python
+string objects, as pandas' string dtype, and as a lazy column of a
+memory-mapped text blob (see `getdera.texts`).
+
+    python -m benchmarks.bench_texts --rows 200000 --words 100
+"""
+
+import time
+import pickle
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+from getdera.texts import read_texts
+from getdera.texts import write_texts
+from benchmarks.synthetic import txt
+
+
+def main(rows: int, words: int):
+    rng = np.random.default_rng(0)
+    values = txt(rows, rng, np.array(['0000000001-20-000001']),
+                 np.array(['RiskFactors']), words=words)['value']
+    with tempfile.TemporaryDirectory() as tmpdir:
+        parquet = f'{tmpdir}/txt.parquet'
+        values.to_frame().to_parquet(parquet)
+        blob = f'{tmpdir}/txt'
+        write_texts(values, blob)
+        size = sum(len(v) for v in values) / 1e6
+        del values
+        print(f'{rows} texts, {size:.0f} MB of text')
+        print(f'{"column":<10}{"load s":>10}{"MB":>10}{"pickled MB":>12}'
+              f'{"decode s":>10}')
+
+        for name, load in [
+                ('object', lambda: pd.read_parquet(parquet)['value']
+                 .astype(object)),
+                ('str', lambda: pd.read_parquet(parquet)['value']),
+                ('text', lambda: pd.Series(read_texts(blob)))]:
+            start = time.perf_counter()
+            column = load()
+            loading = time.perf_counter() - start
+            mb = column.memory_usage(deep=True, index=False) / 1e6
+            pickled = len(pickle.dumps(column)) / 1e6
+            start = time.perf_counter()
+            assert column.iloc[::97].astype(str).str.len().sum() > 0
+            decoding = time.perf_counter() - start
+            print(f'{name:<10}{loading:>10.3f}{mb:>10.1f}{pickled:>12.1f}'
+                  f'{decoding:>10.3f}')
+            del column
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--words', type=int, default=100)
+    args = parser.parse_args()
+    main(args.rows, args.words)
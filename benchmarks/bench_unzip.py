@@ -0,0 +1,58 @@
+"""Reports throughput of extracting the members of synthetic Financial
+Statements and Notes zipfiles with `unzip_members` on 1, 2, 4 and 8
+threads, and time of `process` extracting each period's NUM table on
+threads.
+
+    python -m benchmarks.bench_unzip --periods 4 --rows 2000000
+"""
+
+import os
+import time
+import argparse
+import tempfile
+
+from zipfile import ZipFile
+
+from getdera.dera import process
+from getdera.utils import unzip_members
+from benchmarks.synthetic import make_notes_zip
+
+
+PERIODS = ['2019q1', '2019q2', '2019q3', '2019q4']
+DATES = ('13-12-2018', '13-12-2019')  # 2019q1 to 2019q4
+
+
+def main(periods: int, rows: int):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data = os.path.join(tmpdir, 'data')
+        zipfiles = [make_notes_zip(f'{data}/{p}_notes.zip', n_num=rows,
+                                   n_txt=rows // 10, seed=i)
+                    for i, p in enumerate(PERIODS[:periods])]
+        members = [(z, m, os.path.join(tmpdir, 'out', str(i)))
+                   for i, z in enumerate(zipfiles)
+                   for m in ['sub.tsv', 'tag.tsv', 'num.tsv', 'txt.tsv']]
+        size = 0
+        for zipfile in zipfiles:
+            with ZipFile(zipfile) as zipObj:
+                size += sum(i.file_size for i in zipObj.infolist())
+        print(f'{len(zipfiles)} zipfiles, {len(members)} members, '
+              f'{size / 1e6:.0f} MB uncompressed, {os.cpu_count()} CPUs')
+
+        print(f'{"threads":<10}{"unzip s":>10}{"MB/s":>10}{"process s":>12}')
+        for threads in [1, 2, 4, 8]:
+            start = time.perf_counter()
+            unzip_members(members, threads)
+            seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            process(data, 'statements', 'num', *DATES, threads=threads)
+            processing = time.perf_counter() - start
+            print(f'{threads:<10}{seconds:>10.2f}{size / 1e6 / seconds:>10.0f}'
+                  f'{processing:>12.2f}')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--periods', type=int, default=4)
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+    main(args.periods, args.rows)
@@ -0,0 +1,139 @@
+"""The `synthetic` module generates synthetic Financial Statements and
+Notes dataset zipfiles with realistic field cardinalities.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+from zipfile import ZipFile
+from zipfile import ZIP_DEFLATED
+
+
+FORMS = ['10-K', '10-Q', '8-K', '10-K/A', '10-Q/A', '20-F', '40-F', 'S-1']
+STATES = ['CA', 'NY', 'TX', 'DE', 'WA', 'MA', 'IL', 'FL', 'NJ', 'PA']
+FPS = ['FY', 'Q1', 'Q2', 'Q3', 'Q4']
+AFS = ['1-LAF', '2-ACC', '3-SRA', '4-NON', '5-SML']
+UOMS = ['USD', 'shares', 'pure', 'EUR', 'USD/shares']
+VERSIONS = ['us-gaap/2019', 'us-gaap/2020', 'dei/2019', 'srt/2019']
+WORDS = np.array(('risk market results operations financial could adversely '
+                  'affect business supply chain demand customers revenue '
+                  'growth regulation competition liquidity capital credit '
+                  'interest rate currency exchange cyber security').split())
+
+
+def adsh(n: int, rng: np.random.Generator) -> np.ndarray:
+    """Returns n random accession numbers (NNNNNNNNNN-YY-NNNNNN).
+    """
+    cik = rng.integers(1, 2000000, n)
+    yy = rng.integers(9, 21, n)
+    seq = rng.integers(1, 100000, n)
+    return np.array([f'{c:010d}-{y:02d}-{s:06d}'
+                     for c, y, s in zip(cik, yy, seq)])
+
+
+def sub(n: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Returns a synthetic SUB table with n submissions.
+    """
+    return pd.DataFrame({
+        'adsh': adsh(n, rng),
+        'cik': rng.integers(1, 2000000, n),
+        'name': np.char.add('COMPANY ', rng.integers(0, n, n).astype(str)),
+        'sic': rng.integers(100, 9999, n),
+        'countryba': rng.choice(['US', 'CA', 'GB', 'DE'], n),
+        'stprba': rng.choice(STATES, n),
+        'afs': rng.choice(AFS, n),
+        'wksi': rng.integers(0, 2, n),
+        'fye': rng.choice(['1231', '0630', '0930', '0331'], n),
+        'form': rng.choice(FORMS, n),
+        'period': rng.choice([20191231, 20200331, 20200630], n),
+        'fy': rng.choice([2019, 2020], n),
+        'fp': rng.choice(FPS, n),
+        'filed': rng.choice([20200115, 20200430, 20200730], n),
+        'accepted': '2020-04-30 18:03:00.0',
+        'prevrpt': rng.integers(0, 2, n),
+        'nciks': 1,
+    })
+
+
+def tag(n: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Returns a synthetic TAG table with n tags.
+    """
+    return pd.DataFrame({
+        'tag': np.char.add('Tag', np.arange(n).astype(str)),
+        'version': rng.choice(VERSIONS, n),
+        'custom': rng.integers(0, 2, n),
+        'abstract': rng.integers(0, 2, n),
+        'datatype': rng.choice(['monetary', 'shares', 'textBlock'], n),
+        'iord': rng.choice(['I', 'D'], n),
+        'crdr': rng.choice(['C', 'D'], n),
+        'tlabel': np.char.add('Label ', np.arange(n).astype(str)),
+        'doc': 'Documentation of the tag.',
+    })
+
+
+def num(n: int, rng: np.random.Generator,
+        adshs: np.ndarray, tags: np.ndarray) -> pd.DataFrame:
+    """Returns a synthetic NUM table with n facts about submissions
+    adshs and tags.
+    """
+    return pd.DataFrame({
+        'adsh': rng.choice(adshs, n),
+        'tag': rng.choice(tags, n),
+        'version': rng.choice(VERSIONS, n),
+        'ddate': rng.choice([20191231, 20200331, 20200630], n),
+        'qtrs': rng.choice([0, 1, 4], n),
+        'uom': rng.choice(UOMS, n),
+        'coreg': '',
+        'value': np.round(rng.normal(0, 1e9, n), 4),
+        'footnote': '',
+    })
+
+
+def txt(n: int, rng: np.random.Generator,
+        adshs: np.ndarray, tags: np.ndarray,
+        words: int = 40) -> pd.DataFrame:
+    """Returns a synthetic TXT table with n text facts (of about
+    words words each) about submissions adshs and tags.
+    """
+    values = [' '.join(rng.choice(WORDS, words)) for _ in range(n)]
+    return pd.DataFrame({
+        'adsh': rng.choice(adshs, n),
+        'tag': rng.choice(tags, n),
+        'version': rng.choice(VERSIONS, n),
+        'ddate': rng.choice([20191231, 20200331, 20200630], n),
+        'qtrs': rng.choice([0, 1, 4], n),
+        'iprx': 0,
+        'lang': 'en-US',
+        'dcml': 32767,
+        'escaped': rng.integers(0, 2, n),
+        'srclen': [len(v) for v in values],
+        'txtlen': [len(v) for v in values],
+        'context': rng.choice(['FD2020Q2QTD', 'FI2020Q2'], n),
+        'value': values,
+    })
+
+
+def make_notes_zip(path: str,
+                   n_sub: int = 10000,
+                   n_tag: int = 5000,
+                   n_num: int = 200000,
+                   n_txt: int = 20000,
+                   seed: int = 0) -> str:
+    """Writes a synthetic Financial Statements and Notes dataset zipfile
+    (with SUB, TAG, NUM and TXT tables) to path and returns path.
+    As in DERA datasets, rows of NUM and TXT are grouped by adsh.
+    """
+    rng = np.random.default_rng(seed)
+    tables = {'sub': sub(n_sub, rng), 'tag': tag(n_tag, rng)}
+    adshs = tables['sub']['adsh'].to_numpy()
+    tags = tables['tag']['tag'].to_numpy()
+    tables['num'] = num(n_num, rng, adshs, tags)\
+        .sort_values('adsh', kind='stable')
+    tables['txt'] = txt(n_txt, rng, adshs, tags)\
+        .sort_values('adsh', kind='stable')
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with ZipFile(path, 'w', ZIP_DEFLATED) as zipObj:
+        for name, data in tables.items():
+            zipObj.writestr(f'{name}.tsv', data.to_csv(sep='\t', index=False))
+    return path
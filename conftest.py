@@ -1,8 +1,210 @@
 import pytest
 
+from zipfile import ZipFile
+from zipfile import ZIP_DEFLATED
+
+
+# Synthetic Mutual Fund Prospectus Risk and Return Summary datasets
+# (zipfile name -> {table file name -> tab-separated content})
+DERA_ZIPFILES = {
+    '2019q3_rr1.zip': {
+        'sub.tsv': 'adsh\tdummy_val\n'
+                   '0000000001-01-000001\tlorem2019q3\n'
+                   '0000000001-01-000002\t\n'
+                   '0000000001-01-000003\tdolor2019q3\n',
+        'txt.tsv': 'adsh\tdummy_val\n'
+                   '0000000001-01-000001\tlorem2019q3\n'
+                   '0000000001-01-000002\t\n'
+                   '0000000001-01-000003\tipsum2019q3\n',
+        'tag.tsv': 'tag\tversion\tdummy_value\n'
+                   'AmendmentFlag\tdei/2012\tipsum2019q3\n'
+                   'AnnualReturn2006\trr/2012\tamet2019q3\n',
+    },
+    '2019q4_rr1.zip': {
+        'sub.tsv': 'adsh\tdummy_val\n'
+                   '0000000001-01-000001\tlorem2019q4\n'
+                   '0000000001-01-000002\t\n'
+                   '0000000001-01-000003\tdolor2019q4\n',
+        'txt.tsv': 'adsh\tdummy_val\n'
+                   '0000000001-01-000001\tlorem2019q4\n'
+                   '0000000001-01-000002\t\n'
+                   '0000000001-01-000003\tipsum2019q4\n',
+        'tag.tsv': 'tag\tversion\tdummy_value\n'
+                   'AmendmentFlag\tdei/2012\tipsum2019q4\n'
+                   'AmendmentFlag\tdei/2014\tdolor2019q4\n',
+    },
+    '2020q1_rr1.zip': {
+        'sub.tsv': 'adsh\tdummy_val\n'
+                   '0000000001-01-000001\tlorem2020q1\n'
+                   '0000000001-01-000002\t\n'
+                   '0000000001-01-000003\tdolor2020q1\n',
+        'txt.tsv': 'adsh\tdummy_val\n'
+                   '0000000001-01-000001\tlorem2020q1\n'
+                   '0000000001-01-000002\t\n'
+                   '0000000001-01-000003\tipsum2020q1\n',
+        'tag.tsv': 'tag\tversion\tdummy_value\n'
+                   'AcquiredFundFeesAndExpensesBasedOnEstimates\trr/2012\t'
+                   'lorem2020q1\n'
+                   'AmendmentFlag\tdei/2012\tipsum2020q1\n'
+                   'AmendmentFlag\tdei/2014\tdolor2020q1\n'
+                   'AnnualFundOperatingExpensesTableTextBlock\trr/2012\t'
+                   'sit2020q1\n'
+                   'AnnualReturn2006\trr/2012\tamet2020q1\n',
+    },
+}
+
+
+def _tsv(*rows):
+    return ''.join('\t'.join(row) + '\n' for row in rows)
+
+
+# Synthetic Financial Statements and Notes datasets
+_SUB_FIELDS = ('adsh', 'cik', 'name', 'sic', 'countryba', 'stprba',
+               'changed', 'afs', 'wksi', 'fye', 'form', 'period', 'fy', 'fp',
+               'filed', 'accepted', 'prevrpt', 'nciks')
+_NUM_FIELDS = ('adsh', 'tag', 'version', 'ddate', 'qtrs', 'uom', 'dimh',
+               'iprx', 'value', 'footnote', 'footlen', 'dimn', 'coreg',
+               'durp', 'datp', 'dcml')
+_TXT_FIELDS = ('adsh', 'tag', 'version', 'ddate', 'qtrs', 'iprx', 'lang',
+               'dcml', 'durp', 'datp', 'dimh', 'dimn', 'coreg', 'escaped',
+               'srclen', 'txtlen', 'footnote', 'footlen', 'context', 'value')
+_TAG_FIELDS = ('tag', 'version', 'custom', 'abstract', 'datatype', 'iord',
+               'crdr', 'tlabel', 'doc')
+_PRE_FIELDS = ('adsh', 'report', 'line', 'stmt', 'inpth', 'rfile', 'tag',
+               'version', 'plabel', 'negating')
+_CAL_FIELDS = ('adsh', 'grp', 'arc', 'negative', 'ptag', 'pversion', 'ctag',
+               'cversion')
+_DIM_FIELDS = ('dimhash', 'segments', 'segt')
+_REN_FIELDS = ('adsh', 'report', 'rfile', 'menucat', 'shortname', 'longname',
+               'roleuri', 'parentroleuri', 'parentreport', 'ultparentrpt')
+_DIMH = '0x00000000'
+
+DERA_ZIPFILES.update({
+    '2020q2_notes.zip': {
+        'sub.tsv': _tsv(
+            _SUB_FIELDS,
+            ('0000320193-20-000052', '320193', 'APPLE INC', '3571', 'US',
+             'CA', '', '1-LAF', '0', '0926', '10-Q', '20200331', '2020', 'Q2',
+             '20200501', '2020-04-30 18:03:00.0', '0', '1'),
+            ('0000789019-20-000062', '789019', 'MICROSOFT CORP', '7372',
+             'US', 'WA', '19990701', '1-LAF', '0', '0630', '10-Q', '20200331',
+             '2020', 'Q3', '20200429', '2020-04-29 16:12:00.0', '0', '1')),
+        'num.tsv': _tsv(
+            _NUM_FIELDS,
+            ('0000320193-20-000052', 'Assets', 'us-gaap/2019', '20200331',
+             '0', 'USD', _DIMH, '0', '320400000000.0000', '', '', '0', '',
+             '0.0', '0.0', '-6'),
+            ('0000320193-20-000052', 'Revenues', 'us-gaap/2019', '20200331',
+             '1', 'USD', _DIMH, '0', '58313000000.0000', '', '', '0', '',
+             '0.0', '0.0', '-6'),
+            ('0000789019-20-000062', 'Assets', 'us-gaap/2019', '20200331',
+             '0', 'USD', _DIMH, '0', '285449000000.0000', '', '', '0', '',
+             '0.0', '0.0', '-6')),
+        'txt.tsv': _tsv(
+            _TXT_FIELDS,
+            ('0000320193-20-000052', 'RiskFactors', 'us-gaap/2019',
+             '20200331', '1', '0', 'en-US', '32767', '0.0', '0.0', _DIMH, '0',
+             '', '0', '42', '42', '', '', 'FD2020Q2QTD',
+             'Supply chain disruption may affect results.'),
+            ('0000789019-20-000062', 'RiskFactors', 'us-gaap/2019',
+             '20200331', '1', '0', 'en-US', '32767', '0.0', '0.0', _DIMH, '0',
+             '', '0', '37', '37', '', '', 'FY2020Q3QTD',
+             'Cloud demand may fluctuate by region.')),
+        'tag.tsv': _tsv(
+            _TAG_FIELDS,
+            ('Assets', 'us-gaap/2019', '0', '0', 'monetary', 'I', 'D',
+             'Assets', 'Sum of the carrying amounts of assets.'),
+            ('Revenues', 'us-gaap/2019', '0', '0', 'monetary', 'D', 'C',
+             'Revenues', 'Amount of revenue recognized.'),
+            ('RiskFactors', 'us-gaap/2019', '0', '0', 'textBlock', 'D', '',
+             'Risk Factors', 'Risk factors text block.')),
+        'pre.tsv': _tsv(
+            _PRE_FIELDS,
+            ('0000320193-20-000052', '2', '1', 'BS', '0', 'H', 'Assets',
+             'us-gaap/2019', 'Total assets', '0'),
+            ('0000320193-20-000052', '4', '1', 'IS', '0', 'H', 'Revenues',
+             'us-gaap/2019', 'Net sales', '0'),
+            ('0000789019-20-000062', '2', '1', 'BS', '0', 'H', 'Assets',
+             'us-gaap/2019', 'Total assets', '0')),
+        'cal.tsv': _tsv(
+            _CAL_FIELDS,
+            ('0000320193-20-000052', '1', '1', '0', 'Assets', 'us-gaap/2019',
+             'AssetsCurrent', 'us-gaap/2019')),
+        'dim.tsv': _tsv(
+            _DIM_FIELDS,
+            (_DIMH, '', '0')),
+        'ren.tsv': _tsv(
+            _REN_FIELDS,
+            ('0000320193-20-000052', '2', 'H', 'S', 'BALANCE SHEETS',
+             '100020 - Statement - BALANCE SHEETS',
+             'http://www.apple.com/role/BalanceSheets', '', '', ''),
+            ('0000789019-20-000062', '2', 'H', 'S', 'BALANCE SHEETS',
+             '100020 - Statement - BALANCE SHEETS',
+             'http://www.microsoft.com/role/BalanceSheets', '', '', '')),
+    },
+    '2020q3_notes.zip': {
+        'sub.tsv': _tsv(
+            _SUB_FIELDS,
+            ('0000320193-20-000062', '320193', 'APPLE INC', '3571', 'US',
+             'CA', '', '1-LAF', '0', '0926', '10-Q', '20200630', '2020', 'Q3',
+             '20200731', '2020-07-30 18:01:00.0', '0', '1')),
+        'num.tsv': _tsv(
+            _NUM_FIELDS,
+            ('0000320193-20-000062', 'Assets', 'us-gaap/2020', '20200630',
+             '0', 'USD', _DIMH, '0', '317344000000.0000', '', '', '0', '',
+             '0.0', '0.0', '-6'),
+            ('0000320193-20-000062', 'Revenues', 'us-gaap/2020', '20200630',
+             '1', 'USD', _DIMH, '0', '59685000000.0000', '', '', '0', '',
+             '0.0', '0.0', '-6')),
+        'txt.tsv': _tsv(
+            _TXT_FIELDS,
+            ('0000320193-20-000062', 'RiskFactors', 'us-gaap/2020',
+             '20200630', '1', '0', 'en-US', '32767', '0.0', '0.0', _DIMH, '0',
+             '', '0', '44', '44', '', '', 'FD2020Q3QTD',
+             'Supply chain disruption continues to affect.')),
+        'tag.tsv': _tsv(
+            _TAG_FIELDS,
+            ('Assets', 'us-gaap/2020', '0', '0', 'monetary', 'I', 'D',
+             'Assets', 'Sum of the carrying amounts of assets.'),
+            ('Revenues', 'us-gaap/2020', '0', '0', 'monetary', 'D', 'C',
+             'Revenues', 'Amount of revenue recognized.'),
+            ('RiskFactors', 'us-gaap/2019', '0', '0', 'textBlock', 'D', '',
+             'Risk Factors', 'Risk factors text block.')),
+        'pre.tsv': _tsv(
+            _PRE_FIELDS,
+            ('0000320193-20-000062', '2', '1', 'BS', '0', 'H', 'Assets',
+             'us-gaap/2020', 'Total assets', '0')),
+        'cal.tsv': _tsv(
+            _CAL_FIELDS,
+            ('0000320193-20-000062', '1', '1', '0', 'Assets', 'us-gaap/2020',
+             'AssetsCurrent', 'us-gaap/2020')),
+        'dim.tsv': _tsv(
+            _DIM_FIELDS,
+            (_DIMH, '', '0')),
+        'ren.tsv': _tsv(
+            _REN_FIELDS,
+            ('0000320193-20-000062', '2', 'H', 'S', 'BALANCE SHEETS',
+             '100020 - Statement - BALANCE SHEETS',
+             'http://www.apple.com/role/BalanceSheets', '', '', '')),
+    },
+})
+
 
 @pytest.fixture(scope="session")
 def tmp_data_directory(tmp_path_factory):
     """Creates temporary directory and returns its path.
     """
-    return str(tmp_path_factory.mktemp("getdera"))
\ No newline at end of file
+    return str(tmp_path_factory.mktemp("getdera"))
+
+
+@pytest.fixture(scope="session")
+def dera_data_directory(tmp_path_factory):
+    """Creates temporary directory containing synthetic DERA dataset
+    zipfiles and returns its path.
+    """
+    path = tmp_path_factory.mktemp("dera")
+    for zipfile, tables in DERA_ZIPFILES.items():
+        with ZipFile(path / zipfile, 'w', ZIP_DEFLATED) as zipObj:
+            for filename, content in tables.items():
+                zipObj.writestr(filename, content)
+    return str(path)
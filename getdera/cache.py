@@ -0,0 +1,156 @@
+"""The `cache` module contains a persistent on-disk cache of processed
+DERA tables.
+
+Each entry is a single period's table (e.g. `txt.tsv` in
+`2019q3_rr1.zip`) parsed with a given dtype map, saved in a columnar
+format (Apache Parquet) with a JSON sidecar file holding the source
+zipfile's fingerprint and the table's categorical columns (Parquet
+reads categorical columns without categories back as object).
+Entries are invalidated when their source zipfile changes, and the
+least recently used entries are evicted to keep the cache within a
+disk budget.
+
+Requires the optional `pyarrow` dependency.
+"""
+
+import os
+import json
+import hashlib
+import pandas as pd
+
+from zipfile import ZipFile
+from typing import Dict
+from typing import Tuple
+from typing import Union
+
+from getdera.utils import make_path
+
+
+DEFAULT_CACHE_BYTES = 2 * 1024 ** 3  # 2 GiB
+
+
+class TableCache:
+    """Size-bounded LRU cache of processed per-period DERA tables.
+
+    Args:
+        path (str):
+            Directory path to save cache entries in.
+
+        max_bytes (int):
+            Optional; disk budget of the cache. Least recently used
+            entries are evicted once the cache exceeds max_bytes.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.path = make_path(path)
+        self.max_bytes = max_bytes
+
+    def _entry_path(self,
+                    table: Tuple[str, str],
+                    dtype: Dict[str, str] = None,
+                    **kwargs) -> str:
+        """Returns path (without extension) of the cache entry for
+        table, a (zipfile path, member name) pair, parsed with dtype
+        and any other reader options in kwargs. Unset (None) options
+        are ignored. Zipfiles of the same period in different
+        directories have different entries.
+        """
+        zipfile, member = table
+        period = os.path.basename(zipfile).split('.')[0]
+        options = {k: v for k, v in {'dtype': dtype, **kwargs}.items()
+                   if v is not None}
+        options['zipfile'] = os.path.abspath(zipfile)
+        options = json.dumps(options, sort_keys=True, default=str)
+        digest = hashlib.sha1(options.encode()).hexdigest()[:16]
+        name = f'{period}_{os.path.splitext(member)[0]}_{digest}'
+        return os.path.join(self.path, name)
+
+    @staticmethod
+    def _fingerprint(table: Tuple[str, str]) -> Dict[str, int]:
+        """Returns the source zipfile's size and modification time and
+        the member's CRC-32 (read from the zip's central directory).
+        """
+        zipfile, member = table
+        stat = os.stat(zipfile)
+        with ZipFile(zipfile, 'r') as zipObj:
+            info = zipObj.getinfo(member)
+        return {'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'crc': info.CRC,
+                'file_size': info.file_size}
+
+    def get(self,
+            table: Tuple[str, str],
+            dtype: Dict[str, str] = None,
+            **kwargs) -> Union[None, pd.DataFrame]:
+        """Returns the cached table, or None if it is not cached or
+        its source zipfile has changed.
+        """
+        entry = self._entry_path(table, dtype, **kwargs)
+        try:
+            with open(f'{entry}.json', 'r') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get('fingerprint') != self._fingerprint(table):
+            self._remove(entry)
+            return None
+        data = pd.read_parquet(f'{entry}.parquet')
+        for col, categories in meta.get('categorical', {}).items():
+            if not isinstance(data[col].dtype, pd.CategoricalDtype):
+                values = pd.Index(data[col].dropna().unique())
+                data[col] = data[col].astype(pd.CategoricalDtype(
+                    values.astype(categories)))
+        # Mark entry as recently used
+        os.utime(f'{entry}.parquet')
+        return data
+
+    def put(self,
+            table: Tuple[str, str],
+            data: pd.DataFrame,
+            dtype: Dict[str, str] = None,
+            **kwargs) -> None:
+        """Saves data as the cache entry of table.
+        """
+        entry = self._entry_path(table, dtype, **kwargs)
+        data.to_parquet(f'{entry}.parquet.tmp')
+        os.replace(f'{entry}.parquet.tmp', f'{entry}.parquet')
+        categorical = {col: str(t.categories.dtype)
+                       for col, t in data.dtypes.items()
+                       if isinstance(t, pd.CategoricalDtype)}
+        with open(f'{entry}.json', 'w') as f:
+            json.dump({'fingerprint': self._fingerprint(table),
+                       'categorical': categorical}, f)
+
+    def evict(self) -> None:
+        """Removes least recently used entries until the cache is
+        within max_bytes.
+        """
+        entries = []
+        for f in os.listdir(self.path):
+            if f.endswith('.parquet'):
+                stat = os.stat(os.path.join(self.path, f))
+                entries.append((stat.st_mtime_ns, stat.st_size, f))
+        total = sum(size for _, size, _ in entries)
+        for _, size, f in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(os.path.join(self.path, f[:-len('.parquet')]))
+            total -= size
+
+    def clear(self) -> None:
+        """Removes all cache entries.
+        """
+        for f in os.listdir(self.path):
+            if f.endswith('.parquet'):
+                self._remove(os.path.join(self.path, f[:-len('.parquet')]))
+
+    @staticmethod
+    def _remove(entry: str) -> None:
+        for ext in ('.parquet', '.json'):
+            if os.path.exists(f'{entry}{ext}'):
+                os.remove(f'{entry}{ext}')
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,222 @@
+"""The `company` module contains a persistent index of the filings of
+each company in DERA dataset zipfiles.
+
+The index of a zipfile maps each accession number (adsh), and the
+company (CIK) that filed it, to the byte ranges of its rows within the
+uncompressed members of adsh-keyed tables (e.g. `sub.tsv`, `num.tsv`,
+`txt.tsv`). It is built once per zipfile (and rebuilt if the zipfile
+changes) with a vectorised scan of each member, and saved in a
+`{dataset}_company_index` directory (e.g. next to the zipfiles). A
+company's rows can then be read without parsing the rest of each table.
+
+DERA tables are tab-separated with one row per line and adsh as the
+first field of adsh-keyed tables. Byte ranges are computed from line
+breaks, so tables with a field spanning several lines (e.g. a quoted
+newline) cannot be indexed.
+
+Requires the optional `pyarrow` dependency.
+"""
+
+import os
+import io
+import json
+import numpy as np
+import pandas as pd
+
+from zipfile import ZipFile
+from typing import IO
+from typing import Iterable
+from typing import List
+from typing import Tuple
+
+from getdera.utils import ADSH_DASHES
+from getdera.utils import ADSH_LENGTH
+from getdera.utils import _fingerprint
+from getdera.utils import make_path
+
+
+SCAN_BLOCK_SIZE = 16 * 1024 ** 2  # 16 MiB of uncompressed member
+
+DERA_ADSH_TABLES = [
+    'sub', 'num', 'txt', 'pre', 'cal', 'ren', 'lab',
+]  # Tables with adsh as their first field
+
+
+def _adsh_runs(f: IO) -> List[Tuple[bytes, int, int]]:
+    """Scans a tab-separated table (with adsh as its first field) and
+    returns (adsh, start, end) byte ranges of consecutive rows with the
+    same adsh. Offsets are relative to the start of the member (the
+    header line is skipped).
+
+    Raises:
+        ValueError: if a line does not start with an adsh, e.g. if a
+        field spans several lines.
+    """
+    header = f.readline()
+    offset = len(header)
+    runs = []
+    carry = b''
+    while True:
+        block = f.read(SCAN_BLOCK_SIZE)
+        buf = carry + block
+        if not block:
+            if not buf:
+                break
+            if not buf.endswith(b'\n'):
+                buf += b'\n'  # Last row without a newline
+        last = buf.rfind(b'\n')
+        if last == -1:
+            carry = buf
+            continue
+        lines, carry = buf[:last + 1], buf[last + 1:]
+        chars = np.frombuffer(lines, dtype=np.uint8)
+        ends = np.flatnonzero(chars == ord('\n')) + 1
+        starts = np.concatenate(([0], ends[:-1]))
+        # First ADSH_LENGTH bytes of each row
+        positions = starts[:, None] + np.arange(ADSH_LENGTH)
+        positions = np.minimum(positions, len(chars) - 1)
+        keys = chars[positions].copy().view(f'S{ADSH_LENGTH}').ravel()
+        # Rows start with an adsh (blank lines are ignored)
+        dashes = chars[positions[:, list(ADSH_DASHES)]] == ord('-')
+        if not (dashes.all(axis=1) | (ends - starts <= 2)).all():
+            raise ValueError('Cannot index a table whose rows span '
+                             'several lines (e.g. a quoted newline).')
+        change = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+        for i, j in zip(np.concatenate(([0], change)),
+                        np.append(change, len(keys))):
+            adsh = bytes(keys[i])
+            start, end = offset + starts[i], offset + ends[j - 1]
+            if runs and runs[-1][0] == adsh and runs[-1][2] == start:
+                runs[-1] = (adsh, runs[-1][1], int(end))
+            else:
+                runs.append((adsh, int(start), int(end)))
+        offset += len(lines)
+        if not block:
+            break
+    return runs
+
+
+def read_ranges(f: IO, ranges: Iterable[Tuple[int, int]]) -> IO:
+    """Reads the header line and byte ranges (start, end) of a table's
+    stream f. Returns them as one in-memory tab-separated table.
+
+    Ranges must be in increasing order. Bytes between ranges are
+    skipped (a zipfile member is decompressed but not parsed).
+    """
+    data = [f.readline()]
+    position = len(data[0])
+    for start, end in ranges:
+        if start > position:
+            f.seek(start - position, io.SEEK_CUR)
+        data.append(f.read(end - start))
+        position = end
+    return io.BytesIO(b''.join(data))
+
+
+class CompanyIndex:
+    """Persistent index of the rows of each filing (adsh) and company
+    (CIK) in DERA dataset zipfiles.
+
+    Args:
+        dir (str):
+            Directory path to save the index in (e.g. the directory
+            containing DERA datasets as zipfiles).
+
+        dataset (str):
+            DERA dataset of the zipfiles (e.g. 'statements', 'risk').
+
+        tables (List[str]):
+            Optional; adsh-keyed tables to index (default all in
+            DERA_ADSH_TABLES found in each zipfile).
+    """
+
+    def __init__(self, dir: str, dataset: str, tables: List[str] = None):
+        self.path = os.path.join(make_path(dir), f'{dataset}_company_index')
+        self.tables = tables or DERA_ADSH_TABLES
+        self._indexes = {}  # Zipfile path : index
+
+    def build(self, zipfile: str) -> pd.DataFrame:
+        """Returns the index of zipfile, with columns table, adsh, cik,
+        start and end (byte range of consecutive rows of adsh in the
+        table). Loads the saved index unless zipfile has changed since
+        it was built, else builds and saves it.
+        """
+        if zipfile in self._indexes:
+            return self._indexes[zipfile]
+        make_path(self.path)
+        name = os.path.splitext(os.path.basename(zipfile))[0]
+        path = os.path.join(self.path, name)
+        fingerprint = _fingerprint(zipfile)
+        try:
+            with open(f'{path}.json', 'r') as f:
+                saved = json.load(f)
+            if saved == {**fingerprint, 'tables': self.tables}:
+                index = pd.read_parquet(f'{path}.parquet')
+                self._indexes[zipfile] = index
+                return index
+        except (OSError, ValueError):
+            pass
+
+        index = []
+        with ZipFile(zipfile, 'r') as zipObj:
+            members = set(zipObj.namelist())
+            for table in self.tables:
+                if f'{table}.tsv' not in members:
+                    continue
+                with zipObj.open(f'{table}.tsv') as f:
+                    runs = _adsh_runs(f)
+                runs = pd.DataFrame(runs, columns=['adsh', 'start', 'end'])
+                index.append(runs.assign(table=table))
+            sub = pd.DataFrame(columns=['adsh'])
+            if 'sub.tsv' in members:
+                with zipObj.open('sub.tsv') as f:
+                    sub = pd.read_csv(f, sep='\t', dtype=str,
+                                      usecols=lambda c: c in ('adsh', 'cik'))
+        index = pd.concat(index, ignore_index=True)
+        index['adsh'] = index['adsh'].str.decode('utf-8')
+        # Companies (CIK) of filings (-1 if unknown)
+        if 'cik' in sub.columns:
+            ciks = pd.to_numeric(sub.set_index('adsh')['cik'])
+            index['cik'] = index['adsh'].map(ciks).fillna(-1).astype('int64')
+        else:
+            index['cik'] = -1
+        index['table'] = index['table'].astype('category')
+        index = index[['table', 'adsh', 'cik', 'start', 'end']]
+
+        index.to_parquet(f'{path}.parquet.tmp')
+        os.replace(f'{path}.parquet.tmp', f'{path}.parquet')
+        with open(f'{path}.json', 'w') as f:
+            json.dump({**fingerprint, 'tables': self.tables}, f)
+        self._indexes[zipfile] = index
+        return index
+
+    def ranges(self,
+               zipfile: str,
+               table: str,
+               cik: Iterable[int] = None,
+               adsh: Iterable[str] = None) -> List[Tuple[int, int]]:
+        """Returns the byte ranges (in increasing order) of rows in
+        zipfile's table filed by companies cik and/or filings adsh.
+        """
+        if table not in self.tables:
+            raise ValueError(f'Table not indexed: {table}')
+        index = self.build(zipfile)
+        mask = (index['table'] == table).to_numpy()
+        if cik is not None:
+            mask = mask & index['cik'].isin(list(cik)).to_numpy()
+        if adsh is not None:
+            mask = mask & index['adsh'].isin(list(adsh)).to_numpy()
+        rows = index[mask].sort_values('start')
+        return list(zip(rows['start'].tolist(), rows['end'].tolist()))
+
+    def filings(self, zipfile: str, cik: Iterable[int]) -> List[str]:
+        """Returns the accession numbers (adsh) of filings in zipfile
+        by companies cik.
+        """
+        index = self.build(zipfile)
+        sub = index[(index['table'] == 'sub') & index['cik'].isin(list(cik))]
+        return sub['adsh'].tolist()
+
+
+if __name__ == "__main__":
+    pass
@@ -24,13 +24,37 @@ You can find the SEC's standard taxonomies at https://www.sec.gov/info/edgar/edg
 """
 
 import os
+import numpy as np
 import pandas as pd
 import tempfile
 
 from tqdm import tqdm
+from functools import partial
+from pandas.api.types import union_categoricals
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from zipfile import ZipFile
+from typing import Any
 from typing import Dict
+from typing import IO
+from typing import Iterator
+from typing import List
+from typing import Tuple
+from typing import Union
 
-from getdera.utils import unzip
+from getdera.cache import TableCache
+from getdera.company import CompanyIndex
+from getdera.company import read_ranges
+from getdera.tags import DERA_TAG_KEYS
+from getdera.tags import TagDictionary
+from getdera.schemas import get_schema
+from getdera.schemas import split_schema
+from getdera.search import TextIndex
+from getdera.utils import UNZIP_MAX_THREADS
+from getdera.utils import _import_pyarrow
+from getdera.utils import unzip_members
+from getdera.utils import encode_adsh
 from getdera.utils import get_start_end_strftimes
 from getdera.utils import get_quarters
 from getdera.utils import get_year_months
@@ -41,10 +65,322 @@ DERA_DATA_EXT = {
     'statements': '_notes.zip',
 }  # DERA dataset identifier and extension
 
+DERA_TABLE_INDEX = {
+    'tag': ['tag', 'version'],
+    'sub': 'adsh',
+    'txt': None,
+    'num': None,
+    'pre': ['adsh', 'report', 'line'],
+    'cal': ['adsh', 'grp', 'arc'],
+    'dim': 'dimhash',
+    'ren': ['adsh', 'report'],
+    'lab': ['adsh', 'tag', 'version'],
+}  # Index of processed tables (None if no natural key)
 
-def _process_tag(tmpdir: str) -> pd.DataFrame:
-    """Concatenate all TAG tables in dataset zipfiles
-    found in tmpdir along index (axis=0). Removes duplicate tags.
+
+# A table is either a file path, a file-like object, or a
+# (zipfile path, member name) pair
+Table = Union[str, IO, Tuple[str, str]]
+
+# Number of rows parsed at a time when filtering rows
+FILTER_CHUNKSIZE = 100000
+
+DERA_ENGINES = [
+    'pandas',  # pd.read_csv's C parser (single-threaded)
+    'pyarrow',  # pyarrow's multithreaded CSV reader (Arrow-backed strings)
+]
+
+# Strings parsed as missing values by the pyarrow engine (the default
+# na_values of pd.read_csv)
+DERA_NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None',
+    'n/a', 'nan', 'null',
+]
+
+
+@contextmanager
+def _open_table(t: Table) -> Iterator[Union[str, IO]]:
+    """Yields a file path or file-like object for pd.read_csv. If t is a
+    (zipfile path, member name) pair, yields the member as a
+    decompressing stream.
+    """
+    if isinstance(t, tuple):
+        zipfile, member = t
+        with ZipFile(zipfile, 'r') as zipObj, zipObj.open(member) as f:
+            yield f
+    else:
+        yield t
+
+
+def _parse_dates(data: pd.DataFrame,
+                 dates: Dict[str, str] = None) -> pd.DataFrame:
+    """Converts date columns (column name : strftime format) in data
+    to datetime64. Unparseable dates are set to NaT.
+
+    Integer yyyymmdd columns are converted arithmetically, without
+    formatting each date as a string. Missing dates are set to NaT.
+    """
+    for col, date_format in (dates or {}).items():
+        if col not in data.columns:
+            continue
+        if date_format == '%Y%m%d' and \
+                pd.api.types.is_integer_dtype(data[col]):
+            ymd = data[col]
+            valid = ymd.notna()
+            ymd = ymd[valid].astype('int64')
+            parsed = pd.Series(pd.NaT, index=data.index,
+                               dtype='datetime64[ns]')
+            parsed[valid] = pd.to_datetime(
+                pd.DataFrame({'year': ymd // 10000,
+                              'month': ymd // 100 % 100,
+                              'day': ymd % 100}),
+                errors='coerce')
+            data[col] = parsed
+        else:
+            data[col] = pd.to_datetime(data[col], format=date_format,
+                                       errors='coerce')
+    return data
+
+
+def _concat(tables: List[pd.DataFrame], **kwargs) -> pd.DataFrame:
+    """Concatenates tables with pd.concat (passing kwargs), keeping
+    categorical columns categorical by taking the union of their
+    categories across tables.
+    """
+    tables = list(tables)
+    if len(tables) > 1:
+        categorical = [c for c, t in tables[0].dtypes.items()
+                       if isinstance(t, pd.CategoricalDtype)]
+        for col in categorical:
+            columns = [t[col] for t in tables if col in t.columns and len(t)]
+            if not columns:
+                continue
+            # A column with no values in a period (e.g. coreg) has object
+            # categories, which union_categoricals won't combine with str
+            dtypes = {c.cat.categories.dtype for c in columns
+                      if len(c.cat.categories)}
+            dtype = dtypes.pop() if len(dtypes) == 1 else str
+            columns = [c.cat.set_categories(c.cat.categories.astype(dtype))
+                       for c in columns]
+            categories = union_categoricals(columns).categories
+            tables = [t.assign(**{col: t[col].cat.set_categories(categories)})
+                      if col in t.columns else t for t in tables]
+    return pd.concat(tables, **kwargs)
+
+
+def _filter_rows(data: pd.DataFrame,
+                 filters: Dict[str, Any] = None,
+                 columns: List[str] = None) -> pd.DataFrame:
+    """Returns rows of data where each filters column is equal to (or,
+    if given a list, in) the column's filter value(s). If columns is
+    given, drops columns not in columns.
+    """
+    if filters:
+        mask = np.ones(len(data), dtype=bool)
+        for col, values in filters.items():
+            if not pd.api.types.is_list_like(values):
+                values = [values]
+            mask &= data[col].isin(values).to_numpy()
+        data = data[mask]
+    if columns is not None:
+        data = data[[c for c in data.columns if c in columns]]
+    return data
+
+
+def _infer_arrow(column, pa):
+    """Converts an Arrow string column as pd.read_csv's type inference
+    does: to int64 or float64 if every value parses, else keeps it as
+    strings.
+    """
+    # Arrow also casts hexadecimal strings (e.g. dimh) to integers
+    decimal = pa.compute.all(
+        pa.compute.match_substring_regex(column, r'^-?[0-9]+$'))
+    types = [pa.float64()]
+    if decimal.as_py() is not False:
+        types.insert(0, pa.int64())
+    for type in types:
+        try:
+            return column.cast(type)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            continue
+    return column
+
+
+def _read_arrow(f: IO,
+                dtype: Dict[str, str] = None,
+                usecols: List[str] = None) -> pd.DataFrame:
+    """Reads a tab-separated DERA table (a binary stream) with
+    pyarrow's multithreaded CSV reader into the same DataFrame as
+    pd.read_csv.
+
+    Strings are parsed into Arrow buffers (category columns straight
+    into dictionary arrays) instead of Python objects. Columns not in
+    dtype are parsed as strings and converted as pandas infers them,
+    e.g. dates in free text are not inferred as timestamps.
+    """
+    pa = _import_pyarrow("engine='pyarrow'")
+    csv = pa.csv
+    dtype = {c: pd.api.types.pandas_dtype(d)
+             for c, d in (dtype or {}).items()}
+    names = f.readline().decode('utf-8').rstrip('\r\n').split('\t')
+    column_types = {}
+    for col in names:
+        t = dtype.get(col)
+        if isinstance(t, pd.CategoricalDtype):
+            column_types[col] = pa.dictionary(pa.int32(), pa.string())
+        elif t is None or t.kind not in 'biuf':
+            # Strings, and columns to infer
+            column_types[col] = pa.string()
+        else:
+            # NumPy and nullable (e.g. 'Int16', 'boolean') numeric dtypes
+            column_types[col] = pa.from_numpy_dtype(
+                getattr(t, 'numpy_dtype', t))
+    table = csv.read_csv(
+        f,
+        read_options=csv.ReadOptions(column_names=names, use_threads=True),
+        parse_options=csv.ParseOptions(delimiter='\t'),
+        convert_options=csv.ConvertOptions(
+            column_types=column_types, include_columns=usecols,
+            null_values=DERA_NA_VALUES, strings_can_be_null=True,
+            true_values=['1', 'True', 'TRUE', 'true'],
+            false_values=['0', 'False', 'FALSE', 'false']))
+    if usecols is not None:
+        # Columns in file order, as pd.read_csv
+        table = table.select([c for c in names if c in usecols])
+    for i, col in enumerate(table.column_names):
+        if col not in dtype:
+            table = table.set_column(i, col, _infer_arrow(table[col], pa))
+    # Release Arrow buffers as columns are converted
+    data = table.to_pandas(split_blocks=True, self_destruct=True)
+    del table
+    for col, t in dtype.items():
+        if col not in data.columns:
+            continue
+        if isinstance(t, pd.CategoricalDtype):
+            # pd.read_csv sorts inferred categories
+            categories = data[col].cat.categories
+            data[col] = data[col].cat.reorder_categories(
+                categories.sort_values())
+        elif data[col].dtype != t:
+            data[col] = data[col].astype(t)
+    return data
+
+
+def _iter_csv(t: Table,
+              dtype: Dict[str, str] = None,
+              chunksize: int = None,
+              columns: List[str] = None,
+              filters: Dict[str, Any] = None,
+              dates: Dict[str, str] = None,
+              engine: str = 'pandas') -> Iterator[pd.DataFrame]:
+    """Yields a tab-separated DERA table in chunks of chunksize rows.
+    Yields the whole table if chunksize is None. Date columns in dates
+    (column name : strftime format) are converted to datetime64.
+
+    Only columns (and columns in filters) are parsed. If filters is
+    given, the table is parsed in chunks and rows not matching filters
+    are dropped from each chunk, so memory is bounded by a chunk.
+
+    The pyarrow engine (see DERA_ENGINES) parses the whole table at
+    once, then drops rows not matching filters and yields the same
+    chunks as the pandas engine. Its memory is bounded by the whole
+    table, not by a chunk.
+    """
+    usecols = None
+    if columns is not None:
+        usecols = list(dict.fromkeys([*columns, *(filters or {})]))
+    if engine == 'pyarrow':
+        if isinstance(t, str):
+            with open(t, 'rb') as f:
+                data = _read_arrow(f, dtype, usecols)
+        else:
+            with _open_table(t) as f:
+                data = _read_arrow(f, dtype, usecols)
+        data = _parse_dates(data, dates)
+        if chunksize is None:
+            yield _filter_rows(data, filters, columns) if filters else data
+        else:
+            for start in range(0, len(data), chunksize):
+                yield _filter_rows(data.iloc[start:start + chunksize],
+                                   filters, columns)
+        return
+    with _open_table(t) as f:
+        if chunksize is None and not filters:
+            data = pd.read_csv(f, sep='\t', dtype=dtype, usecols=usecols)
+            yield _parse_dates(data, dates)
+            return
+        with pd.read_csv(f, sep='\t', dtype=dtype, usecols=usecols,
+                         chunksize=chunksize or FILTER_CHUNKSIZE) as reader:
+            chunks = (_filter_rows(_parse_dates(c, dates), filters, columns)
+                      for c in reader)
+            if chunksize is not None:
+                yield from chunks
+            else:
+                yield _concat(chunks, axis=0)
+
+
+def _read_csv(t: Table, **kwargs) -> pd.DataFrame:
+    """Reads a tab-separated DERA table. See `_iter_csv` for kwargs.
+    """
+    return next(_iter_csv(t, **kwargs))
+
+
+def _read_tables(tables: List[Table],
+                 workers: int = 1,
+                 cache: TableCache = None,
+                 **kwargs) -> List[pd.DataFrame]:
+    """Reads tables in order, passing kwargs (e.g. dtype, columns,
+    filters) to `_read_csv`. If workers > 1, tables are parsed
+    concurrently in a pool of worker processes (tables must then be
+    file paths or (zipfile path, member name) pairs).
+
+    If cache is given, tables (which must then be (zipfile path,
+    member name) pairs) are loaded from the cache when possible, and
+    parsed tables are saved to the cache.
+    """
+    data = [None] * len(tables)
+    if cache is not None:
+        data = [cache.get(t, **kwargs) for t in tables]
+    missing = [t for t, d in zip(tables, data) if d is None]
+
+    reader = partial(_read_csv, **kwargs)
+    if workers > 1 and len(missing) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map returns results in the order of tables
+            results = executor.map(reader, missing)
+            parsed = list(tqdm(results, total=len(missing)))
+    else:
+        parsed = [reader(t) for t in tqdm(missing)]
+
+    parsed = iter(parsed)
+    for i, (t, d) in enumerate(zip(tables, data)):
+        if d is None:
+            data[i] = next(parsed)
+            if cache is not None:
+                cache.put(t, data[i], **kwargs)
+    if cache is not None:
+        cache.evict()
+    return data
+
+
+def _drop_seen(data: pd.DataFrame,
+               seen: pd.Index = None) -> Tuple[pd.DataFrame, pd.Index]:
+    """Drops rows whose index is duplicated or in seen (the index of
+    rows kept so far). Returns the remaining rows and the updated seen.
+    """
+    data = data[~data.index.duplicated(keep='first')]
+    if seen is not None:
+        data = data[~data.index.isin(seen)]
+        seen = seen.append(data.index)
+    else:
+        seen = data.index
+    return data, seen
+
+
+def _process_tag(tables: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate all TAG tables along index (axis=0).
+    Removes duplicate tags.
 
     The TAG (Tags) table contains all standard taxonomy tags
     and custom tags found in the downloaded tables.
@@ -54,49 +390,436 @@ def _process_tag(tmpdir: str) -> pd.DataFrame:
     References:
     https://www.sec.gov/info/edgar/edgartaxonomies.shtml
     """
-    # UNION all TAG tables on columns
-    table_paths = [os.path.join(tmpdir, f) for f in os.listdir(tmpdir)]
-    tables = [pd.read_csv(t, sep='\t')
-                .set_index(['tag', 'version']) for t in table_paths]
-    data = pd.concat(tables, axis=0)
-    data = data[~data.index.duplicated(keep='first')]
+    # UNION all TAG tables on columns, dropping tags of earlier periods
+    # before concatenation
+    kept = []
+    seen = None
+    for t in tables:
+        t, seen = _drop_seen(t.set_index(['tag', 'version']), seen)
+        kept.append(t)
+    data = _concat(kept, axis=0)
     return data
 
 
-def _process_sub(tmpdir: str, dtype: Dict[str, str] = None) -> pd.DataFrame:
-    """Concatenate all SUB tables in dataset zipfiles
-    found in tmpdir along index (axis=0).
+def _process_sub(tables: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate all SUB tables along index (axis=0).
 
     Sets adsh (20 character EDGAR Accession Number) attribute as index.
     """
-    table_paths = [os.path.join(tmpdir, f) for f in os.listdir(tmpdir)]
-    tables = []
-    for t in tqdm(table_paths):
-        tables.append(pd.read_csv(t, sep='\t', dtype=dtype))
-    data = pd.concat(tables, axis=0).set_index('adsh')
+    data = _concat(tables, axis=0).set_index('adsh')
     return data
 
 
-def _process_txt(tmpdir: str, dtype: Dict[str, str] = None) -> pd.DataFrame:
-    """Concatenate all TXT tables in dataset zipfiles
-    found in tmpdir along index (axis=0).
+def _process_txt(tables: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate all TXT tables along index (axis=0).
 
     Note: no natural key used as index.
     """
-    table_paths = [os.path.join(tmpdir, f) for f in os.listdir(tmpdir)]
-    tables = []
-    for t in tqdm(table_paths):
-        tables.append(pd.read_csv(t, sep='\t', dtype=dtype))
-    data = pd.concat(tables, axis=0, ignore_index=True)
+    data = _concat(tables, axis=0, ignore_index=True)
+    return data
+
+
+def _process_num(tables: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate all NUM tables along index (axis=0).
+
+    The NUM (Numbers) table contains one row for each numeric fact
+    (adsh, tag, version, ddate, qtrs, uom, ...) and is the largest
+    table in DERA datasets. With the default compact schema, adsh,
+    tag, version, uom and coreg are categoricals, value is float64,
+    and ddate is datetime64 (converted from yyyymmdd integers).
+
+    Note: no natural key used as index.
+    """
+    data = _concat(tables, axis=0, ignore_index=True)
+    return data
+
+
+def _process_pre(tables: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate all PRE tables along index (axis=0).
+
+    The PRE (Presentation) table contains one row for each line of
+    the financial statements tagged by the filer.
+
+    Sets multindex with adsh, report and line attributes.
+    """
+    data = _concat(tables, axis=0).set_index(['adsh', 'report', 'line'])
+    return data
+
+
+def _process_cal(tables: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate all CAL tables along index (axis=0).
+
+    The CAL (Calculations) table contains one row for each
+    calculation relationship (arc) between a parent and a child tag.
+
+    Sets multindex with adsh, grp and arc attributes.
+    """
+    data = _concat(tables, axis=0).set_index(['adsh', 'grp', 'arc'])
+    return data
+
+
+def _process_dim(tables: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate all DIM tables along index (axis=0).
+    Removes duplicate dimensions.
+
+    The DIM (Dimensions) table contains one row for each
+    distinct set of dimension members (segments) referenced by dimh.
+
+    Sets dimhash attribute as index.
+    """
+    kept = []
+    seen = None
+    for t in tables:
+        t, seen = _drop_seen(t.set_index('dimhash'), seen)
+        kept.append(t)
+    data = _concat(kept, axis=0)
     return data
 
 
+def _process_ren(tables: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate all REN tables along index (axis=0).
+
+    The REN (Rendering) table contains one row for each report
+    (e.g. statement, note) rendered on the SEC website.
+
+    Sets multindex with adsh and report attributes.
+    """
+    data = _concat(tables, axis=0).set_index(['adsh', 'report'])
+    return data
+
+
+def _process_lab(tables: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate all LAB tables along index (axis=0).
+
+    The LAB (Labels) table contains the labels of each tag
+    used by a submission.
+
+    Sets multindex with adsh, tag and version attributes.
+    """
+    data = _concat(tables, axis=0).set_index(['adsh', 'tag', 'version'])
+    return data
+
+
+def _period_files(dataset: str,
+                  start_date: str,
+                  end_date: str = None) -> List[str]:
+    """Returns names of DERA dataset zipfiles of periods between
+    start_date and end_date (in period order).
+    """
+    # Start date and end date strftimes
+    start_date, end_date = get_start_end_strftimes(start_date, end_date)
+
+    # If statements dataset and end_date on or after 2020-10-01
+    if dataset == 'statements' and end_date >= '2020-10-01':
+        quarters_range = get_quarters(start_date, '2020-09-01')
+        months_range = get_year_months('2020-10-01', end_date)
+        date_range = quarters_range + months_range
+    else:
+        # Get list of quarters between start_date and end_date
+        date_range = get_quarters(start_date, end_date)
+
+    ext = DERA_DATA_EXT[dataset]  # Dataset identifer and extension
+    return [f'{date}{ext}' for date in date_range]
+
+
+def _relevant_files(dir: str,
+                    dataset: str,
+                    start_date: str,
+                    end_date: str = None) -> List[str]:
+    """Returns names of DERA dataset zipfiles found in dir for periods
+    between start_date and end_date (in period order).
+
+    Raises FileNotFoundError if no relevant zipfiles are found.
+    """
+    # Get list of relevant file names (in period order)
+    downloaded = set(os.listdir(dir))
+    relevant_files = [f for f in _period_files(dataset, start_date, end_date)
+                      if f in downloaded]
+
+    # If no relevant files downloaded
+    if not(relevant_files):
+        raise FileNotFoundError('No downloaded DERA datasets between '
+                                'start date and end date.')
+    return relevant_files
+
+
+def _encode_adsh(data: pd.DataFrame) -> pd.DataFrame:
+    """Replaces the adsh column (if any) with int64 encoded accession
+    numbers (see `getdera.utils.encode_adsh`). Categorical columns
+    are encoded once per category.
+    """
+    if 'adsh' not in data.columns:
+        return data
+    adsh = data['adsh']
+    if isinstance(adsh.dtype, pd.CategoricalDtype):
+        codes = encode_adsh(adsh.cat.categories)[adsh.cat.codes.to_numpy()]
+    else:
+        codes = encode_adsh(adsh.to_numpy())
+    return data.assign(adsh=codes)
+
+
+def _encode_tags(data: pd.DataFrame, tags: TagDictionary) -> pd.DataFrame:
+    """Replaces (tag, version) column pairs (see
+    `getdera.tags.DERA_TAG_KEYS`) with int32 tag IDs from tags.
+    """
+    for id_column, (tag, version) in DERA_TAG_KEYS.items():
+        if tag in data.columns and version in data.columns:
+            ids = tags.add(data[tag], data[version])
+            loc = data.columns.get_loc(tag)
+            data = data.drop(columns=[tag, version])
+            data.insert(loc, id_column, ids)
+    return data
+
+
+def _assemble(table: str,
+              tables: List[pd.DataFrame],
+              encode_adsh: bool = False,
+              tags: TagDictionary = None) -> pd.DataFrame:
+    """Dispatches parsed tables (one per period) to the processing
+    function of the specified table. If encode_adsh, accession numbers
+    are encoded as int64 before tables are concatenated. If tags,
+    tags are replaced by their IDs (except in TAG and LAB tables,
+    which are indexed by tag).
+    """
+    if encode_adsh:
+        tables = [_encode_adsh(t) for t in tables]
+    if tags is not None and table not in ('tag', 'lab'):
+        tables = [_encode_tags(t, tags) for t in tables]
+
+    # Process specified table
+    if table == 'tag':
+        data = _process_tag(tables)
+
+    elif table == 'sub':
+        data = _process_sub(tables)
+
+    elif table == 'txt':
+        data = _process_txt(tables)
+
+    elif table == 'num':
+        data = _process_num(tables)
+
+    elif table == 'pre':
+        data = _process_pre(tables)
+
+    elif table == 'cal':
+        data = _process_cal(tables)
+
+    elif table == 'dim':
+        data = _process_dim(tables)
+
+    elif table == 'ren':
+        data = _process_ren(tables)
+
+    elif table == 'lab':
+        data = _process_lab(tables)
+
+    else:
+        raise ValueError(f'Unsupported table: {table}')
+
+    return data
+
+
+def _process_table(table: str,
+                   tables: List[Table],
+                   workers: int = 1,
+                   cache: TableCache = None,
+                   encode_adsh: bool = False,
+                   tags: TagDictionary = None,
+                   **kwargs) -> pd.DataFrame:
+    """Reads tables (one per period) and processes them as the
+    specified table. kwargs (e.g. dtype, columns, filters) are passed
+    to the table reader.
+    """
+    if table not in DERA_TABLE_INDEX:
+        raise ValueError(f'Unsupported table: {table}')
+    data = _read_tables(tables, workers, cache, **kwargs)
+    return _assemble(table, data, encode_adsh, tags)
+
+
+def _read_period(
+        zipfile: Union[str, IO],
+        options: Dict[str, Dict[str, Any]],
+        missing_ok: bool = False,
+        threads: int = 1) -> Dict[str, pd.DataFrame]:
+    """Opens a DERA dataset zipfile (path or file object) once and
+    parses each table in options (table : reader options) from its
+    member. If missing_ok, tables without a member are skipped. If
+    threads > 1, members are decompressed and parsed concurrently on a
+    pool of threads.
+    """
+    with ZipFile(zipfile, 'r') as zipObj:
+        members = set(zipObj.namelist())
+        tables = [t for t in options
+                  if not missing_ok or f'{t}.tsv' in members]
+
+        def _read(table):
+            with zipObj.open(f'{table}.tsv') as f:
+                return _read_csv(f, **options[table])
+
+        threads = min(threads, len(tables), UNZIP_MAX_THREADS)
+        if threads > 1:
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                data = list(executor.map(_read, tables))
+        else:
+            data = [_read(t) for t in tables]
+    return dict(zip(tables, data))
+
+
+def _process_tables(zipfiles: List[str],
+                    options: Dict[str, Dict[str, Any]],
+                    workers: int = 1,
+                    cache: TableCache = None,
+                    encode_adsh: bool = False,
+                    tags: TagDictionary = None,
+                    threads: int = 1) -> Dict[str, pd.DataFrame]:
+    """Processes multiple tables (table : reader options) in a single
+    pass over each zipfile. If workers > 1, zipfiles are parsed
+    concurrently in a pool of worker processes. If threads > 1, the
+    members of each zipfile are parsed concurrently on threads.
+
+    Returns:
+        Dict[str, DataFrame] -- table : processed table.
+    """
+    for table in options:
+        if table not in DERA_TABLE_INDEX:
+            raise ValueError(f'Unsupported table: {table}')
+
+    # Cached tables of each period
+    periods = [{} for _ in zipfiles]
+    if cache is not None:
+        for zipfile, period in zip(zipfiles, periods):
+            for table, kwargs in options.items():
+                data = cache.get((zipfile, f'{table}.tsv'), **kwargs)
+                if data is not None:
+                    period[table] = data
+    # Tables to parse from each zipfile
+    missing = [{t: kwargs for t, kwargs in options.items() if t not in p}
+               for p in periods]
+    todo = [(z, m) for z, m in zip(zipfiles, missing) if m]
+
+    if workers > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map returns results in the order of zipfiles
+            results = executor.map(_read_period, *zip(*todo),
+                                   [False] * len(todo),
+                                   [threads] * len(todo))
+            parsed = list(tqdm(results, total=len(todo)))
+    else:
+        parsed = [_read_period(z, m, threads=threads)
+                  for z, m in tqdm(todo)]
+
+    parsed = iter(parsed)
+    for zipfile, period, m in zip(zipfiles, periods, missing):
+        if not m:
+            continue
+        for table, data in next(parsed).items():
+            period[table] = data
+            if cache is not None:
+                cache.put((zipfile, f'{table}.tsv'), data, **options[table])
+    if cache is not None:
+        cache.evict()
+
+    return {table: _assemble(table, [p[table] for p in periods],
+                             encode_adsh, tags)
+            for table in options}
+
+
+def _process_company(table: str,
+                     zipfiles: List[str],
+                     cik: List[int],
+                     company_index: CompanyIndex,
+                     encode_adsh: bool = False,
+                     tags: TagDictionary = None,
+                     **kwargs) -> pd.DataFrame:
+    """Reads only the rows of companies cik in each zipfile's table,
+    looked up in company_index, and processes them as the specified
+    table. kwargs are passed to the table reader.
+    """
+    tables = []
+    for zipfile in zipfiles:
+        ranges = company_index.ranges(zipfile, table, cik=cik)
+        with ZipFile(zipfile, 'r') as zipObj, \
+                zipObj.open(f'{table}.tsv') as f:
+            tables.append(_read_csv(read_ranges(f, ranges), **kwargs))
+    # Periods without rows have no inferred dtypes
+    tables = [t for t in tables if len(t)] or tables[:1]
+    return _assemble(table, tables, encode_adsh, tags)
+
+
+def _index_columns(table: str) -> List[str]:
+    """Returns the table's index columns (empty if no natural key).
+    """
+    index = DERA_TABLE_INDEX.get(table) or []
+    if isinstance(index, str):
+        index = [index]
+    return index
+
+
+def _with_index(table: str, columns: List[str] = None) -> List[str]:
+    """Returns columns with the table's index columns (if any)
+    prepended.
+    """
+    if columns is None:
+        return None
+    return list(dict.fromkeys([*_index_columns(table), *columns]))
+
+
+def _schema_options(dataset: str,
+                    table: str,
+                    dtype: Dict[str, str] = None,
+                    schema: bool = True) -> Dict[str, Any]:
+    """Returns the dtype and dates (date column : strftime format)
+    reader options of a table. If schema, uses the table's compact
+    schema (excluding index columns), overridden by dtype.
+    """
+    if not schema:
+        return {'dtype': dtype, 'dates': None}
+    exclude = _index_columns(table)
+    dtypes, dates = split_schema(get_schema(dataset, table, exclude))
+    dtypes.update(dtype or {})
+    dates = {k: v for k, v in dates.items() if k not in (dtype or {})}
+    return {'dtype': dtypes or None, 'dates': dates or None}
+
+
+def _reader_options(dataset: str,
+                    table: str,
+                    dtype: Dict[str, str] = None,
+                    schema: bool = True,
+                    columns: List[str] = None,
+                    filters: Dict[str, Any] = None,
+                    engine: str = 'pandas') -> Dict[str, Any]:
+    """Returns the reader options (dtype, dates, columns, filters,
+    engine) of a table.
+    """
+    if engine not in DERA_ENGINES:
+        raise ValueError(f'Unsupported engine: {engine}')
+    return {**_schema_options(dataset, table, dtype, schema),
+            'columns': _with_index(table, columns),
+            'filters': filters,
+            'engine': engine}
+
+
 def process(dir: str,
             dataset: str,
-            table: str,
+            table: Union[str, List[str]],
             start_date: str,
             end_date: str = None,
-            dtype: Dict[str, str] = None) -> pd.DataFrame:
+            dtype: Dict[str, str] = None,
+            stream: bool = False,
+            workers: int = 1,
+            cache: TableCache = None,
+            columns: Union[List[str], Dict[str, List[str]]] = None,
+            filters: Union[Dict[str, Any], Dict[str, Dict[str, Any]]] = None,
+            schema: bool = True,
+            encode_adsh: bool = False,
+            tags: TagDictionary = None,
+            cik: List[int] = None,
+            company_index: CompanyIndex = None,
+            threads: int = 1,
+            engine: str = 'pandas',
+            text_index: TextIndex = None
+            ) -> Union[pd.DataFrame, Dict[str, pd.DataFrame]]:
     """Processes DERA dataset zipfiles found in dir for quarters between
     start_date and end_date.
 
@@ -110,8 +833,10 @@ def process(dir: str,
             1. 'statements': Financial Statements and Notes
             2. 'risk': Mutual Fund Prospectus Risk and Return Summary
 
-        table (str): 
-            Tables in datasets to process.
+        table (Union[str, List[str]]): 
+            Tables in datasets to process. If a list of tables,
+            each zipfile is opened once and all its tables are parsed
+            in a single pass (see Returns).
             Supported tables (and corresponding datasets) include:
 
             - 'tag' -- tag.tsv files in:
@@ -124,6 +849,27 @@ def process(dir: str,
 
             - 'txt' -- txt.tsv files in:
                 1. Mutual Fund Prospectus Risk and Return Summary
+                2. Financial Statements and Notes
+
+            - 'num' -- num.tsv files in:
+                1. Mutual Fund Prospectus Risk and Return Summary
+                2. Financial Statements and Notes
+
+            - 'pre' -- pre.tsv files in:
+                1. Financial Statements and Notes
+
+            - 'cal' -- cal.tsv files in:
+                1. Mutual Fund Prospectus Risk and Return Summary
+                2. Financial Statements and Notes
+
+            - 'dim' -- dim.tsv files in:
+                1. Financial Statements and Notes
+
+            - 'ren' -- ren.tsv files in:
+                1. Financial Statements and Notes
+
+            - 'lab' -- lab.tsv files in:
+                1. Mutual Fund Prospectus Risk and Return Summary
 
         start_date (str): 
             Fetch all datasets after start_date.
@@ -144,55 +890,395 @@ def process(dir: str,
         dtype (Dict[str, str]): 
             Column name : dtype for data conversion
 
+        stream (bool): 
+            Optional; if True, parses each table directly from its
+            zipfile member as a decompressing stream instead of first
+            extracting it into a temporary directory. Requires no
+            scratch disk space.
+
+        workers (int): 
+            Optional; number of worker processes parsing period files
+            concurrently. Results are assembled in period order, so the
+            output is identical to serial processing (workers=1).
+            Worker processes parse zipfile members directly.
+
+        cache (TableCache): 
+            Optional; on-disk cache of processed per-period tables.
+            Tables found in the cache (and whose source zipfile is
+            unchanged) are loaded instead of parsed. Tables are parsed
+            directly from zipfile members.
+
+        columns (Union[List[str], Dict[str, List[str]]]): 
+            Optional; columns to parse. Other columns are never
+            materialised. The table's index columns are always parsed.
+            If table is a list, table : columns.
+
+        filters (Union[Dict[str, Any], Dict[str, Dict[str, Any]]]): 
+            Optional; column name : value (or list of values) that
+            rows must match. Rows are filtered while each table is
+            parsed in chunks, e.g. {'form': ['10-K', '10-Q']}.
+            If table is a list, table : filters.
+
+        schema (bool): 
+            Optional; if True (default), columns are parsed with the
+            table's compact schema in `getdera.schemas` (categoricals,
+            booleans, datetimes and narrow numeric dtypes). dtype
+            overrides the schema. Index columns are not converted.
+
+        encode_adsh (bool): 
+            Optional; if True, accession numbers (adsh) are encoded
+            losslessly as int64 (see `getdera.utils.encode_adsh`)
+            instead of 20 character strings, e.g. as a compact index
+            of SUB tables and join key of NUM and TXT tables.
+            Filters on adsh still take strings.
+
+        tags (TagDictionary): 
+            Optional; persistent tag dictionary (see `getdera.tags`).
+            If given, the dictionary is updated with the TAG tables
+            of periods not yet added, and (tag, version) column pairs
+            are replaced by int32 tag IDs, e.g. tag_id in NUM tables
+            and ptag_id, ctag_id in CAL tables. TAG and LAB tables
+            keep their tag strings. Filters on tags still take strings.
+
+        cik (List[int]): 
+            Optional; Central Index Keys of companies whose rows to
+            process. Only the rows of their filings are read (and
+            parsed), looked up in company_index. Supports tables with
+            adsh as their first field (see `getdera.company`).
+
+        company_index (CompanyIndex): 
+            Optional; index of the rows of each company's filings,
+            built (and saved) on first use. Defaults to a CompanyIndex
+            saved in dir if cik is given.
+
+        threads (int): 
+            Optional; number of threads decompressing zipfile members
+            concurrently (at most `getdera.utils.UNZIP_MAX_THREADS`):
+            each period's member when it is extracted into a temporary
+            directory, or the members of each zipfile when table is a
+            list. zlib releases the GIL while inflating.
+
+        engine (str): 
+            Optional; table parser, one of DERA_ENGINES:\n
+            1. 'pandas' (default): pd.read_csv
+            2. 'pyarrow': pyarrow's multithreaded CSV reader, which
+            parses strings into Arrow buffers instead of Python objects
+            (requires pyarrow). Returns the same tables as 'pandas',
+            but parses each table whole before applying filters.
+
+        text_index (TextIndex): 
+            Optional; persistent full-text index of TXT values (see
+            `getdera.search`). If given, the index is updated with the
+            TXT tables of periods not yet indexed.
+
     Returns:
         Pandas DataFrame -- Processed tables inside DERA dataset zipfiles.
+        If table is a list, Dict[str, DataFrame] -- table : processed
+        table.
     """
 
-    # Start date and end date strftimes
-    start_date, end_date = get_start_end_strftimes(start_date, end_date)
+    relevant_files = _relevant_files(dir, dataset, start_date, end_date)
+    relevant_file_paths = [os.path.join(dir, f) for f in relevant_files]
+    if tags is not None:
+        tags.update(relevant_file_paths)
+    if text_index is not None:
+        text_index.update(relevant_file_paths)
+
+    if cik is not None:
+        # Read only rows of the companies' filings
+        company_index = company_index or CompanyIndex(dir, dataset)
+        args = (relevant_file_paths, cik, company_index, encode_adsh, tags)
+        if isinstance(table, (list, tuple)):
+            data = {t: _process_company(
+                        t, *args, **_reader_options(dataset, t, dtype, schema,
+                                                    (columns or {}).get(t),
+                                                    (filters or {}).get(t),
+                                                    engine))
+                    for t in table}
+        else:
+            data = _process_company(
+                table, *args, **_reader_options(dataset, table, dtype, schema,
+                                                columns, filters, engine))
+
+    elif isinstance(table, (list, tuple)):
+        # Parse all tables in a single pass over each zipfile
+        options = {t: _reader_options(dataset, t, dtype, schema,
+                                      (columns or {}).get(t),
+                                      (filters or {}).get(t), engine)
+                   for t in table}
+        data = _process_tables(relevant_file_paths, options, workers, cache,
+                               encode_adsh, tags, threads)
+
+    elif stream or workers > 1 or cache is not None:
+        # Parse each table as a decompressing stream from its zipfile
+        kwargs = _reader_options(dataset, table, dtype, schema, columns,
+                                 filters, engine)
+        tables = [(path, f'{table}.tsv') for path in relevant_file_paths]
+        data = _process_table(table, tables, workers, cache, encode_adsh,
+                              tags, **kwargs)
 
-    # If statements dataset and end_date on or after 2020-10-01
-    if dataset == 'statements' and end_date >= '2020-10-01':
-        quarters_range = get_quarters(start_date, '2020-09-01')
-        months_range = get_year_months('2020-10-01', end_date)
-        date_range = quarters_range + months_range
     else:
-        # Get list of quarters between start_date and end_date
-        date_range = get_quarters(start_date, end_date)
+        kwargs = _reader_options(dataset, table, dtype, schema, columns,
+                                 filters, engine)
+        # Create tmp dir
+        with tempfile.TemporaryDirectory(dir=tempfile.gettempdir()) as tmpdir:
+            # Unzip each period's table into its own tmp subdir
+            members = [(path, f'{table}.tsv',
+                        f'{tmpdir}/{f.split(".")[0]}')
+                       for path, f in zip(relevant_file_paths,
+                                          relevant_files)]
+            unzip_members(members, threads)
+            tables = [f'{subdir}/{member}' for _, member, subdir in members]
+            data = _process_table(table, tables, encode_adsh=encode_adsh,
+                                  tags=tags, **kwargs)
 
-    # Get list of relevant file names
-    ext = DERA_DATA_EXT[dataset]  # Dataset identifer and extension
-    relevant_files = [f'{date}{ext}' for date in date_range]
-    relevant_file_paths = [os.path.join(dir, f) for f in os.listdir(dir)
-                           if f in relevant_files]
+    if tags is not None:
+        tags.save()
+    return data
 
-    # If no relevant files downloaded
-    if not(relevant_file_paths):
-        raise FileNotFoundError('No downloaded DERA datasets between '
-                                'start date and end date.')
 
-    # Create tmp dir
-    with tempfile.TemporaryDirectory(dir=tempfile.gettempdir()) as tmpdir:
-        # Unzip tables into tmp dir
-        for i in range(len(relevant_files)):
-            path = relevant_file_paths[i]
-            f = relevant_files[i]
-            unzip(f'{path}', f'{table}.tsv', tmpdir)
-            dataset_name = f.split('.')[0]
-            os.rename(f'{tmpdir}/{table}.tsv',
-                      f'{tmpdir}/{dataset_name}_{table}.tsv')
+def process_iter(dir: str,
+                 dataset: str,
+                 table: str,
+                 start_date: str,
+                 end_date: str = None,
+                 dtype: Dict[str, str] = None,
+                 chunksize: int = None,
+                 columns: List[str] = None,
+                 filters: Dict[str, Any] = None,
+                 schema: bool = True,
+                 encode_adsh: bool = False,
+                 tags: TagDictionary = None) -> Iterator[pd.DataFrame]:
+    """Processes DERA dataset zipfiles found in dir for quarters between
+    start_date and end_date, yielding one DataFrame per period (in
+    period order) or per chunk of rows within a period.
+
+    Unlike `process`, only one period (or chunk) is held in memory
+    at a time. Tables are parsed directly from zipfile members.
 
-        # Process specified table
-        if table == 'tag':
-            data = _process_tag(tmpdir)
+    Args:
+        dir (str): 
+            Path to directory containg DERA datasets as zipfiles.
 
-        elif table == 'sub':
-            data = _process_sub(tmpdir, dtype)
+        dataset (str): 
+            DERA dataset to process. See `process`.
 
-        elif table == 'txt':
-            data = _process_txt(tmpdir, dtype)
+        table (str): 
+            Tables in datasets to process. See `process`.
 
-    return data
+        start_date (str): 
+            Fetch all datasets after start_date. See `process`.
+
+        end_date (Union[None, str]): 
+            Optional; fetch all datasets before end_date.
+            See `process`.
+
+        dtype (Dict[str, str]): 
+            Column name : dtype for data conversion
+
+        chunksize (int): 
+            Optional; number of rows per yielded DataFrame. If None,
+            yields each period's table as one DataFrame.
+
+        columns (List[str]): 
+            Optional; columns to parse. See `process`.
+
+        filters (Dict[str, Any]): 
+            Optional; column name : value (or list of values) that
+            rows must match. See `process`.
+
+        schema (bool): 
+            Optional; if True (default), columns are parsed with the
+            table's compact schema. See `process`.
+
+        encode_adsh (bool): 
+            Optional; if True, accession numbers are encoded as int64.
+            See `process`.
+
+        tags (TagDictionary): 
+            Optional; persistent tag dictionary. If given, tags are
+            replaced by int32 tag IDs. See `process`.
+
+    Yields:
+        Pandas DataFrame -- Processed chunks of tables inside DERA
+        dataset zipfiles, indexed as in `process`. TAG (and DIM) rows
+        already yielded for an earlier period (or chunk) are dropped
+        (and chunks left empty are skipped).
+    """
+    if table not in DERA_TABLE_INDEX:
+        raise ValueError(f'Unsupported table: {table}')
+    index = DERA_TABLE_INDEX[table]
+    kwargs = {**_reader_options(dataset, table, dtype, schema, columns,
+                                filters),
+              'chunksize': chunksize}
+
+    relevant_files = _relevant_files(dir, dataset, start_date, end_date)
+    seen = None  # Index of TAG (or DIM) rows yielded so far
+    for f in relevant_files:
+        t = (os.path.join(dir, f), f'{table}.tsv')
+        if tags is not None:
+            tags.update([t[0]])
+        for data in _iter_csv(t, **kwargs):
+            if encode_adsh:
+                data = _encode_adsh(data)
+            if tags is not None and table not in ('tag', 'lab'):
+                data = _encode_tags(data, tags)
+            if index is not None:
+                data = data.set_index(index)
+            if table in ('tag', 'dim'):
+                data, seen = _drop_seen(data, seen)
+                if data.empty:
+                    continue
+            yield data
+        if tags is not None:
+            tags.save()
+
+
+def _key_positions(index: pd.Index,
+                   keys: List[pd.Series]) -> Tuple[np.ndarray, np.ndarray]:
+    """Factorizes the key column(s) keys and looks up each distinct key
+    once in index's hash table (which pandas builds once per index and
+    reuses across lookups).
+
+    Returns:
+        codes (np.ndarray) -- code of each row's key (-1 if missing),
+        positions (np.ndarray) -- position in index of each code's key
+        (-1 if not found).
+    """
+    if len(keys) != index.nlevels:
+        raise ValueError(f'Expected {index.nlevels} key columns, '
+                         f'got {len(keys)}')
+    if len(keys) == 1:
+        codes, uniques = pd.factorize(keys[0])
+        positions = index.get_indexer(uniques)
+    else:
+        # Factorize each key column, then each distinct combination
+        factors = [pd.factorize(key) for key in keys]
+        combined = np.zeros(len(keys[0]), dtype=np.int64)
+        for key_codes, key_uniques in factors:
+            combined = combined * (len(key_uniques) + 1) + key_codes + 1
+        codes, combos = pd.factorize(combined)
+        # Decode each distinct combination into its key values
+        arrays = []
+        missing = np.zeros(len(combos), dtype=bool)
+        for key_codes, key_uniques in reversed(factors):
+            n = len(key_uniques) + 1
+            level_codes = combos % n - 1
+            combos = combos // n
+            missing |= level_codes == -1
+            values = np.append(np.asarray(key_uniques, dtype=object), None)
+            arrays.append(values[level_codes])
+        uniques = pd.MultiIndex.from_arrays(arrays[::-1])
+        positions = index.get_indexer(uniques)
+        positions[missing] = -1
+    return codes, positions
+
+
+def _key_indexer(index: pd.Index, keys: List[pd.Series]) -> np.ndarray:
+    """Returns the positions in index (-1 if missing) of the key
+    column(s) keys of each row.
+    """
+    codes, positions = _key_positions(index, keys)
+    return np.where(codes == -1, -1, positions[codes])
+
+
+def _keys(data: pd.DataFrame, on: Union[str, List[str]]) -> List[pd.Series]:
+    """Returns the key column(s) on of data (columns or index levels).
+    """
+    on = [on] if isinstance(on, str) else list(on)
+    keys = []
+    for column in on:
+        if column in data.columns:
+            keys.append(data[column])
+        else:
+            keys.append(pd.Series(data.index.get_level_values(column)))
+    return keys
+
+
+def join(data: pd.DataFrame,
+         other: pd.DataFrame,
+         on: Union[str, List[str]],
+         how: str = 'left',
+         columns: List[str] = None) -> pd.DataFrame:
+    """Joins columns of other (a processed table indexed by its natural
+    key, e.g. SUB by adsh or TAG by tag and version) to the rows of
+    data (e.g. a processed NUM or TXT table) whose key column(s) on
+    match other's index.
+
+    Each distinct key of data is looked up once in other's index, whose
+    hash table is built once and reused by later joins to other.
+    Rows of data keep their order (and index).
+
+    Args:
+        data (pd.DataFrame): 
+            Table to join other to (e.g. NUM, TXT).
+
+        other (pd.DataFrame): 
+            Table indexed by the key (e.g. SUB, TAG).
+
+        on (Union[str, List[str]]): 
+            Column(s) (or index levels) of data matching the
+            level(s) of other's index, e.g. 'adsh' or ['tag', 'version'].
+
+        how (str): 
+            Optional; 'left' (default) keeps all rows of data (other's
+            columns are missing where no key matches), 'inner' keeps
+            only rows of data with a matching key.
+
+        columns (List[str]): 
+            Optional; columns of other to join (default all).
+
+    Returns:
+        Pandas DataFrame -- data with other's columns.
+
+    Raises:
+        ValueError: if how is not 'left' or 'inner', or if data and
+        the joined columns of other have columns in common.
+    """
+    if how not in ('left', 'inner'):
+        raise ValueError(f'Unsupported join: {how}')
+    columns = list(other.columns) if columns is None else list(columns)
+    overlap = data.columns.intersection(columns)
+    if len(overlap):
+        raise ValueError(f'Columns overlap: {list(overlap)}')
+
+    indexer = _key_indexer(other.index, _keys(data, on))
+    if how == 'inner':
+        matched = indexer != -1
+        data = data[matched]
+        indexer = indexer[matched]
+    joined = {c: pd.api.extensions.take(other[c].array, indexer,
+                                        allow_fill=True)
+              for c in columns}
+    joined = pd.DataFrame(joined, index=data.index)
+    return pd.concat([data, joined], axis=1)
+
+
+def semi_join(data: pd.DataFrame,
+              other: pd.DataFrame,
+              on: Union[str, List[str]]) -> pd.DataFrame:
+    """Returns rows of data whose key column(s) on match other's index,
+    e.g. NUM or TXT rows of submissions in a filtered SUB table.
+
+    Unlike an inner join, no columns of other are added.
+
+    Args:
+        data (pd.DataFrame): 
+            Table to filter (e.g. NUM, TXT).
+
+        other (pd.DataFrame): 
+            Table indexed by the key (e.g. a filtered SUB).
+
+        on (Union[str, List[str]]): 
+            Column(s) (or index levels) of data matching the
+            level(s) of other's index.
+
+    Returns:
+        Pandas DataFrame -- Rows of data with a matching key.
+    """
+    codes, positions = _key_positions(other.index, _keys(data, on))
+    found = np.append(positions != -1, False)  # code -1 is never found
+    return data[found[codes]]
 
 
 if __name__ == "__main__":
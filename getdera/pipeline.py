@@ -0,0 +1,284 @@
+"""The `pipeline` module contains a combined download-and-process
+entry point that overlaps downloading DERA dataset zipfiles with
+processing them.
+
+Zipfiles are downloaded in a background thread (see
+`getdera.scrapper.client`) and handed over through a bounded queue to
+the processing stage (see `getdera.dera`), which parses each period as
+soon as its zipfile is saved while later periods are still
+downloading. The end-to-end time approaches the longer of the two
+stages instead of their sum.
+
+Without a download directory, zipfiles are streamed into in-memory
+buffers and parsed from there (optionally spilling very large zipfiles
+to temporary files), so processing does not touch the disk.
+"""
+
+import os
+import queue
+import threading
+import warnings
+import pandas as pd
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Union
+
+from getdera.dera import _assemble
+from getdera.dera import _read_period
+from getdera.dera import _reader_options
+from getdera.scrapper.client import DERA_DATA_URL
+from getdera.scrapper.client import DOWNLOAD_CHUNK_SIZE
+from getdera.scrapper.client import SEC_MAX_REQUESTS_PER_SECOND
+from getdera.scrapper.client import _TokenBucket
+from getdera.scrapper.client import _dera_session
+from getdera.scrapper.client import _get
+from getdera.scrapper.client import _get_buffer
+from getdera.scrapper.client import _get_urls
+from getdera.scrapper.client import _mount_adapter
+from getdera.utils import make_path
+
+
+PIPELINE_QUEUE_SIZE = 2  # Zipfiles downloaded but not yet processed
+
+
+def get_and_process(
+        dataset: str,
+        dir: str,
+        table: Union[str, List[str]],
+        start_date: str,
+        end_date: str = None,
+        dtype: Dict[str, str] = None,
+        columns: Union[List[str], Dict[str, List[str]]] = None,
+        filters: Union[Dict[str, Any], Dict[str, Dict[str, Any]]] = None,
+        schema: bool = True,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+        workers: int = 1,
+        rate_limit: float = SEC_MAX_REQUESTS_PER_SECOND,
+        resume: bool = False,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        timeout: int = 120,
+        retry: int = 2,
+        delay: int = 1,
+        base_url: str = DERA_DATA_URL,
+        spill_size: int = None,
+        spill_dir: str = None,
+        engine: str = 'pandas',
+        return_failed: bool = False
+        ) -> Union[pd.DataFrame, Dict[str, pd.DataFrame],
+                   Tuple[Union[pd.DataFrame, Dict[str, pd.DataFrame]],
+                         Dict[str, str]]]:
+    """Downloads DERA dataset zipfiles for periods between start_date
+    and end_date into dir (or into memory) and processes each zipfile
+    as soon as it is downloaded.
+
+    Args:
+        dataset (str):
+            DERA dataset to download and process.
+            See `getdera.dera.process`.
+
+        dir (Union[None, str]):
+            Directory path to save downloaded files in. If None,
+            zipfiles are downloaded into memory and discarded once
+            processed.
+
+        table (Union[str, List[str]]):
+            Table (or tables) to process. See `getdera.dera.process`.
+
+        start_date (str):
+            Fetch all datasets after start_date.
+            See `getdera.dera.process`.
+
+        end_date (Union[None, str]):
+            Optional; fetch all datasets before end_date.
+            See `getdera.dera.process`.
+
+        dtype (Dict[str, str]):
+            Column name : dtype for data conversion
+
+        columns (Union[List[str], Dict[str, List[str]]]):
+            Optional; columns to parse. See `getdera.dera.process`.
+
+        filters (Union[Dict[str, Any], Dict[str, Dict[str, Any]]]):
+            Optional; column name : value (or list of values) that
+            rows must match. See `getdera.dera.process`.
+
+        schema (bool):
+            Optional; if True (default), columns are parsed with the
+            table's compact schema. See `getdera.dera.process`.
+
+        queue_size (int):
+            Optional; maximum number of downloaded zipfiles waiting to
+            be processed (held in memory if dir is None). Downloads
+            pause while the queue is full.
+
+        workers (int):
+            Optional; number of files downloaded concurrently.
+
+        rate_limit (float):
+            Optional; maximum number of requests per second shared by
+            all download workers.
+
+        resume (bool):
+            Optional; if True, resumes interrupted downloads and only
+            downloads files in dir again if they changed (ignored if
+            dir is None). See `getdera.scrapper.client.get_DERA`.
+
+        chunk_size (int):
+            Optional; chunk size for streaming files.
+
+        timeout (int):
+            Optional; timeout before closing connection.
+
+        retry (int):
+            Optional; number of times to retry a request.
+
+        delay (int):
+            Optional; backoff factor between failed requests.
+
+        base_url (str):
+            Optional; base URL of DERA datasets.
+
+        spill_size (int):
+            Optional; if dir is None, zipfiles larger than spill_size
+            bytes are kept in temporary files instead of memory.
+            Defaults to keeping every zipfile in memory.
+
+        spill_dir (str):
+            Optional; directory of spilled temporary files. Defaults to
+            the system's temporary directory.
+
+        engine (str):
+            Optional; table parser, 'pandas' (default) or 'pyarrow'.
+            See `getdera.dera.process`.
+
+        return_failed (bool):
+            Optional; if True, zipfiles that failed to download (e.g.
+            periods not yet published) are returned with the processed
+            tables. Otherwise (default), a warning names them.
+
+    Returns:
+        Pandas DataFrame -- Processed tables of the downloaded zipfiles
+        (as by `getdera.dera.process`). If table is a list,
+        Dict[str, DataFrame] -- table : processed table. If
+        return_failed, a tuple of the processed tables and
+        Dict[str, str] -- zipfile name : reason, of failed zipfiles.
+
+    Raises:
+        FileNotFoundError: if no zipfiles were downloaded.
+
+    Effects:
+        If processing a zipfile raises, downloads not yet started are
+        skipped and the function waits for the downloads in progress
+        before raising.
+    """
+    urls = _get_urls(dataset, start_date, end_date)
+    if dir is not None:
+        make_path(dir)
+    if isinstance(table, (list, tuple)):
+        options = {t: _reader_options(dataset, t, dtype, schema,
+                                      (columns or {}).get(t),
+                                      (filters or {}).get(t), engine)
+                   for t in table}
+    else:
+        options = {table: _reader_options(dataset, table, dtype, schema,
+                                          columns, filters, engine)}
+
+    downloaded = queue.Queue(maxsize=max(queue_size, 1))
+    done = object()  # Sentinel put once all downloads are finished
+    stopped = threading.Event()  # Set if processing raises
+    errors = []
+    failed = {}  # Zipfile name : reason of a failed download
+
+    session = _dera_session(dataset, base_url)
+    limiter = _TokenBucket(rate_limit)
+    _mount_adapter(session, timeout, retry, delay, workers, limiter)
+    adapter = session.get_adapter('https://')
+    # Also for http:// base URLs (e.g. a local mirror)
+    session.mount('http://', adapter)
+
+    def _get_to_dir(url):
+        if stopped.is_set():
+            return
+        result = _get([url], dir, session, chunk_size, limiter=limiter,
+                      resume=resume, adapter=adapter,
+                      callback=lambda p: downloaded.put((p, p)))
+        failed.update(result['failed'])
+
+    def _get_to_memory(url):
+        if stopped.is_set():
+            return
+        buffer, error = _get_buffer(url, session, chunk_size, limiter,
+                                    spill_size, spill_dir)
+        if buffer is not None:
+            downloaded.put((url, buffer))
+        else:
+            failed[url] = error
+
+    def _download():
+        try:
+            # Download url by url, so downloads stop if processing raises
+            get = _get_to_memory if dir is None else _get_to_dir
+            executor = ThreadPoolExecutor(max_workers=max(workers, 1))
+            with executor:
+                # Consume results to propagate unexpected exceptions
+                list(executor.map(get, urls))
+        except Exception as err:
+            errors.append(err)
+        finally:
+            downloaded.put(done)
+
+    downloader = threading.Thread(target=_download, daemon=True)
+    downloader.start()
+
+    def _close(zipfile):
+        # Discard in-memory (or spilled) zipfiles
+        if not isinstance(zipfile, str):
+            zipfile.close()
+
+    # Process zipfiles as they are downloaded
+    periods = {}
+    try:
+        while True:
+            item = downloaded.get()
+            if item is done:
+                break
+            name, zipfile = item
+            try:
+                periods[os.path.basename(name)] = \
+                    _read_period(zipfile, options)
+            finally:
+                _close(zipfile)
+    except BaseException:
+        # Skip pending downloads and unblock those in progress
+        stopped.set()
+        while True:
+            item = downloaded.get()
+            if item is done:
+                break
+            _close(item[1])
+        downloader.join()
+        raise
+    downloader.join()
+    if errors:
+        raise errors[0]
+
+    # Assemble periods in period order (downloads may finish out of order)
+    periods = [periods[url] for url in urls if url in periods]
+    failed = {url: failed[url] for url in urls if url in failed}
+    if not periods:
+        raise FileNotFoundError('No DERA datasets downloaded between '
+                                'start date and end date.')
+    if failed and not return_failed:
+        warnings.warn('DERA datasets not downloaded: ' + '; '.join(
+            f'{url} ({reason})' for url, reason in failed.items()))
+    data = {t: _assemble(t, [p[t] for p in periods]) for t in options}
+    data = data if isinstance(table, (list, tuple)) else data[table]
+    return (data, failed) if return_failed else data
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,235 @@
+"""The `schemas` module contains compact schemas of the tables in
+DERA datasets.
+
+Each schema maps a table's fields to compact pandas dtypes, based on
+the field types and sizes documented by DERA:\n
+- low-cardinality ALPHANUMERIC fields -- categoricals
+- BOOLEAN fields (1 or 0) -- nullable booleans
+- DATE (yyyymmdd) and DATETIME fields -- datetime64
+- NUMERIC fields -- the narrowest integer or float dtype that holds
+the documented number of digits
+
+NOT NULL integer fields use numpy integer dtypes, which pandas parses
+about twice as fast as nullable integer dtypes (Int8, Int16, ...).
+
+Fields not in a table's schema (e.g. adsh, free text) are parsed with
+pandas' default inference.
+
+References:
+https://www.sec.gov/dera/data/rr1.pdf
+https://www.sec.gov/files/aqfsn_1.pdf
+"""
+
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+
+# Field types that are not pandas dtypes
+DATE = 'date'  # yyyymmdd
+NOT_NULL_DATE = 'date!'  # yyyymmdd, NOT NULL
+DATETIME = 'datetime'  # yyyy-mm-dd hh:mm:ss.0
+
+DATE_FORMATS = {
+    DATE: '%Y%m%d',
+    NOT_NULL_DATE: '%Y%m%d',
+    DATETIME: '%Y-%m-%d %H:%M:%S.%f',
+}  # Strftime formats of DATE and DATETIME fields
+
+DATE_READ_DTYPES = {
+    DATE: 'Int32',
+    NOT_NULL_DATE: 'int32',
+    DATETIME: str,
+}  # Dtypes DATE and DATETIME fields are read as before conversion
+
+
+# Registrant fields (SUB table) shared by both datasets
+_REGISTRANT = {
+    'cik': 'Int64',  # NUMERIC(10)
+    'sic': 'Int16',  # NUMERIC(4)
+    'countryba': 'category',
+    'stprba': 'category',
+    'cityba': 'category',
+    'countryma': 'category',
+    'stprma': 'category',
+    'cityma': 'category',
+    'countryinc': 'category',
+    'stprinc': 'category',
+    'ein': 'Int64',  # NUMERIC(10)
+    'changed': DATE,
+    'fye': 'category',  # mmdd
+    'form': 'category',
+    'filed': DATE,
+    'accepted': DATETIME,
+    'prevrpt': 'boolean',
+    'nciks': 'Int16',  # NUMERIC(4)
+}
+
+# Fact fields (NUM and TXT tables) shared by both datasets
+_FACT = {
+    'tag': 'category',
+    'version': 'category',
+    'ddate': NOT_NULL_DATE,
+    'qtrs': 'int32',  # NUMERIC(8), NOT NULL
+    'iprx': 'Int16',  # NUMERIC(4)
+    'dcml': 'Int32',  # NUMERIC(6)
+    'durp': 'float32',  # NUMERIC(8,7)
+    'datp': 'float32',  # NUMERIC(8,7)
+    'dimh': 'category',
+    'dimn': 'Int8',  # NUMERIC(1)
+    'coreg': 'category',
+    'footlen': 'Int32',  # NUMERIC(8)
+}
+
+_TAG = {
+    'version': 'category',
+    'custom': 'boolean',
+    'abstract': 'boolean',
+    'datatype': 'category',
+    'iord': 'category',
+    'crdr': 'category',
+}
+
+_CAL = {
+    'grp': 'int16',  # NUMERIC(3), NOT NULL
+    'arc': 'int16',  # NUMERIC(3), NOT NULL
+    'negative': 'boolean',
+    'pversion': 'category',
+    'cversion': 'category',
+}
+
+DERA_SCHEMAS = {
+    'statements': {
+        'sub': {
+            **_REGISTRANT,
+            'afs': 'category',
+            'wksi': 'boolean',
+            'period': DATE,
+            'fy': 'Int16',  # YEAR(4)
+            'fp': 'category',
+            'detail': 'boolean',
+            'pubfloatusd': 'float64',
+            'floatdate': DATE,
+            'floataxis': 'category',
+            'floatmems': 'Int16',  # NUMERIC(4)
+        },
+        'tag': _TAG,
+        'num': {
+            'adsh': 'category',
+            **_FACT,
+            'uom': 'category',
+            'value': 'float64',  # NUMERIC(28,4)
+        },
+        'txt': {
+            **_FACT,
+            'lang': 'category',
+            'escaped': 'boolean',
+            'srclen': 'Int32',  # NUMERIC(8)
+            'txtlen': 'Int32',  # NUMERIC(8)
+            'context': 'category',
+        },
+        'pre': {
+            'report': 'int32',  # NUMERIC(6), NOT NULL
+            'line': 'int32',  # NUMERIC(6), NOT NULL
+            'stmt': 'category',
+            'inpth': 'boolean',
+            'rfile': 'category',
+            'tag': 'category',
+            'version': 'category',
+            'negating': 'boolean',
+        },
+        'cal': _CAL,
+        'dim': {
+            'segt': 'boolean',
+        },
+        'ren': {
+            'report': 'int32',  # NUMERIC(6), NOT NULL
+            'rfile': 'category',
+            'menucat': 'category',
+            'parentreport': 'Int32',  # NUMERIC(6)
+            'ultparentrpt': 'Int32',  # NUMERIC(6)
+        },
+    },
+    'risk': {
+        'sub': {
+            **_REGISTRANT,
+            'period': DATE,
+        },
+        'tag': _TAG,
+        'num': {
+            'adsh': 'category',
+            **_FACT,
+            'uom': 'category',
+            'series': 'category',
+            'class': 'category',
+            'measure': 'category',
+            'document': 'category',
+            'value': 'float64',  # NUMERIC(28,4)
+        },
+        'txt': {
+            **_FACT,
+            'lang': 'category',
+            'series': 'category',
+            'class': 'category',
+            'document': 'category',
+            'escaped': 'boolean',
+            'srclen': 'Int32',  # NUMERIC(8)
+            'txtlen': 'Int32',  # NUMERIC(8)
+            'context': 'category',
+        },
+        'cal': _CAL,
+        'lab': {
+            'version': 'category',
+            'lang': 'category',
+        },
+    },
+}  # Dataset : table : field : dtype
+
+
+def get_schema(dataset: str,
+               table: str,
+               exclude: List[str] = None) -> Dict[str, str]:
+    """Returns the schema (field : dtype) of a table in a DERA dataset.
+    Returns an empty dict if the table has no schema.
+
+    Args:
+        dataset (str):
+            DERA dataset (e.g. 'statements', 'risk').
+
+        table (str):
+            Table in the dataset (e.g. 'sub', 'txt').
+
+        exclude (List[str]):
+            Optional; fields to exclude from the schema
+            (e.g. index fields).
+
+    Returns:
+        schema (Dict[str, str])
+    """
+    schema = DERA_SCHEMAS.get(dataset, {}).get(table, {})
+    return {k: v for k, v in schema.items() if k not in (exclude or [])}
+
+
+def split_schema(
+        schema: Dict[str, str]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Splits a schema into dtypes for pd.read_csv and strftime formats
+    of DATE and DATETIME fields, which are converted after parsing.
+    DATE fields are read as yyyymmdd integers and DATETIME fields
+    as strings (see DATE_READ_DTYPES).
+
+    Returns:
+        dtype (Dict[str, str]), dates (Dict[str, str])
+    """
+    dtype = {}
+    dates = {}
+    for field, t in schema.items():
+        if t in DATE_FORMATS:
+            dtype[field] = DATE_READ_DTYPES[t]
+            dates[field] = DATE_FORMATS[t]
+        else:
+            dtype[field] = t
+    return dtype, dates
+
+
+if __name__ == "__main__":
+    pass
@@ -13,14 +13,34 @@ https://www.sec.gov/developer
 """
 
 import os
+import json
+import time
+import base64
+import binascii
+import hashlib
+import asyncio
+import functools
 import logging
 import requests
+import tempfile
+import threading
 
 from datetime import datetime
+from zipfile import BadZipFile
+from zipfile import ZipFile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import BinaryIO
+from typing import Callable
+from typing import Dict
+from typing import IO
 from typing import List
+from typing import Tuple
+from typing import Union
 
 from requests_toolbelt import sessions
 from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
 from urllib3.exceptions import MaxRetryError
 from getdera.utils import get_start_end_strftimes
 from getdera.utils import get_quarters
@@ -60,6 +80,28 @@ DERA_DATA_EXT = {
     'statements': '_notes.zip',
 }  # DERA dataset identifier and extension
 
+# SEC EDGAR Fair Access policy: max 10 requests per second per user
+SEC_MAX_REQUESTS_PER_SECOND = 10
+
+# Retry on common 5xx server errors and 429 rate exceeded client error
+RETRY_STATUSES = [429, 500, 502, 503, 504]
+
+# Extensions of in-progress downloads and sidecar metadata files
+PART_EXT = '.part'
+META_EXT = '.meta.json'
+
+# Size of reads when streaming downloads to files
+DOWNLOAD_CHUNK_SIZE = 1024 ** 2  # Default (1 MiB)
+DOWNLOAD_MAX_CHUNK_SIZE = 16 * 1024 ** 2  # Upper bound for large files
+DOWNLOAD_CHUNKS_PER_FILE = 64  # Target number of reads of large files
+
+DIGEST_ALGORITHMS = {
+    'md5': 'md5',
+    'sha': 'sha1',
+    'sha-256': 'sha256',
+    'sha-512': 'sha512',
+}  # Digest header (RFC 3230) algorithm : hashlib algorithm
+
 
 # CLIENT
 
@@ -81,16 +123,374 @@ class _TimeoutHTTPAdapter(HTTPAdapter):
         return super().send(request, **kwargs)
 
 
+class _TokenBucket:
+    """Thread-safe token bucket rate limiter.
+
+    Tokens are refilled continuously at `rate` tokens per second up to
+    `capacity`. Each call to `acquire` consumes one token, blocking until
+    a token is available. A single instance is shared by all download
+    workers so that the aggregate request rate never exceeds `rate`.
+    """
+
+    def __init__(self,
+                 rate: float = SEC_MAX_REQUESTS_PER_SECOND,
+                 capacity: float = None):
+        if rate <= 0:
+            raise ValueError('rate must be a positive number.')
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._last = now
+
+    def _reserve(self) -> float:
+        """Consumes a token if one is available and returns 0.
+        Otherwise returns the number of seconds to wait for a token.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Blocks until a token is available, then consumes it.
+        """
+        wait = self._reserve()
+        while wait:
+            time.sleep(wait)
+            wait = self._reserve()
+
+    async def acquire_async(self) -> None:
+        """Waits (without blocking the event loop) until a token is
+        available, then consumes it.
+        """
+        wait = self._reserve()
+        while wait:
+            await asyncio.sleep(wait)
+            wait = self._reserve()
+
+
+def _read_meta(path: str) -> Dict[str, str]:
+    """Returns the sidecar metadata (ETag and Last-Modified response
+    headers) saved for the file at path. Returns an empty dict if no
+    metadata is found.
+    """
+    try:
+        with open(f'{path}{META_EXT}', 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_meta(path: str, meta: Dict[str, str]) -> None:
+    """Atomically saves the sidecar metadata for the file at path.
+    """
+    meta_path = f'{path}{META_EXT}'
+    with open(f'{meta_path}.tmp', 'w') as f:
+        json.dump(meta, f)
+    os.replace(f'{meta_path}.tmp', meta_path)
+
+
+def _conditional_headers(path: str) -> Dict[str, str]:
+    """Returns request headers to resume or revalidate the download
+    saved at path.
+
+    If a partial download exists, requests the remaining bytes
+    (Range) provided the remote file is unchanged (If-Range). If the
+    partial download is already complete, the server answers 416.
+    Else, if the file exists, requests it only if it has changed
+    (If-None-Match / If-Modified-Since).
+    """
+    part = f'{path}{PART_EXT}'
+    headers = {}
+    if os.path.isfile(part):
+        meta = _read_meta(part)
+        validator = meta.get('etag') or meta.get('last_modified')
+        # Without a validator, a resumed download could mix two versions
+        if validator:
+            headers['Range'] = f'bytes={os.path.getsize(part)}-'
+            headers['If-Range'] = validator
+    elif os.path.isfile(path):
+        meta = _read_meta(path)
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+    return headers
+
+
+class _LimitedRetry(Retry):
+    """Retry strategy that consumes a token of a rate limiter before
+    each retry, so retried requests count against the rate limit.
+    """
+
+    def __init__(self, *args, limiter: _TokenBucket = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.limiter = limiter
+
+    def new(self, **kwargs):
+        retry = super().new(**kwargs)
+        retry.limiter = self.limiter
+        return retry
+
+    def sleep(self, response=None):
+        super().sleep(response)
+        if self.limiter is not None:
+            self.limiter.acquire()
+
+
+def _retry_strategy(retry: int,
+                    delay: int,
+                    limiter: _TokenBucket = None) -> Retry:
+    """Returns the retry strategy of GET requests. If limiter is
+    given, each retry consumes one of its tokens.
+    """
+    return _LimitedRetry(
+        limiter=limiter,
+        total=retry,
+        backoff_factor=delay,
+        # requests should incrementally backoff on common 5xx server errors
+        # and 429 rate exceeded client error
+        status_forcelist=RETRY_STATUSES,
+        # Only have GET requests in getdera
+        allowed_methods=['GET']
+    )
+
+
+def _content_length(r: requests.Response) -> Union[int, None]:
+    """Returns the number of bytes of the response's body, or None if
+    unknown (or if the body is decoded, e.g. gzip Content-Encoding).
+    """
+    if r.headers.get('Content-Encoding', 'identity') != 'identity':
+        return None
+    try:
+        return int(r.headers['Content-Length'])
+    except (KeyError, ValueError):
+        return None
+
+
+def _adaptive_chunk_size(chunk_size: int, length: int = None) -> int:
+    """Returns the size of reads of a body of length bytes: at least
+    chunk_size, and large enough for about DOWNLOAD_CHUNKS_PER_FILE
+    reads of large files (up to DOWNLOAD_MAX_CHUNK_SIZE).
+    """
+    if not length:
+        return chunk_size
+    return max(chunk_size,
+               min(length // DOWNLOAD_CHUNKS_PER_FILE,
+                   DOWNLOAD_MAX_CHUNK_SIZE))
+
+
+def _preallocate(fd: BinaryIO, length: int) -> None:
+    """Reserves length bytes of disk space from the current position of
+    fd (where supported), so large files are written contiguously.
+    """
+    if not hasattr(os, 'posix_fallocate') or length <= 0:
+        return
+    fd.flush()
+    try:
+        os.posix_fallocate(fd.fileno(), fd.tell(), length)
+    except OSError:
+        pass  # e.g. not supported by the file system
+
+
+def _new_hasher(checksum: str = None, path: str = None):
+    """Returns a hashlib hash object of algorithm checksum (e.g.
+    'sha256') updated with the contents of the file at path, if any.
+    Returns None if checksum is None.
+    """
+    if checksum is None:
+        return None
+    hasher = hashlib.new(checksum)
+    if path is not None:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+                hasher.update(block)
+    return hasher
+
+
+def _write_stream(r: requests.Response,
+                  fd: BinaryIO,
+                  chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+                  hashers: List[Any] = (),
+                  preallocate: bool = True) -> int:
+    """Streams the response's body to fd (from its current position)
+    and returns the number of bytes written.
+
+    Reads are sized with `_adaptive_chunk_size`. If preallocate and the
+    body's length is known, the file is preallocated; if the stream ends
+    early (or is interrupted) the file is truncated to the bytes
+    written. Files opened in append mode are never preallocated, since
+    appends would land after the reserved space. Hashers (see
+    `_new_hasher`) are updated with the body.
+    """
+    length = _content_length(r)
+    start = fd.tell()
+    preallocate = preallocate and bool(length) and \
+        'a' not in getattr(fd, 'mode', '')
+    if preallocate:
+        _preallocate(fd, length)
+    written = 0
+    try:
+        for chunk in r.iter_content(
+                chunk_size=_adaptive_chunk_size(chunk_size, length)):
+            fd.write(chunk)
+            for hasher in hashers:
+                hasher.update(chunk)
+            written += len(chunk)
+    finally:
+        # Remove preallocated space beyond the bytes written
+        if preallocate:
+            fd.truncate(start + written)
+    return written
+
+
+def _expected_digests(r: requests.Response) -> Dict[str, str]:
+    """Returns hashlib algorithm : hex digest of the response's body
+    given by its Content-MD5 and Digest (RFC 3230) headers, if any.
+    """
+    digests = {}
+    values = [('md5', r.headers.get('Content-MD5', ''))]
+    for item in r.headers.get('Digest', '').split(','):
+        algorithm, _, value = item.strip().partition('=')
+        if algorithm.lower() in DIGEST_ALGORITHMS:
+            values.append((DIGEST_ALGORITHMS[algorithm.lower()], value))
+    for algorithm, value in values:
+        try:
+            digest = base64.b64decode(value, validate=True).hex()
+        except (ValueError, binascii.Error):
+            continue
+        if digest:
+            digests[algorithm] = digest
+    return digests
+
+
+def _content_range_total(r: requests.Response) -> Union[int, None]:
+    """Returns the full size of a partial (206) response's file given
+    by its Content-Range header, or None if unknown.
+    """
+    total = r.headers.get('Content-Range', '').rpartition('/')[2]
+    return int(total) if total.isdigit() else None
+
+
+def _verify_zip(path: Union[str, IO]) -> Union[str, None]:
+    """Reads the central directory of the zipfile at path (or in a file
+    object) without decompressing its members. Returns why it is
+    invalid, or None if it is valid.
+    """
+    try:
+        with ZipFile(path, 'r') as zipObj:
+            if not zipObj.infolist():
+                return 'empty zipfile'
+    except (BadZipFile, OSError) as err:
+        return f'invalid zipfile: {err}'
+    return None
+
+
+def _verify_download(path: Union[str, IO],
+                     r: requests.Response,
+                     written: int,
+                     hashers: Dict[str, Any],
+                     zipfile: bool = True) -> Union[str, None]:
+    """Verifies a file downloaded (to path, or to a file object) from
+    response r: the number of bytes written against Content-Length (and
+    the file's size against Content-Range), digests of the body against
+    Content-MD5 and Digest headers, and, if zipfile, its zip central
+    directory.
+
+    Returns:
+        str -- Why the file is invalid, or None if it is valid.
+    """
+    length = _content_length(r)
+    if length is not None and written != length:
+        return f'incomplete: {written} of {length} bytes'
+    total = _content_range_total(r)
+    if total is not None:
+        if isinstance(path, str):
+            size = os.path.getsize(path)
+        else:
+            path.seek(0, os.SEEK_END)
+            size = path.tell()
+        if size != total:
+            return f'incomplete: {size} of {total} bytes'
+    for algorithm, digest in _expected_digests(r).items():
+        # Digests of a partial response are not of the full file
+        if r.status_code == 200 and \
+                hashers[algorithm].hexdigest() != digest:
+            return f'{algorithm} checksum mismatch'
+    if zipfile:
+        return _verify_zip(path)
+    return None
+
+
+def _remove_part(part: str) -> None:
+    """Removes the partial download at part and its sidecar file, if
+    any.
+    """
+    for invalid in [part, f'{part}{META_EXT}']:
+        if os.path.exists(invalid):
+            os.remove(invalid)
+
+
+def _publish_part(part: str,
+                  path: str,
+                  meta: Dict[str, str] = None) -> None:
+    """Atomically renames the verified download at part to path, and
+    saves meta (if given) as the sidecar metadata of path.
+    """
+    if meta is not None:
+        _write_meta(part, meta)
+        os.replace(f'{part}{META_EXT}', f'{path}{META_EXT}')
+    os.replace(part, path)
+
+
+def _mount_adapter(session: sessions.BaseUrlSession,
+                   timeout: int = 5,
+                   retry: int = 2,
+                   delay: int = 5,
+                   workers: int = 1,
+                   limiter: _TokenBucket = None) -> None:
+    """Mounts a new adapter with the retry strategy and timeout on the
+    session's HTTPS requests. Retries consume tokens of limiter.
+    """
+    # Connection pool large enough for every worker to hold a connection
+    session.mount('https://', _TimeoutHTTPAdapter(
+        max_retries=_retry_strategy(retry, delay, limiter),
+        timeout=timeout,
+        pool_connections=max(workers, 1),
+        pool_maxsize=max(workers, 1)))
+    session.verify = True  # Verify session
+
+
 def _get(urls: List[str],
          dir: str,
          session: sessions.BaseUrlSession,
-         chunk_size: int = 128,
+         chunk_size: int = DOWNLOAD_CHUNK_SIZE,
          timeout: int = 5,
          retry: int = 2,
          delay: int = 5,
-         path_to_cert=PATH_TO_CERT) -> None:
+         path_to_cert=PATH_TO_CERT,
+         workers: int = 1,
+         limiter: _TokenBucket = None,
+         resume: bool = False,
+         callback: Callable[[str], None] = None,
+         adapter: HTTPAdapter = None,
+         checksum: str = None,
+         verify: bool = True) -> Dict[str, Any]:
     """Downloads the given URLs and saves the contents to dir.
 
+    Files are written to a `.part` file, verified (see
+    `_verify_download`) and only then atomically renamed into place,
+    so dir never holds a truncated or invalid file under its final name.
+
     Args:
         urls (list): 
             List of URLs with files at their endpoints to download.
@@ -102,7 +502,8 @@ def _get(urls: List[str],
             BaseUrlSession instance to use.
 
         chunk_size (int): 
-            Optional; chunk size for streaming files.
+            Optional; chunk size for streaming files. Large files are
+            read in larger chunks (see `_adaptive_chunk_size`).
 
         timeout (int): 
             Optional; timeout before closing connection.
@@ -119,64 +520,324 @@ def _get(urls: List[str],
         path_to_cert (str): 
             Optional; path to server SSL certificate.
 
+        workers (int): 
+            Optional; number of threads downloading files concurrently.
+            Defaults to 1 (sequential downloads).
+
+        limiter (_TokenBucket): 
+            Optional; rate limiter shared by all workers. Defaults to
+            a limiter capped at SEC_MAX_REQUESTS_PER_SECOND. Retries
+            consume tokens too, unless adapter is given.
+
+        resume (bool): 
+            Optional; if True, files are downloaded to a `.part` file
+            and renamed once complete. Interrupted downloads are resumed
+            with HTTP Range requests, and files already in dir are only
+            downloaded again if they changed (conditional GET using the
+            ETag and Last-Modified headers saved in a `.meta.json`
+            sidecar file).
+
+        callback (Callable[[str], None]): 
+            Optional; called (from the downloading thread) with the
+            path of each file once it is saved in dir (or not modified
+            since it was saved), e.g. to start processing it.
+
+        adapter (HTTPAdapter): 
+            Optional; adapter already mounted on session, whose
+            connection pools are kept across calls (see `DERAClient`).
+            If given, timeout, retry, delay and path_to_cert are those
+            of the adapter. Defaults to mounting a new adapter.
+
+        checksum (str): 
+            Optional; hashlib algorithm (e.g. 'sha256') to hash files
+            with while they are written. The hex digest is saved in the
+            file's `.meta.json` sidecar file under the algorithm's name.
+
+        verify (bool): 
+            Optional; if True (default), files ending in `.zip` must
+            have a valid zip central directory. Sizes and digests given
+            by response headers are always verified.
+
     Effects: 
         Downloaded files are saved in dir. Exceptions raised by requests
-        module are logged and saved.
+        module (HTTP errors, exhausted retries, refused connections and
+        timeouts) are logged and the url is reported as failed.
 
     Returns: 
-        None
+        Dict[str, Any] -- Result of the downloads (in the order of
+        urls): 'downloaded' -- urls saved and verified, 'not_modified'
+        -- urls already saved and unchanged (if resume), and 'failed'
+        -- url : reason, for urls not saved.
     """
 
-    def _save_content(path, r, chunk_size):
-        with open(path, 'wb') as fd:
-            for chunk in r.iter_content(chunk_size=chunk_size):
-                fd.write(chunk)
-        # Check if downloaded
-        if os.path.isfile(path):
-            logger.info(f'Downloaded {url}')
+    def _save(path, r, chunk_size, url):
+        """Writes the response to a `.part` file, verifies it and
+        renames it to path. Returns the reason of a failure, or None.
+        """
+        part = f'{path}{PART_EXT}'
+        # Write after the partial download if the server honoured Range
+        # (not in append mode, so the remainder can be preallocated)
+        mode = 'r+b' if resume and r.status_code == 206 \
+            and os.path.isfile(part) else 'wb'
+        meta = {'etag': r.headers.get('ETag'),
+                'last_modified': r.headers.get('Last-Modified')}
+        if resume:
+            _write_meta(part, meta)
+        algorithms = set(_expected_digests(r))
+        if checksum is not None:
+            algorithms.add(checksum)
+        hashers = {a: _new_hasher(a, part if mode == 'r+b' else None)
+                   for a in algorithms}
+        try:
+            with open(part, mode) as fd:
+                fd.seek(0, os.SEEK_END)
+                written = _write_stream(r, fd, chunk_size,
+                                        list(hashers.values()))
+        except requests.exceptions.RequestException as err:
+            if resume:
+                logger.warning(f'{url} interrupted, partial download '
+                               f'kept in {part}: {err}')
+            else:
+                os.remove(part)
+                logger.warning(f'{url} interrupted: {err}')
+            return f'interrupted: {err}'
+        error = _verify_download(part, r, written, hashers,
+                                 zipfile=verify and url.endswith('.zip'))
+        if error is not None:
+            # A complete but invalid file cannot be resumed
+            _remove_part(part)
+            logger.warning(f'{url} failed verification: {error}')
+            return error
+        if checksum is not None:
+            meta[checksum] = hashers[checksum].hexdigest()
+        _publish_part(part, path,
+                      meta if resume or checksum is not None else None)
+        logger.info(f'Downloaded {url}')
+        return None
+
+    def _save_complete(path, r, url):
+        """Verifies the `.part` file of a resumed download that the
+        server rejected (416) because the Range starts at its end, and
+        renames it to path. Returns the reason of a failure, or None.
+        """
+        part = f'{path}{PART_EXT}'
+        size = os.path.getsize(part)
+        total = _content_range_total(r)
+        if total is not None and size != total:
+            error = f'incomplete: {size} of {total} bytes'
+        elif verify and url.endswith('.zip'):
+            error = _verify_zip(part)
         else:
-            logger.warning(f'{url} not found!')
+            error = None
+        if error is not None:
+            _remove_part(part)
+            logger.warning(f'{url} partial download discarded: {error}')
+            return error
+        meta = _read_meta(part)
+        if checksum is not None:
+            meta[checksum] = _new_hasher(checksum, part).hexdigest()
+        _publish_part(part, path, meta)
+        logger.info(f'Downloaded {url} (already complete)')
+        return None
 
-    retry_strategy = Retry(
-        total=retry,
-        backoff_factor=delay,
-        # requests should incrementally backoff on common 5xx server errors
-        # and 429 rate exceeded client error
-        status_forcelist=[429, 500, 502, 503, 504],
-        # Only have GET requests in getdera
-        allowed_methods=['GET']
-    )
-    session.mount('https://', _TimeoutHTTPAdapter(max_retries=retry_strategy,
-                  timeout=timeout))
-    session.verify = True  # Verify session
-    for url in urls:
+    def _download(url):
+        """Downloads url and returns (status, reason of a failure).
+        """
+        path = f'{dir}/{url}'
+        headers = _conditional_headers(path) if resume else {}
+        limiter.acquire()
         try:
-            r = session.get(url, stream=True)
-        except MaxRetryError as err:
-            logger.warning(err)
-            continue
+            r = session.get(url, stream=True, headers=headers)
         except requests.exceptions.HTTPError as err:
+            # Release the connection to the pool
+            err.response.close()
+            if err.response.status_code != 416 or 'Range' not in headers:
+                logger.warning(err)
+                return 'failed', str(err)
+            # The Range starts at the end of the partial download, which
+            # is complete (but was not renamed) or invalid
+            status = 'downloaded'
+            if _save_complete(path, err.response, url) is not None:
+                # Download again without Range
+                return _download(url)
+            error = None
+        except (MaxRetryError, requests.exceptions.RequestException) as err:
+            # e.g. retries exhausted, connection refused or timed out
             logger.warning(err)
-            continue
-        except requests.exceptions.SSLError as err:
-            logger.warning(err)
-            continue
+            return 'failed', str(err)
         else:
             base_url = session.base_url
             full_url = '{}/{}'.format(base_url[:base_url.rfind('/')], url)
             logger.info(f'Successful access to url: {full_url}')
-            path = f'{dir}/{url}'
-            _save_content(path, r, chunk_size)
+            with r:
+                if r.status_code == 304:
+                    logger.info(f'Not modified {url}')
+                    status = 'not_modified'
+                    error = None if os.path.isfile(path) else 'not found'
+                else:
+                    status = 'downloaded'
+                    error = _save(path, r, chunk_size, url)
+        if error is not None:
+            return 'failed', error
+        if callback is not None:
+            callback(path)
+        return status, None
+
+    if limiter is None:
+        limiter = _TokenBucket(SEC_MAX_REQUESTS_PER_SECOND)
+
+    if adapter is None:
+        _mount_adapter(session, timeout, retry, delay, workers, limiter)
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Consume results to propagate unexpected exceptions
+            outcomes = list(executor.map(_download, urls))
+    else:
+        outcomes = [_download(url) for url in urls]
+
+    result = {'downloaded': [], 'not_modified': [], 'failed': {}}
+    for url, (status, error) in zip(urls, outcomes):
+        if status == 'failed':
+            result['failed'][url] = error
+        else:
+            result[status].append(url)
+    return result
+
+
+def _get_buffer(url: str,
+                session: sessions.BaseUrlSession,
+                chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+                limiter: _TokenBucket = None,
+                spill_size: int = None,
+                spill_dir: str = None,
+                verify: bool = True) -> Tuple[Union[IO, None],
+                                              Union[str, None]]:
+    """Downloads url into a buffer in memory (instead of a file in a
+    directory, see `_get`) and verifies it.
+
+    Args:
+        url (str): 
+            URL (relative to the session's base URL) to download.
+
+        session (BaseUrlSession): 
+            BaseUrlSession instance to use, with an adapter mounted
+            (see `_mount_adapter`).
+
+        chunk_size (int): 
+            Optional; chunk size for streaming files.
+
+        limiter (_TokenBucket): 
+            Optional; rate limiter shared by all downloads.
+
+        spill_size (int): 
+            Optional; if given, a buffer larger than spill_size bytes
+            is moved to a temporary file (deleted once the buffer is
+            closed). Defaults to keeping every buffer in memory.
+
+        spill_dir (str): 
+            Optional; directory of spilled temporary files. Defaults to
+            the system's temporary directory.
+
+        verify (bool): 
+            Optional; if True (default), zipfiles must have a valid zip
+            central directory. See `_get`.
+
+    Returns: 
+        Tuple[IO, None] -- Buffer (positioned at its start), or
+        Tuple[None, str] -- reason of a failure.
+    """
+    if limiter is None:
+        limiter = _TokenBucket(SEC_MAX_REQUESTS_PER_SECOND)
+    limiter.acquire()
+    try:
+        r = session.get(url, stream=True)
+    except requests.exceptions.HTTPError as err:
+        logger.warning(err)
+        # Release the connection to the pool
+        err.response.close()
+        return None, str(err)
+    except (MaxRetryError, requests.exceptions.RequestException) as err:
+        logger.warning(err)
+        return None, str(err)
+
+    buffer = tempfile.SpooledTemporaryFile(max_size=spill_size or 0,
+                                           dir=spill_dir)
+    with r:
+        length = _content_length(r)
+        if spill_size and length and length > spill_size:
+            buffer.rollover()
+        hashers = {a: _new_hasher(a) for a in _expected_digests(r)}
+        try:
+            written = _write_stream(r, buffer, chunk_size,
+                                    list(hashers.values()),
+                                    preallocate=False)
+        except requests.exceptions.RequestException as err:
+            buffer.close()
+            logger.warning(f'{url} interrupted: {err}')
+            return None, f'interrupted: {err}'
+    error = _verify_download(buffer, r, written, hashers,
+                             zipfile=verify and url.endswith('.zip'))
+    if error is not None:
+        buffer.close()
+        logger.warning(f'{url} failed verification: {error}')
+        return None, error
+    logger.info(f'Downloaded {url} to memory')
+    buffer.seek(0)
+    return buffer, None
+
+
+def _get_urls(dataset: str, start_date: str, end_date: str) -> List[str]:
+    """Returns the DERA dataset zipfile names (relative URLs) for
+    periods between start_date and end_date.
+    """
+    # Dataset identifier and extension
+    ext = DERA_DATA_EXT[dataset]
+
+    # Start date and end date strftimes
+    start_date, end_date = get_start_end_strftimes(start_date, end_date)
+
+    # If statements dataset and end_date on or after 2020-10-01
+    if dataset == 'statements' and\
+            datetime.strptime(end_date, '%Y-%m-%d') >= datetime(2020, 10, 1):
+        quarters_range = get_quarters(start_date, '2020-09-01')
+        months_range = get_year_months('2020-10-01', end_date)
+        date_range = quarters_range + months_range
+    else:
+        # Get list of quarters between start_date and end_date
+        date_range = get_quarters(start_date, end_date)
+
+    # If no date range
+    if not(date_range):
+        raise ValueError('Improperly specified start and end dates.')
+
+    return [f'{date}{ext}' for date in date_range]
+
+
+def _dera_session(dataset: str,
+                  base_url: str = DERA_DATA_URL) -> sessions.BaseUrlSession:
+    """Returns a session for the dataset's endpoint that raises on
+    HTTP error statuses.
+    """
+    endpoint = DERA_DATA_PATHS[dataset]
+    dera_http = sessions.BaseUrlSession(base_url=f'{base_url}/{endpoint}')
+    assert_status_hook = _response_raise_status
+    dera_http.hooks["response"] = [assert_status_hook]
+    return dera_http
 
 
 def get_DERA(dataset: str,
              dir: str,
              start_date: str,
              end_date: str,
-             chunk_size: int = 128,
+             chunk_size: int = DOWNLOAD_CHUNK_SIZE,
              timeout: int = 120,
              retry: int = 2,
-             delay: int = 1) -> None:
+             delay: int = 1,
+             workers: int = 1,
+             rate_limit: float = SEC_MAX_REQUESTS_PER_SECOND,
+             resume: bool = False,
+             checksum: str = None,
+             verify: bool = True) -> Dict[str, Any]:
     """Downloads and saves DERA dataset zipfiles for quarters between
     start_date and end_date.
 
@@ -222,44 +883,535 @@ def get_DERA(dataset: str,
             processes will sleep between failed requests, where
             sleep seconds = delay * (2 ** ({number of total retries} - 1)).
 
+        workers (int): 
+            Optional; number of files downloaded concurrently.
+
+        rate_limit (float): 
+            Optional; maximum number of requests per second shared by
+            all workers. Defaults to the SEC's Fair Access limit.
+
+        resume (bool): 
+            Optional; if True, resumes interrupted downloads and only
+            downloads files in dir again if they changed. See `_get`.
+
+        checksum (str): 
+            Optional; hashlib algorithm (e.g. 'sha256') to hash files
+            with while they are written. See `_get`.
+
+        verify (bool): 
+            Optional; if True (default), downloaded zipfiles must have
+            a valid zip central directory. See `_get`.
+
     Effects:
-        Downloaded files are saved in dir.
+        Downloaded files are saved in dir. Files that fail verification
+        (truncated, checksum mismatch or invalid zipfile) are not saved.
 
     Returns:
-        None
+        Dict[str, Any] -- Result of the downloads with keys
+        'downloaded' and 'not_modified' (lists of zipfile names) and
+        'failed' (zipfile name : reason). See `_get`. Calling get_DERA
+        again with resume=True only downloads the failed (and changed)
+        zipfiles again.
     """
 
     # SET-UP
-    endpoint = DERA_DATA_PATHS[dataset]
-    dera_http = sessions.BaseUrlSession(base_url=f'{DERA_DATA_URL}/{endpoint}')
-    assert_status_hook = _response_raise_status
-    dera_http.hooks["response"] = [assert_status_hook]
-    # Dataset identifier and extension
-    ext = DERA_DATA_EXT[dataset]
+    dera_http = _dera_session(dataset)
 
-    # Start date and end date strftimes
-    start_date, end_date = get_start_end_strftimes(start_date, end_date)
+    # Create list of urls
+    urls = _get_urls(dataset, start_date, end_date)
+    # GET and save datasets in dir
+    limiter = _TokenBucket(rate_limit)
+    return _get(urls, dir, dera_http, chunk_size, timeout, retry, delay,
+                workers=workers, limiter=limiter, resume=resume,
+                checksum=checksum, verify=verify)
 
-    # If statements dataset and end_date on or after 2020-10-01
-    if dataset == 'statements' and\
-            datetime.strptime(end_date, '%Y-%m-%d') >= datetime(2020, 10, 1):
-        quarters_range = get_quarters(start_date, '2020-09-01')
-        months_range = get_year_months('2020-10-01', end_date)
-        date_range = quarters_range + months_range
-    else:
-        # Get list of quarters between start_date and end_date
-        date_range = get_quarters(start_date, end_date)
 
-    # If no date range
-    if not(date_range):
-        raise ValueError('Improperly specified start and end dates.')
+class DERAClient:
+    """Long-lived client that downloads DERA datasets through connection
+    pools kept across datasets and calls.
 
-    # Create list of urls
-    urls = [f'{date}{ext}' for date in date_range]
-    # GET and save datasets in dir
-    _get(urls, dir, dera_http, chunk_size, timeout, retry, delay)
+    The client's sessions (one per dataset endpoint) share one adapter,
+    whose connection pools (one per host) keep connections alive between
+    requests, so consecutive downloads reuse connections (and their TLS
+    handshakes) instead of opening cold pools. Downloads of every
+    dataset run in one pool of worker threads and share one rate
+    limiter.
 
-    return None
+    Args:
+        workers (int): 
+            Optional; number of files downloaded concurrently.
+
+        rate_limit (float): 
+            Optional; maximum number of requests per second shared by
+            all downloads. Defaults to the SEC's Fair Access limit.
+
+        pool_maxsize (int): 
+            Optional; maximum number of connections kept alive per host.
+            Defaults to workers.
+
+        chunk_size (int): 
+            Optional; chunk size for streaming files.
+
+        timeout (int): 
+            Optional; timeout before closing connection.
+
+        retry (int): 
+            Optional; number of times to retry a request.
+
+        delay (int): 
+            Optional; backoff factor between failed requests.
+            See `get_DERA`.
+
+        base_url (str): 
+            Optional; base URL of DERA datasets.
+
+    Use as a context manager (or call `close`) to release connections.
+    """
+
+    def __init__(self,
+                 workers: int = 4,
+                 rate_limit: float = SEC_MAX_REQUESTS_PER_SECOND,
+                 pool_maxsize: int = None,
+                 chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+                 timeout: int = 120,
+                 retry: int = 2,
+                 delay: int = 1,
+                 base_url: str = DERA_DATA_URL):
+        self.workers = max(workers, 1)
+        self.limiter = _TokenBucket(rate_limit)
+        self.chunk_size = chunk_size
+        self.base_url = base_url
+        # Block instead of opening connections beyond pool_maxsize
+        self.adapter = _TimeoutHTTPAdapter(
+            max_retries=_retry_strategy(retry, delay, self.limiter),
+            timeout=timeout,
+            pool_maxsize=pool_maxsize or self.workers,
+            pool_block=True)
+        self._sessions = {}  # Dataset : session
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers)
+
+    def _session(self, dataset: str) -> sessions.BaseUrlSession:
+        """Returns the dataset's session, with the shared adapter
+        mounted.
+        """
+        with self._lock:
+            if dataset not in self._sessions:
+                session = _dera_session(dataset, self.base_url)
+                session.mount('https://', self.adapter)
+                session.mount('http://', self.adapter)
+                session.verify = True  # Verify session
+                self._sessions[dataset] = session
+            return self._sessions[dataset]
+
+    def get(self,
+            dataset: Union[str, List[str]],
+            dir: str,
+            start_date: str,
+            end_date: str = None,
+            resume: bool = False,
+            callback: Callable[[str], None] = None,
+            checksum: str = None,
+            verify: bool = True) -> Dict[str, Any]:
+        """Downloads and saves DERA dataset zipfiles for periods between
+        start_date and end_date. Zipfiles of several datasets are
+        downloaded concurrently.
+
+        Args:
+            dataset (Union[str, List[str]]): 
+                DERA dataset (or datasets) to download.
+                See `get_DERA`.
+
+            dir (str): 
+                Directory path to save downloaded files in.
+
+            start_date (str): 
+                Fetch all datasets after start_date. See `get_DERA`.
+
+            end_date (Union[None, str]): 
+                Optional; fetch all datasets before end_date.
+                See `get_DERA`.
+
+            resume (bool): 
+                Optional; if True, resumes interrupted downloads and
+                only downloads files in dir again if they changed.
+                See `_get`.
+
+            callback (Callable[[str], None]): 
+                Optional; called with the path of each saved file.
+                See `_get`.
+
+            checksum (str): 
+                Optional; hashlib algorithm (e.g. 'sha256') to hash
+                files with while they are written. See `_get`.
+
+            verify (bool): 
+                Optional; if True (default), downloaded zipfiles must
+                have a valid zip central directory. See `_get`.
+
+        Effects:
+            Downloaded files are saved in dir.
+
+        Returns:
+            Dict[str, Any] -- Result of the downloads of all datasets.
+            See `get_DERA`.
+        """
+        datasets = [dataset] if isinstance(dataset, str) else dataset
+        downloads = [(d, url) for d in datasets
+                     for url in _get_urls(d, start_date, end_date)]
+        futures = [self._executor.submit(
+                       _get, [url], dir, self._session(d), self.chunk_size,
+                       limiter=self.limiter, resume=resume,
+                       callback=callback, adapter=self.adapter,
+                       checksum=checksum, verify=verify)
+                   for d, url in downloads]
+        result = {'downloaded': [], 'not_modified': [], 'failed': {}}
+        # Propagate unexpected exceptions
+        for future in futures:
+            outcome = future.result()
+            for status in ['downloaded', 'not_modified']:
+                result[status].extend(outcome[status])
+            result['failed'].update(outcome['failed'])
+        return result
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Returns connection reuse statistics of each host's pool:
+        requests sent (including retries), connections opened, and
+        requests sent on a reused connection.
+        """
+        pools = self.adapter.poolmanager.pools
+        stats = {}
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f'{pool.scheme}://{pool.host}:{pool.port}'
+            stats[host] = {
+                'requests': pool.num_requests,
+                'connections': pool.num_connections,
+                'reused': max(pool.num_requests - pool.num_connections, 0),
+            }
+        return stats
+
+    def close(self) -> None:
+        """Waits for running downloads and closes all connections.
+        """
+        self._executor.shutdown()
+        self.adapter.close()
+        for session in self._sessions.values():
+            session.close()
+
+    def __enter__(self) -> 'DERAClient':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+# ASYNC CLIENT
+
+def _import_aiohttp():
+    """Imports the optional aiohttp dependency used by the async client.
+    """
+    try:
+        import aiohttp
+    except ImportError as err:
+        raise ImportError('aiohttp is required for the async client. '
+                          'Install it with `pip install aiohttp`.') from err
+    return aiohttp
+
+
+def _backoff_time(delay: int, retries: int, retry_after: str = None) -> float:
+    """Returns number of seconds to sleep before the next retry.
+    Mirrors urllib3's Retry: honours a Retry-After header (in seconds)
+    if given, else retries immediately the first time and then sleeps
+    {delay} * (2 ** ({number of total retries} - 1)), up to
+    Retry.DEFAULT_BACKOFF_MAX.
+    """
+    if retry_after is not None:
+        try:
+            return max(float(retry_after), 0)
+        except ValueError:
+            pass
+    if retries <= 1:
+        return 0
+    return min(delay * (2 ** (retries - 1)), Retry.DEFAULT_BACKOFF_MAX)
+
+
+def _as_response(r) -> requests.Response:
+    """Returns the status and headers of an aiohttp response as a
+    requests Response, for the verification helpers (see
+    `_verify_download`).
+    """
+    response = requests.Response()
+    response.status_code = r.status
+    response.headers = CaseInsensitiveDict(r.headers)
+    return response
+
+
+async def _get_async(urls: List[str],
+                     dir: str,
+                     base_url: str,
+                     chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+                     timeout: int = 5,
+                     retry: int = 2,
+                     delay: int = 5,
+                     workers: int = 4,
+                     limiter: _TokenBucket = None,
+                     checksum: str = None,
+                     verify: bool = True) -> Dict[str, Any]:
+    """Asynchronously downloads the given URLs and saves the contents to dir.
+
+    As in `_get`, files are written to a `.part` file, verified (see
+    `_verify_download`) and only then atomically renamed into place.
+
+    Args:
+        urls (list): 
+            List of URLs (relative to base_url) with files at their
+            endpoints to download.
+
+        dir (str): 
+            Directory path to save downloaded files in.
+
+        base_url (str): 
+            Base URL that urls are joined to.
+
+        chunk_size (int): 
+            Optional; chunk size for streaming files. Large files are
+            read in larger chunks (see `_adaptive_chunk_size`).
+
+        timeout (int): 
+            Optional; timeout (in seconds) for connecting to the server
+            and for each read from the server.
+
+        retry (int): 
+            Optional; number of times to retry a request after a
+            connection error or a 429/5xx response.
+
+        delay (int): 
+            Optional; backoff factor. Determines number of seconds
+            coroutines will sleep between failed requests.
+            {delay} * (2 ** ({number of total retries} - 1))
+
+        workers (int): 
+            Optional; maximum number of concurrent downloads.
+
+        limiter (_TokenBucket): 
+            Optional; rate limiter shared by all downloads. Defaults to
+            a limiter capped at SEC_MAX_REQUESTS_PER_SECOND.
+
+        checksum (str): 
+            Optional; hashlib algorithm to hash files with while they
+            are written. See `_get`.
+
+        verify (bool): 
+            Optional; if True (default), files ending in `.zip` must
+            have a valid zip central directory. See `_get`.
+
+    Effects: 
+        Downloaded files are saved in dir. Exceptions raised by aiohttp
+        are logged and the url is reported as failed.
+
+    Returns: 
+        Dict[str, Any] -- Result of the downloads (in the order of
+        urls). See `_get`.
+    """
+    aiohttp = _import_aiohttp()
+
+    if limiter is None:
+        limiter = _TokenBucket(SEC_MAX_REQUESTS_PER_SECOND)
+
+    async def _save(path, r, url):
+        """Writes the response to a `.part` file, verifies it and
+        renames it to path. Returns the reason of a failure, or None.
+
+        File writes, hashing, verification and renaming run in the
+        loop's default executor, so they do not block the event loop.
+        """
+        loop = asyncio.get_event_loop()
+        part = f'{path}{PART_EXT}'
+        response = _as_response(r)
+        algorithms = set(_expected_digests(response))
+        if checksum is not None:
+            algorithms.add(checksum)
+        hashers = {a: _new_hasher(a) for a in algorithms}
+        length = _content_length(response)
+        written = 0
+
+        def _write(fd, chunk):
+            fd.write(chunk)
+            for hasher in hashers.values():
+                hasher.update(chunk)
+
+        try:
+            fd = await loop.run_in_executor(None, open, part, 'wb')
+            try:
+                async for chunk in r.content.iter_chunked(
+                        _adaptive_chunk_size(chunk_size, length)):
+                    await loop.run_in_executor(None, _write, fd, chunk)
+                    written += len(chunk)
+            finally:
+                await loop.run_in_executor(None, fd.close)
+        except BaseException:
+            # Never leave a truncated file; the caller retries the url
+            _remove_part(part)
+            raise
+        error = await loop.run_in_executor(
+            None, functools.partial(_verify_download, part, response,
+                                    written, hashers,
+                                    zipfile=verify and url.endswith('.zip')))
+        if error is not None:
+            await loop.run_in_executor(None, _remove_part, part)
+            logger.warning(f'{url} failed verification: {error}')
+            return error
+        meta = None
+        if checksum is not None:
+            meta = {'etag': r.headers.get('ETag'),
+                    'last_modified': r.headers.get('Last-Modified'),
+                    checksum: hashers[checksum].hexdigest()}
+        await loop.run_in_executor(None, _publish_part, part, path, meta)
+        logger.info(f'Downloaded {url}')
+        return None
+
+    async def _download(session, url):
+        """Downloads url and returns the reason of a failure, or None.
+        """
+        full_url = f'{base_url}/{url}'
+        path = f'{dir}/{url}'
+        retries = 0
+        while True:
+            await limiter.acquire_async()
+            try:
+                async with session.get(full_url) as r:
+                    if r.status in RETRY_STATUSES and retries < retry:
+                        retries += 1
+                        # As urllib3, only honour Retry-After for the
+                        # statuses it is defined for
+                        retry_after = r.headers.get('Retry-After') \
+                            if r.status in Retry.RETRY_AFTER_STATUS_CODES \
+                            else None
+                        wait = _backoff_time(delay, retries, retry_after)
+                        logger.info(f'{full_url} returned {r.status}. '
+                                    f'Retrying in {wait} seconds.')
+                        await asyncio.sleep(wait)
+                        continue
+                    r.raise_for_status()
+                    logger.info(f'Successful access to url: {full_url}')
+                    return await _save(path, r, url)
+            except aiohttp.ClientResponseError as err:
+                logger.warning(err)
+                return str(err)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                if retries < retry:
+                    retries += 1
+                    await asyncio.sleep(_backoff_time(delay, retries))
+                    continue
+                logger.warning(f'{full_url}: {err!r}')
+                return repr(err)
+
+    # Same semantics as _TimeoutHTTPAdapter: timeout applies to both
+    # connecting and to each socket read
+    client_timeout = aiohttp.ClientTimeout(sock_connect=timeout,
+                                           sock_read=timeout)
+    connector = aiohttp.TCPConnector(limit=max(workers, 1))
+    async with aiohttp.ClientSession(timeout=client_timeout,
+                                     connector=connector) as session:
+        errors = await asyncio.gather(*[_download(session, url)
+                                        for url in urls])
+
+    result = {'downloaded': [], 'not_modified': [], 'failed': {}}
+    for url, error in zip(urls, errors):
+        if error is not None:
+            result['failed'][url] = error
+        else:
+            result['downloaded'].append(url)
+    return result
+
+
+async def get_DERA_async(dataset: str,
+                         dir: str,
+                         start_date: str,
+                         end_date: str,
+                         chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+                         timeout: int = 120,
+                         retry: int = 2,
+                         delay: int = 1,
+                         workers: int = 4,
+                         rate_limit: float = SEC_MAX_REQUESTS_PER_SECOND,
+                         base_url: str = DERA_DATA_URL,
+                         checksum: str = None,
+                         verify: bool = True) -> Dict[str, Any]:
+    """Async counterpart to `get_DERA`. Concurrently downloads and saves
+    DERA dataset zipfiles for quarters between start_date and end_date.
+
+    Requires the optional `aiohttp` dependency.
+
+    Args:
+        dataset (str): 
+            DERA dataset to download. See `get_DERA`.
+
+        dir (str): 
+            Directory path to save downloaded files in.
+
+        start_date (str): 
+            Fetch all datasets after start_date. See `get_DERA`.
+
+        end_date (Union[None, str]): 
+            Optional; fetch all datasets before end_date.
+            See `get_DERA`.
+
+        chunk_size (int): 
+            Optional; chunk size for streaming files.
+
+        timeout (int): 
+            Optional; timeout before closing connection.
+
+        retry (int): 
+            Optional; number of times to retry a request
+            after a connection error or a 429/5xx response.
+
+        delay (int): 
+            Optional; backoff factor. Determines number of seconds
+            coroutines will sleep between failed requests, where
+            sleep seconds = delay * (2 ** ({number of total retries} - 1)),
+            except before the first retry (as `get_DERA`).
+
+        workers (int): 
+            Optional; maximum number of concurrent downloads.
+
+        rate_limit (float): 
+            Optional; maximum number of requests per second.
+            Defaults to the SEC's Fair Access limit.
+
+        base_url (str): 
+            Optional; base URL of the DERA data library.
+
+        checksum (str): 
+            Optional; hashlib algorithm (e.g. 'sha256') to hash files
+            with while they are written. See `_get`.
+
+        verify (bool): 
+            Optional; if True (default), downloaded zipfiles must have
+            a valid zip central directory. See `_get`.
+
+    Effects:
+        Downloaded files are saved in dir. Files that fail verification
+        are not saved.
+
+    Returns:
+        Dict[str, Any] -- Result of the downloads. See `get_DERA`.
+    """
+    # Same URL resolution as BaseUrlSession in get_DERA: relative urls
+    # replace the last path segment of the dataset endpoint
+    endpoint = DERA_DATA_PATHS[dataset]
+    dataset_url = f'{base_url}/{endpoint}'
+    dataset_url = dataset_url[:dataset_url.rfind('/')]
+
+    urls = _get_urls(dataset, start_date, end_date)
+    limiter = _TokenBucket(rate_limit)
+    return await _get_async(urls, dir, dataset_url, chunk_size, timeout,
+                            retry, delay, workers=workers, limiter=limiter,
+                            checksum=checksum, verify=verify)
 
 
 if __name__ == "__main__":
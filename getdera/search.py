@@ -0,0 +1,339 @@
+"""The `search` module contains a persistent full-text index of the
+text values of DERA TXT tables.
+
+The index is an inverted index of the terms (lowercased words, split
+at ASCII punctuation) in the value column of each period's TXT table,
+keyed by the rows' adsh, tag and version. It is updated incrementally
+with each period's TXT table (periods already indexed are not re-read)
+and saved next to the datasets as one directory per period:
+
+- docs.parquet -- adsh, tag and version of each indexed row (document)
+- terms -- sorted vocabulary as a text blob (see `getdera.texts`)
+- starts.npy -- start of each term's postings, followed by their end
+- docs.npy, positions.npy -- document and position of each posting,
+  sorted by term, document and position
+
+Arrays are memory-mapped, so opening the index is instant and a query
+only reads the postings of its terms. Term queries intersect the
+documents of each term, and phrase queries the positions of
+consecutive terms.
+
+Requires the optional `pyarrow` dependency.
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+
+from zipfile import ZipFile
+from typing import List
+from typing import Tuple
+
+from getdera.texts import TextBlob
+from getdera.texts import _load
+from getdera.utils import _fingerprint
+from getdera.utils import _import_pyarrow
+from getdera.utils import _period_key
+from getdera.utils import make_path
+
+
+TEXT_INDEX_KEYS = ['adsh', 'tag', 'version']  # Key columns of documents
+
+# Maps ASCII characters other than letters and digits to spaces
+TERM_SEPARATORS = bytes(c if c >= 128 or chr(c).isalnum() else ord(' ')
+                        for c in range(256))
+
+
+def _split(values) -> Tuple[np.ndarray, np.ndarray, object]:
+    """Splits values into terms. Returns the docs and positions of the
+    terms (see `tokenize`) and the terms as an Arrow array.
+    """
+    pa = _import_pyarrow('the text index')
+    pc = pa.compute
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    if isinstance(values, pa.Array):
+        values = values.cast(pa.large_string())
+    else:
+        values = pa.array(values, type=pa.large_string(), from_pandas=True)
+    values = pc.utf8_lower(values)
+    # Translating the UTF-8 buffer keeps the offsets of each value
+    validity, offsets, data = values.buffers()
+    if data is not None:
+        data = pa.py_buffer(data.to_pybytes().translate(TERM_SEPARATORS))
+    values = pa.Array.from_buffers(values.type, len(values),
+                                   [validity, offsets, data],
+                                   values.null_count, values.offset)
+    split = pc.utf8_split_whitespace(values)
+    docs = pc.list_parent_indices(split).to_numpy().astype(np.int32)
+    terms = pc.list_flatten(split)
+    # Empty values (and separators only) leave empty terms
+    nonempty = pc.greater(pc.binary_length(terms), 0)
+    docs = docs[nonempty.to_numpy(zero_copy_only=False)]
+    terms = terms.filter(nonempty)
+    first = np.searchsorted(docs, docs, side='left')
+    positions = (np.arange(len(docs)) - first).astype(np.int32)
+    return docs, positions, terms
+
+
+def tokenize(values) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Splits values (texts, None or NaN if missing) into lowercased
+    terms, separated by whitespace and ASCII characters other than
+    letters and digits.
+
+    Returns:
+        docs (np.ndarray) -- int32 index in values of each term,
+        positions (np.ndarray) -- int32 position of each term in its
+        value,
+        terms (np.ndarray) -- object array of terms.
+    """
+    docs, positions, terms = _split(values)
+    return docs, positions, terms.to_numpy(zero_copy_only=False)
+
+
+def _intersect(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Returns the values of sorted unique array a that are in sorted
+    unique array b.
+    """
+    if not len(a) or not len(b):
+        return a[:0]
+    i = np.minimum(np.searchsorted(b, a), len(b) - 1)
+    return a[b[i] == a]
+
+
+def _unique(a: np.ndarray) -> np.ndarray:
+    """Returns the unique values of sorted array a.
+    """
+    if not len(a):
+        return a
+    return a[np.concatenate([[True], a[1:] != a[:-1]])]
+
+
+def _read_txt(f):
+    """Reads the key and value columns of a TXT table (a binary
+    stream) as an Arrow table of strings (missing columns are null).
+    """
+    pa = _import_pyarrow('the text index')
+    columns = [*TEXT_INDEX_KEYS, 'value']
+    return pa.csv.read_csv(
+        f,
+        parse_options=pa.csv.ParseOptions(delimiter='\t'),
+        convert_options=pa.csv.ConvertOptions(
+            include_columns=columns, include_missing_columns=True,
+            column_types=dict.fromkeys(columns, pa.string()),
+            strings_can_be_null=True))
+
+
+class _Period:
+    """Memory-mapped index of one period's TXT table.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.terms = TextBlob.open(os.path.join(path, 'terms'))
+        self.starts = _load(os.path.join(path, 'starts.npy'))
+        self.docs = _load(os.path.join(path, 'docs.npy'))
+        self.positions = _load(os.path.join(path, 'positions.npy'))
+        self._keys = None
+
+    @staticmethod
+    def write(path: str, keys: pd.DataFrame, values) -> None:
+        """Indexes values (texts, one per row of keys) and saves the
+        index of the period in path.
+        """
+        docs, positions, terms = _split(values)
+        terms = terms.dictionary_encode()
+        codes = terms.indices.to_numpy(zero_copy_only=False)
+        vocabulary = terms.dictionary.to_numpy(zero_copy_only=False)
+        # Sort the vocabulary (code point order is UTF-8 byte order)
+        order = np.argsort(vocabulary, kind='stable')
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        codes = rank[codes]
+        # Postings are in (doc, position) order: sort stably by term
+        # (as uint16 if possible, which NumPy radix sorts)
+        if len(vocabulary) <= 1 << 16:
+            codes = codes.astype(np.uint16)
+        postings = np.argsort(codes, kind='stable')
+        starts = np.searchsorted(codes[postings],
+                                 np.arange(len(vocabulary) + 1))
+
+        make_path(path)
+        keys.reset_index(drop=True).to_parquet(
+            os.path.join(path, 'docs.parquet'))
+        TextBlob.write(vocabulary[order], os.path.join(path, 'terms'))
+        np.save(os.path.join(path, 'starts.npy'), starts.astype(np.int64))
+        np.save(os.path.join(path, 'docs.npy'), docs[postings])
+        np.save(os.path.join(path, 'positions.npy'), positions[postings])
+
+    def keys(self) -> pd.DataFrame:
+        """Returns the keys of the period's documents (loaded once).
+        """
+        if self._keys is None:
+            self._keys = pd.read_parquet(
+                os.path.join(self.path, 'docs.parquet'))
+        return self._keys
+
+    def term(self, term: str) -> int:
+        """Returns the ID of term in the sorted vocabulary (-1 if not
+        found), by binary search over the memory-mapped terms.
+        """
+        key = term.encode('utf-8')
+        data, offsets = self.terms.data, self.terms.offsets
+        low, high = 0, len(self.terms)
+        while low < high:
+            mid = (low + high) // 2
+            if data[offsets[mid]:offsets[mid + 1]].tobytes() < key:
+                low = mid + 1
+            else:
+                high = mid
+        if low < len(self.terms) and \
+                data[offsets[low]:offsets[low + 1]].tobytes() == key:
+            return low
+        return -1
+
+    def postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the documents and positions of term.
+        """
+        i = self.term(term)
+        if i < 0:
+            return np.empty(0, np.int32), np.empty(0, np.int32)
+        start, end = self.starts[i], self.starts[i + 1]
+        return self.docs[start:end], self.positions[start:end]
+
+    def search(self, terms: List[str], phrase: bool = False) -> np.ndarray:
+        """Returns the sorted documents containing all terms (as
+        consecutive terms if phrase).
+        """
+        if not terms:
+            return np.empty(0, np.int32)
+        if not phrase:
+            docs = None
+            for term in sorted(set(terms)):
+                # Postings of a term are sorted by document
+                found = _unique(self.postings(term)[0])
+                docs = found if docs is None else _intersect(docs, found)
+                if not len(docs):
+                    break
+            return docs
+        # Encode (doc, position - offset in phrase) as sorted int64 keys
+        matches = None
+        for offset, term in enumerate(terms):
+            docs, positions = self.postings(term)
+            keys = (docs.astype(np.int64) << 32) | \
+                (positions.astype(np.int64) - offset + (1 << 31))
+            matches = keys if matches is None else _intersect(matches, keys)
+            if not len(matches):
+                break
+        return _unique((matches >> 32).astype(np.int32))
+
+
+class TextIndex:
+    """Persistent full-text index of the values of TXT tables.
+
+    Args:
+        dir (str):
+            Directory path to save the index in (e.g. the directory
+            containing DERA datasets as zipfiles).
+
+        dataset (str):
+            DERA dataset of the TXT tables (e.g. 'statements', 'risk').
+    """
+
+    def __init__(self, dir: str, dataset: str):
+        self.path = os.path.join(make_path(dir), f'{dataset}_text_index')
+        try:
+            with open(os.path.join(self.path, 'periods.json'), 'r') as f:
+                self.periods = json.load(f)
+        except (OSError, ValueError):
+            self.periods = {}
+        self._indexes = {}  # Period name : _Period
+
+    def __len__(self) -> int:
+        """Number of indexed documents (TXT rows).
+        """
+        return sum(p['docs'] for p in self.periods.values())
+
+    def _save(self) -> None:
+        path = os.path.join(self.path, 'periods.json')
+        with open(f'{path}.tmp', 'w') as f:
+            json.dump(self.periods, f)
+        os.replace(f'{path}.tmp', path)
+
+    def update(self, zipfiles: List[str]) -> List[str]:
+        """Indexes the TXT tables of zipfiles (in order) and saves the
+        index. Zipfiles already indexed (and unchanged since) are
+        skipped.
+
+        Returns:
+            Names of the indexed zipfiles.
+        """
+        indexed = []
+        for zipfile in zipfiles:
+            name = os.path.basename(zipfile)
+            fingerprint = _fingerprint(zipfile)
+            if self.periods.get(name, {}).get('zipfile') == fingerprint:
+                continue
+            with ZipFile(zipfile, 'r') as zipObj, \
+                    zipObj.open('txt.tsv') as f:
+                data = _read_txt(f)
+            self._indexes.pop(name, None)
+            _Period.write(os.path.join(self.path, name.split('.')[0]),
+                          data.drop(['value']).to_pandas(), data['value'])
+            self.periods[name] = {'zipfile': fingerprint,
+                                  'docs': data.num_rows}
+            self._save()
+            indexed.append(name)
+        return indexed
+
+    def _period(self, name: str) -> _Period:
+        if name not in self._indexes:
+            self._indexes[name] = _Period(
+                os.path.join(self.path, name.split('.')[0]))
+        return self._indexes[name]
+
+    def search(self,
+               query: str,
+               phrase: bool = False,
+               periods: List[str] = None) -> pd.DataFrame:
+        """Returns the indexed TXT rows whose value contains every term
+        of query (case-insensitive), or if phrase, the terms of query
+        in order.
+
+        Args:
+            query (str):
+                Terms to search for, e.g. 'supply chain'. Characters
+                other than letters and digits separate terms.
+
+            phrase (bool):
+                Optional; if True, matches query as a phrase.
+
+            periods (List[str]):
+                Optional; names of the zipfiles to search (default all
+                indexed zipfiles).
+
+        Returns:
+            Pandas DataFrame -- period (zipfile name), row (in the
+            period's TXT table) and the adsh, tag and version of each
+            matching row, in period and row order.
+        """
+        _, _, terms = tokenize([query])
+        terms = list(terms)
+        results = []
+        # Periods may have been indexed (or be given) in any order
+        names = [n for n in periods or self.periods if n in self.periods]
+        for name in sorted(names, key=_period_key):
+            period = self._period(name)
+            rows = period.search(terms, phrase)
+            results.append(period.keys().iloc[rows].assign(
+                period=name, row=rows))
+        if not results:
+            return pd.DataFrame(columns=['period', 'row', *TEXT_INDEX_KEYS])
+        data = pd.concat(results, ignore_index=True)
+        columns = ['period', 'row']
+        return data[[*columns, *(c for c in data if c not in columns)]]
+
+
+if __name__ == "__main__":
+    pass
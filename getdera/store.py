@@ -0,0 +1,258 @@
+"""The `store` module contains a consolidated on-disk store of
+processed DERA tables that is updated incrementally.
+
+The store keeps each period's processed tables (e.g. `num` of
+`2020_10_notes.zip`) as a Parquet file, and a manifest of the dataset
+zipfiles it has ingested. `DERAStore.update` ingests only zipfiles that
+are new (or changed) since the last update, so the cost of an update is
+proportional to the new data and not to the full history. Tables are
+read back across periods, indexed as in `getdera.dera.process`.
+
+Optionally, the values of TXT tables are kept in memory-mappable text
+blobs (see `getdera.texts`) instead of Parquet, and read back as a lazy
+column.
+
+Requires the optional `pyarrow` dependency.
+"""
+
+import os
+import json
+import pandas as pd
+
+from tqdm import tqdm
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict
+from typing import List
+
+from getdera.dera import DERA_DATA_EXT
+from getdera.dera import _assemble
+from getdera.dera import _period_files
+from getdera.dera import _read_period
+from getdera.dera import _reader_options
+from getdera.dera import _with_index
+from getdera.texts import TextArray
+from getdera.texts import TextBlob
+from getdera.utils import _fingerprint
+from getdera.utils import _period_key
+from getdera.utils import make_path
+
+
+MANIFEST_FILE = 'manifest.json'
+
+DERA_STORE_TABLES = {
+    'risk': ['sub', 'tag', 'num', 'txt', 'cal', 'lab'],
+    'statements': ['sub', 'tag', 'num', 'txt', 'pre', 'cal', 'dim', 'ren'],
+}  # Tables stored by default
+
+
+class DERAStore:
+    """Consolidated store of processed tables of a DERA dataset.
+
+    Args:
+        path (str):
+            Directory path to save the store in.
+
+        dataset (str):
+            DERA dataset to store (e.g. 'statements', 'risk').
+
+        tables (List[str]):
+            Optional; tables to store (default DERA_STORE_TABLES).
+
+        schema (bool):
+            Optional; if True (default), tables are parsed with their
+            compact schemas (see `getdera.schemas`).
+
+        texts (bool):
+            Optional; if True, the value column of TXT tables is
+            stored in a memory-mappable text blob per period and read
+            back as a lazy `getdera.texts.TextArray` column (whose
+            texts are decoded when accessed) instead of strings.
+
+    Changing tables, schema or texts of an existing store re-ingests
+    all zipfiles on the next update.
+    """
+
+    def __init__(self,
+                 path: str,
+                 dataset: str,
+                 tables: List[str] = None,
+                 schema: bool = True,
+                 texts: bool = False):
+        self.path = make_path(path)
+        self.dataset = dataset
+        self.tables = list(tables or DERA_STORE_TABLES[dataset])
+        self.schema = schema
+        self.texts = texts
+        self.manifest = self._load_manifest()
+
+    def _options(self) -> Dict:
+        options = {'dataset': self.dataset,
+                   'tables': self.tables,
+                   'schema': self.schema}
+        if self.texts:
+            options['texts'] = True
+        return options
+
+    def _load_manifest(self) -> Dict:
+        """Returns the saved manifest, or an empty manifest if there is
+        none or it was saved with other options.
+        """
+        try:
+            with open(os.path.join(self.path, MANIFEST_FILE), 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        if manifest.get('options') != self._options():
+            manifest = {'options': self._options(), 'periods': {}}
+        return manifest
+
+    def _save_manifest(self) -> None:
+        path = os.path.join(self.path, MANIFEST_FILE)
+        with open(f'{path}.tmp', 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(f'{path}.tmp', path)
+
+    def _table_path(self, table: str, zipfile: str) -> str:
+        period = os.path.basename(zipfile).split('.')[0]
+        return os.path.join(self.path, table, f'{period}.parquet')
+
+    def _stores_texts(self, table: str) -> bool:
+        return self.texts and table == 'txt'
+
+    @staticmethod
+    def _blob_path(path: str) -> str:
+        """Returns the text blob path (without extension) of a stored
+        table's Parquet file.
+        """
+        return os.path.splitext(path)[0]
+
+    @property
+    def periods(self) -> List[str]:
+        """Names of ingested zipfiles (in period order).
+        """
+        return sorted(self.manifest['periods'], key=_period_key)
+
+    def pending(self, dir: str) -> List[str]:
+        """Returns paths of the dataset's zipfiles in dir that are new
+        or changed since they were ingested (in period order).
+        """
+        ext = DERA_DATA_EXT[self.dataset]
+        zipfiles = sorted((f for f in os.listdir(dir) if f.endswith(ext)),
+                          key=_period_key)
+        return [os.path.join(dir, f) for f in zipfiles
+                if self.manifest['periods'].get(f)
+                != _fingerprint(os.path.join(dir, f))]
+
+    def update(self, dir: str, workers: int = 1) -> List[str]:
+        """Ingests the dataset's zipfiles in dir that are new or changed
+        since they were ingested. If workers > 1, zipfiles are parsed
+        concurrently in a pool of worker processes.
+
+        The manifest is saved after each zipfile, so an interrupted
+        update resumes with the zipfiles not yet ingested.
+
+        Returns:
+            Names of the ingested zipfiles (in period order).
+        """
+        zipfiles = self.pending(dir)
+        options = {t: _reader_options(self.dataset, t, schema=self.schema)
+                   for t in self.tables}
+        if workers > 1 and len(zipfiles) > 1:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            # map returns results in the order of zipfiles
+            results = executor.map(_read_period, zipfiles,
+                                   [options] * len(zipfiles),
+                                   [True] * len(zipfiles))
+        else:
+            executor = None
+            results = (_read_period(z, options, missing_ok=True)
+                       for z in zipfiles)
+        try:
+            for zipfile, tables in tqdm(zip(zipfiles, results),
+                                        total=len(zipfiles)):
+                for table in self.tables:
+                    path = self._table_path(table, zipfile)
+                    if table not in tables:
+                        # Remove table of a previous version of zipfile
+                        if os.path.exists(path):
+                            os.remove(path)
+                        TextBlob.remove(self._blob_path(path))
+                        continue
+                    make_path(os.path.dirname(path))
+                    data = tables[table]
+                    if self._stores_texts(table) and 'value' in data:
+                        # Store texts in a blob, and their rows in Parquet
+                        TextBlob.write(data['value'], self._blob_path(path))
+                        data = data.assign(value=range(len(data)))
+                    data.to_parquet(f'{path}.tmp')
+                    os.replace(f'{path}.tmp', path)
+                name = os.path.basename(zipfile)
+                self.manifest['periods'][name] = _fingerprint(zipfile)
+                self._save_manifest()
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return [os.path.basename(z) for z in zipfiles]
+
+    def read(self,
+             table: str,
+             start_date: str = None,
+             end_date: str = None,
+             columns: List[str] = None) -> pd.DataFrame:
+        """Reads a stored table across ingested periods between
+        start_date and end_date (default all periods), indexed and
+        deduplicated as by `getdera.dera.process`.
+
+        Args:
+            table (str):
+                Stored table to read.
+
+            start_date (str):
+                Optional; read periods after start_date (default from
+                the first stored period). See `getdera.dera.process`.
+
+            end_date (str):
+                Optional; read periods before end_date (default up to
+                today). See `getdera.dera.process`.
+
+            columns (List[str]):
+                Optional; columns to read. The table's index columns
+                are always read.
+
+        Raises:
+            ValueError: if the table is not stored.
+            FileNotFoundError: if no periods between start_date and
+            end_date are stored.
+        """
+        if table not in self.tables:
+            raise ValueError(f'Table not stored: {table}')
+        periods = self.periods
+        if periods and (start_date is not None or end_date is not None):
+            if start_date is None:
+                # From the first stored period
+                year, month = _period_key(periods[0])
+                start_date = f'01-{month:02d}-{year}'
+            # To today if end_date is None, as in process
+            relevant = set(_period_files(self.dataset, start_date, end_date))
+            periods = [p for p in periods if p in relevant]
+        if not periods:
+            raise FileNotFoundError('No stored DERA datasets between '
+                                    'start date and end date.')
+        paths = [self._table_path(table, p) for p in periods]
+        # Periods whose zipfile has no such table are skipped
+        paths = [p for p in paths if os.path.exists(p)]
+        if not paths:
+            raise FileNotFoundError(f'No stored {table} tables between '
+                                    'start date and end date.')
+        columns = _with_index(table, columns)
+        data = [pd.read_parquet(p, columns=columns) for p in paths]
+        if self._stores_texts(table):
+            for path, d in zip(paths, data):
+                if 'value' in d:
+                    blob = TextBlob.open(self._blob_path(path))
+                    d['value'] = TextArray.from_blob(blob, d['value'])
+        return _assemble(table, data)
+
+
+if __name__ == "__main__":
+    pass
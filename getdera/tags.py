@@ -0,0 +1,153 @@
+"""The `tags` module contains a persistent dictionary of the XBRL tags
+found in DERA datasets.
+
+The dictionary assigns stable integer IDs to (tag, version) pairs in
+order of first appearance. It is updated incrementally with each
+period's TAG table (periods already added are not re-read) and saved
+next to the datasets, so that tables across periods can carry a
+compact int32 tag ID instead of repeating tag and version strings.
+
+Requires the optional `pyarrow` dependency.
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+
+from zipfile import ZipFile
+from typing import Iterable
+from typing import List
+
+from getdera.utils import _fingerprint
+from getdera.utils import make_path
+
+
+TAG_ID_DTYPE = 'int32'
+
+DERA_TAG_KEYS = {
+    'tag_id': ('tag', 'version'),
+    'ptag_id': ('ptag', 'pversion'),  # CAL parent tag
+    'ctag_id': ('ctag', 'cversion'),  # CAL child tag
+}  # Tag ID column : (tag column, version column)
+
+
+class TagDictionary:
+    """Persistent dictionary of (tag, version) pairs and their IDs.
+
+    Args:
+        dir (str):
+            Directory path to save the dictionary in (e.g. the
+            directory containing DERA datasets as zipfiles).
+
+        dataset (str):
+            DERA dataset of the tags (e.g. 'statements', 'risk').
+    """
+
+    def __init__(self, dir: str, dataset: str):
+        self.path = os.path.join(make_path(dir), f'{dataset}_tags')
+        try:
+            self.tags = pd.read_parquet(f'{self.path}.parquet')
+            with open(f'{self.path}.json', 'r') as f:
+                self.periods = json.load(f)
+        except (OSError, ValueError):
+            self.tags = pd.DataFrame({'tag': pd.Series(dtype=object),
+                                      'version': pd.Series(dtype=object)})
+            self.periods = {}
+        self._index = pd.MultiIndex.from_frame(self.tags)
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self.tags)
+
+    def update(self, zipfiles: List[str]) -> None:
+        """Adds the (tag, version) pairs in the TAG tables of zipfiles
+        (in order) and saves the dictionary. Zipfiles already added
+        (and unchanged since) are skipped.
+        """
+        for zipfile in zipfiles:
+            name = os.path.basename(zipfile)
+            fingerprint = _fingerprint(zipfile)
+            if self.periods.get(name) == fingerprint:
+                continue
+            with ZipFile(zipfile, 'r') as zipObj:
+                with zipObj.open('tag.tsv') as f:
+                    data = pd.read_csv(f, sep='\t', encoding='utf-8',
+                                       usecols=['tag', 'version'],
+                                       dtype=str)
+            self.add(data['tag'], data['version'])
+            self.periods[name] = fingerprint
+            self._dirty = True
+        self.save()
+
+    def add(self,
+            tag: Iterable[str],
+            version: Iterable[str]) -> np.ndarray:
+        """Returns the IDs of (tag, version) pairs. Pairs not yet in
+        the dictionary are assigned new IDs. Pairs with a missing tag
+        or version are not added (their ID is -1).
+
+        Returns:
+            ids (np.ndarray) -- int32 array of tag IDs.
+        """
+        # Factorize tags and versions separately (fast for categoricals),
+        # then look up each distinct pair once. Codes are offset by one
+        # so missing values (code -1) do not collide with other pairs
+        tag_codes, tags = pd.factorize(pd.Series(tag))
+        version_codes, versions = pd.factorize(pd.Series(version))
+        n = len(versions) + 1
+        pairs = (tag_codes.astype(np.int64) + 1) * n + version_codes + 1
+        codes, pairs = pd.factorize(pairs)
+        tag_codes, version_codes = pairs // n - 1, pairs % n - 1
+        valid = (tag_codes >= 0) & (version_codes >= 0)
+        uniques = pd.MultiIndex.from_arrays(
+            [np.asarray(tags, dtype=object)[tag_codes[valid]],
+             np.asarray(versions, dtype=object)[version_codes[valid]]])
+        found = self._index.get_indexer(uniques)
+        new = found == -1
+        if new.any():
+            start = len(self.tags)
+            found[new] = np.arange(start, start + new.sum())
+            added = pd.DataFrame({
+                'tag': uniques.get_level_values(0)[new].astype(object),
+                'version': uniques.get_level_values(1)[new].astype(object)})
+            self.tags = pd.concat([self.tags, added], ignore_index=True)
+            self._index = pd.MultiIndex.from_frame(self.tags)
+            self._dirty = True
+        ids = np.full(len(pairs), -1, dtype=TAG_ID_DTYPE)
+        ids[valid] = found
+        return ids[codes]
+
+    def ids(self,
+            tag: Iterable[str],
+            version: Iterable[str]) -> np.ndarray:
+        """Returns the IDs of (tag, version) pairs (-1 if a pair is not
+        in the dictionary).
+
+        Returns:
+            ids (np.ndarray) -- int32 array of tag IDs.
+        """
+        keys = pd.MultiIndex.from_arrays([tag, version])
+        return self._index.get_indexer(keys).astype(TAG_ID_DTYPE)
+
+    def lookup(self, ids: Iterable[int]) -> pd.DataFrame:
+        """Returns the (tag, version) pairs of IDs (missing if -1).
+        """
+        return self.tags.reindex(np.asarray(ids)).reset_index(drop=True)
+
+    def save(self) -> None:
+        """Saves the dictionary if it has changed since it was loaded
+        (or last saved).
+        """
+        if not self._dirty:
+            return
+        self.tags.to_parquet(f'{self.path}.parquet.tmp')
+        os.replace(f'{self.path}.parquet.tmp', f'{self.path}.parquet')
+        with open(f'{self.path}.json.tmp', 'w') as f:
+            json.dump(self.periods, f)
+        os.replace(f'{self.path}.json.tmp', f'{self.path}.json')
+        self._dirty = False
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,133 @@
+import os
+import shutil
+import pytest
+
+from zipfile import ZipFile
+from pandas.testing import assert_frame_equal
+
+from getdera.cache import TableCache
+from getdera.dera import process
+
+
+# TESTCASES
+
+TESTCASES = {
+    'process_cache': [
+        {'args': ('risk', 'txt', '13-06-2019', '13-03-2020'),
+         'kwargs': {'dtype': {'dummy_val': 'category'}},
+         'expected': 3},
+        {'args': ('risk', 'sub', '13-06-2019', '13-03-2020'),
+         'kwargs': {},
+         'expected': 3},
+        {'args': ('risk', 'tag', '13-06-2019', '13-03-2020'),
+         'kwargs': {},
+         'expected': 3},
+        {'args': ('statements', 'num', '13-03-2020', '13-08-2020'),
+         'kwargs': {},
+         'expected': 2},
+        {'args': ('statements', 'txt', '13-03-2020', '13-08-2020'),
+         'kwargs': {},
+         'expected': 2},
+    ],
+    'evict': [
+        {'max_bytes': 0, 'expected': 0},
+        {'max_bytes': 10 * 1024 ** 2, 'expected': 3},
+    ],
+}
+
+
+# FIXTURES
+
+@pytest.fixture(scope='function')
+def cache_data_directory(dera_data_directory, tmp_path):
+    """Copies the synthetic DERA zipfiles into a fresh directory
+    (so that tests can modify them) and returns its path.
+    """
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'data')
+    shutil.copytree(dera_data_directory, path)
+    return path
+
+
+@pytest.fixture(scope='function', params=TESTCASES['process_cache'])
+def process_cache_params(request):
+    args = request.param['args']
+    kwargs = request.param['kwargs']
+    expected = request.param['expected']
+    return args, kwargs, expected
+
+
+@pytest.fixture(scope='function', params=TESTCASES['evict'])
+def evict_params(request):
+    max_bytes = request.param['max_bytes']
+    expected = request.param['expected']
+    return max_bytes, expected
+
+
+# UNIT TESTS
+
+def test_process_cache(process_cache_params, cache_data_directory, tmp_path):
+    """Processing with a cache returns the same data (and dtypes) on a
+    cache miss and on a cache hit.
+    """
+    args, kwargs, n_entries = process_cache_params
+    cache = TableCache(str(tmp_path / 'cache'))
+    expected = process(cache_data_directory, *args, **kwargs)
+    miss = process(cache_data_directory, *args, cache=cache, **kwargs)
+    hit = process(cache_data_directory, *args, cache=cache, **kwargs)
+    assert_frame_equal(miss, expected)
+    assert_frame_equal(hit, expected)
+    assert len([f for f in os.listdir(cache.path)
+                if f.endswith('.parquet')]) == n_entries
+
+
+def test_cache_invalidate(cache_data_directory, tmp_path):
+    """Cache entries are invalidated when their source zipfile changes.
+    """
+    cache = TableCache(str(tmp_path / 'cache'))
+    zipfile = os.path.join(cache_data_directory, '2019q3_rr1.zip')
+    args = (cache_data_directory, 'risk', 'sub', '13-06-2019', '13-08-2019')
+    process(*args, cache=cache)
+
+    with ZipFile(zipfile, 'w') as zipObj:
+        zipObj.writestr('sub.tsv', 'adsh\tdummy_val\n'
+                                   '0000000001-01-000009\tchanged\n')
+    result = process(*args, cache=cache)
+    assert result['dummy_val'].to_list() == ['changed']
+    assert len([f for f in os.listdir(cache.path)
+                if f.endswith('.parquet')]) == 1
+
+
+def test_cache_directories(cache_data_directory, tmp_path):
+    """The same period in different directories has different cache
+    entries.
+    """
+    cache = TableCache(str(tmp_path / 'cache'))
+    other = str(tmp_path / 'other')
+    shutil.copytree(cache_data_directory, other)
+    with ZipFile(os.path.join(other, '2019q3_rr1.zip'), 'w') as zipObj:
+        zipObj.writestr('sub.tsv', 'adsh\tdummy_val\n'
+                                   '0000000001-01-000009\tother\n')
+    dates = ('13-06-2019', '13-08-2019')
+    for _ in range(2):
+        result = process(cache_data_directory, 'risk', 'sub', *dates,
+                         cache=cache)
+        assert result['dummy_val'].dropna().to_list() == \
+            ['lorem2019q3', 'dolor2019q3']
+        result = process(other, 'risk', 'sub', *dates, cache=cache)
+        assert result['dummy_val'].to_list() == ['other']
+    assert len([f for f in os.listdir(cache.path)
+                if f.endswith('.parquet')]) == 2
+
+
+def test_cache_evict(evict_params, cache_data_directory, tmp_path):
+    """Least recently used entries are evicted to keep the cache
+    within max_bytes.
+    """
+    max_bytes, expected = evict_params
+    cache = TableCache(str(tmp_path / 'cache'), max_bytes=max_bytes)
+    process(cache_data_directory, 'risk', 'txt', '13-06-2019', '13-03-2020',
+            cache=cache)
+    result = len([f for f in os.listdir(cache.path)
+                  if f.endswith('.parquet')])
+    assert result == expected
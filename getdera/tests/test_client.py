@@ -1,13 +1,35 @@
+import io
 import os
+import json
+import time
+import base64
+import hashlib
+import asyncio
 import pytest
 import responses
 import shutil
 
+from responses import matchers
+import threading
+
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from zipfile import ZipFile
+
 from requests_toolbelt import sessions
+from urllib3.util.retry import Retry
 from getdera import utils
 
+from getdera.scrapper.client import DERAClient
+from getdera.scrapper.client import DOWNLOAD_MAX_CHUNK_SIZE
+from getdera.scrapper.client import _adaptive_chunk_size
+from getdera.scrapper.client import _backoff_time
 from getdera.scrapper.client import _get
+from getdera.scrapper.client import _get_buffer
+from getdera.scrapper.client import _retry_strategy
+from getdera.scrapper.client import _TokenBucket
 from getdera.scrapper.client import get_DERA
+from getdera.scrapper.client import get_DERA_async
 
 
 # TESTCASES
@@ -18,11 +40,25 @@ DERA_URLS = {
     'risk': 'https://www.sec.gov/files/dera/data/mutual-fund-prospectus-risk/return-summary-data-sets'
 }
 
+ASYNC_RISK_PATH = '/mutual-fund-prospectus-risk/return-summary-data-sets'
+STATEMENTS_PATH = '/financial-statement-and-notes-data-sets'
+
 # SESSION SET-UP
 test_http = sessions.BaseUrlSession(base_url=TEST_SESSION_URL)
 assert_status_hook = lambda response, *args, **kwargs: response.raise_for_status()
 test_http.hooks["response"] = [assert_status_hook]
 
+def zip_bytes(content):
+    """Returns a zipfile (as bytes) with one member holding content.
+    """
+    buffer = io.BytesIO()
+    with ZipFile(buffer, 'w') as zipObj:
+        zipObj.writestr('sub.tsv', content)
+    return buffer.getvalue()
+
+
+VALID_ZIP = zip_bytes('adsh\n0000000001-01-000001\n')
+
 CONTENT = ['1'*3,
            '2'*6,
            '3'*13]
@@ -51,26 +87,33 @@ TEST_RESPONSES = {
     '200_risk': [
         {'url': '{}/2020q2_rr1.zip'.format(DERA_URLS['risk']),
          'method': 'GET',
+         'body': VALID_ZIP,
          'status': 200},
         {'url': '{}/2020q3_rr1.zip'.format(DERA_URLS['risk']),
          'method': 'GET',
+         'body': VALID_ZIP,
          'status': 200},
         {'url': '{}/2020q4_rr1.zip'.format(DERA_URLS['risk']),
          'method': 'GET',
+         'body': VALID_ZIP,
          'status': 200},
     ],
     '200_statements': [
         {'url': '{}/2020q2_notes.zip'.format(DERA_URLS['statements']),
          'method': 'GET',
+         'body': VALID_ZIP,
          'status': 200},
         {'url': '{}/2020q3_notes.zip'.format(DERA_URLS['statements']),
          'method': 'GET',
+         'body': VALID_ZIP,
          'status': 200},
         {'url': '{}/2020_10_notes.zip'.format(DERA_URLS['statements']),
          'method': 'GET',
+         'body': VALID_ZIP,
          'status': 200},
         {'url': '{}/2020_11_notes.zip'.format(DERA_URLS['statements']),
          'method': 'GET',
+         'body': VALID_ZIP,
          'status': 200},
     ]
 }
@@ -84,7 +127,19 @@ TESTCASES = {
                     'chunk_size': 3,
                     'timeout': 1,
                     'retry': 2,
-                    'delay': 1},
+                    'delay': 1,
+                    'verify': False},
+         'expected': [r for r in TEST_RESPONSES['200']]},
+        {'kwargs': {'urls': [r['url'].split('/')[-1] for r
+                             in TEST_RESPONSES['200']],
+                    'dir': 'TEMPORARY',
+                    'session': test_http,
+                    'chunk_size': 3,
+                    'timeout': 1,
+                    'retry': 2,
+                    'delay': 1,
+                    'workers': 3,
+                    'verify': False},
          'expected': [r for r in TEST_RESPONSES['200']]},
     ],
     '_get_error': [
@@ -107,6 +162,166 @@ TESTCASES = {
                     'delay': 1},
          'expected': [r for r in TEST_RESPONSES['500']]},
     ],
+    '_get_resume': [
+        # Resumes partial download with a Range request
+        {'existing': {'2019q1_rr1.zip.part': '11',
+                      '2019q1_rr1.zip.part.meta.json':
+                      '{"etag": "\\"a\\"", "last_modified": null}'},
+         'response': {'url': f'{TEST_URL}/2019q1_rr1.zip',
+                      'method': 'GET',
+                      'body': '1',
+                      'status': 206,
+                      'headers': {'ETag': '"a"'},
+                      'match': [matchers.header_matcher(
+                          {'Range': 'bytes=2-', 'If-Range': '"a"'})]},
+         'expected': {'2019q1_rr1.zip': '111',
+                      '2019q1_rr1.zip.meta.json':
+                      '{"etag": "\\"a\\"", "last_modified": null}'}},
+        # Resumes partial download of known length (preallocated)
+        {'existing': {'2019q1_rr1.zip.part': 'AB',
+                      '2019q1_rr1.zip.part.meta.json':
+                      '{"etag": "\\"a\\"", "last_modified": null}'},
+         'response': {'url': f'{TEST_URL}/2019q1_rr1.zip',
+                      'method': 'GET',
+                      'body': 'CDEF',
+                      'status': 206,
+                      'headers': {'ETag': '"a"',
+                                  'Content-Length': '4',
+                                  'Content-Range': 'bytes 2-5/6'},
+                      'auto_calculate_content_length': False,
+                      'match': [matchers.header_matcher(
+                          {'Range': 'bytes=2-', 'If-Range': '"a"'})]},
+         'expected': {'2019q1_rr1.zip': 'ABCDEF',
+                      '2019q1_rr1.zip.meta.json':
+                      '{"etag": "\\"a\\"", "last_modified": null}'}},
+        # Publishes a complete partial download (416 to its Range)
+        {'existing': {'2019q1_rr1.zip.part': '111',
+                      '2019q1_rr1.zip.part.meta.json':
+                      '{"etag": "\\"a\\"", "last_modified": null}'},
+         'response': {'url': f'{TEST_URL}/2019q1_rr1.zip',
+                      'method': 'GET',
+                      'status': 416,
+                      'headers': {'Content-Range': 'bytes */3'},
+                      'match': [matchers.header_matcher(
+                          {'Range': 'bytes=3-', 'If-Range': '"a"'})]},
+         'expected': {'2019q1_rr1.zip': '111',
+                      '2019q1_rr1.zip.meta.json':
+                      '{"etag": "\\"a\\"", "last_modified": null}'}},
+        # Downloads again if the partial download does not match (416)
+        {'existing': {'2019q1_rr1.zip.part': '11',
+                      '2019q1_rr1.zip.part.meta.json':
+                      '{"etag": "\\"a\\"", "last_modified": null}'},
+         'response': [{'url': f'{TEST_URL}/2019q1_rr1.zip',
+                       'method': 'GET',
+                       'status': 416,
+                       'headers': {'Content-Range': 'bytes */3'},
+                       'match': [matchers.header_matcher(
+                           {'Range': 'bytes=2-', 'If-Range': '"a"'})]},
+                      {'url': f'{TEST_URL}/2019q1_rr1.zip',
+                       'method': 'GET',
+                       'body': '111',
+                       'status': 200,
+                       'headers': {'ETag': '"a"'}}],
+         'expected': {'2019q1_rr1.zip': '111',
+                      '2019q1_rr1.zip.meta.json':
+                      '{"etag": "\\"a\\"", "last_modified": null}'}},
+        # Revalidates existing file with a conditional GET
+        {'existing': {'2019q1_rr1.zip': '111',
+                      '2019q1_rr1.zip.meta.json':
+                      '{"etag": "\\"a\\"", "last_modified": null}'},
+         'response': {'url': f'{TEST_URL}/2019q1_rr1.zip',
+                      'method': 'GET',
+                      'status': 304,
+                      'match': [matchers.header_matcher(
+                          {'If-None-Match': '"a"'})]},
+         'expected': {'2019q1_rr1.zip': '111',
+                      '2019q1_rr1.zip.meta.json':
+                      '{"etag": "\\"a\\"", "last_modified": null}'}},
+        # Downloads changed file and saves its validators
+        {'existing': {'2019q1_rr1.zip': '111',
+                      '2019q1_rr1.zip.meta.json':
+                      '{"etag": "\\"a\\"", "last_modified": null}'},
+         'response': {'url': f'{TEST_URL}/2019q1_rr1.zip',
+                      'method': 'GET',
+                      'body': '2222',
+                      'status': 200,
+                      'headers': {'ETag': '"b"',
+                                  'Last-Modified': 'Mon, 01 Jun 2020'}},
+         'expected': {'2019q1_rr1.zip': '2222',
+                      '2019q1_rr1.zip.meta.json':
+                      '{"etag": "\\"b\\"", '
+                      '"last_modified": "Mon, 01 Jun 2020"}'}},
+    ],
+    '_get_checksum': [
+        # Hashes the file while it is written
+        {'existing': {},
+         'kwargs': {'resume': False},
+         'response': {'url': f'{TEST_URL}/2019q1_rr1.zip',
+                      'method': 'GET',
+                      'body': '1'*1000,
+                      'status': 200},
+         'expected': '1'*1000},
+        # Hashes the partial download and the resumed remainder
+        {'existing': {'2019q1_rr1.zip.part': '11',
+                      '2019q1_rr1.zip.part.meta.json':
+                      '{"etag": "\\"a\\"", "last_modified": null}'},
+         'kwargs': {'resume': True, 'chunk_size': 1},
+         'response': {'url': f'{TEST_URL}/2019q1_rr1.zip',
+                      'method': 'GET',
+                      'body': '1'*98,
+                      'status': 206,
+                      'headers': {'ETag': '"a"'}},
+         'expected': '1'*100},
+    ],
+    '_get_verify': [
+        # Valid zipfile
+        {'response': {'body': VALID_ZIP,
+                      'headers': {'Content-MD5': base64.b64encode(
+                          hashlib.md5(VALID_ZIP).digest()).decode()}},
+         'expected': ('downloaded', None)},
+        # HTML error page saved as a zipfile
+        {'response': {'body': '<html>Request Rate Threshold Exceeded'},
+         'expected': ('failed', 'invalid zipfile')},
+        # Truncated body (connection closed before Content-Length)
+        {'response': {'body': VALID_ZIP[:-10],
+                      'headers': {'Content-Length': str(len(VALID_ZIP))},
+                      'auto_calculate_content_length': False},
+         'expected': ('failed', 'interrupted')},
+        # Checksum mismatch
+        {'response': {'body': VALID_ZIP,
+                      'headers': {'Digest': 'sha-256=' + base64.b64encode(
+                          hashlib.sha256(b'').digest()).decode()}},
+         'expected': ('failed', 'sha256 checksum mismatch')},
+    ],
+    '_get_buffer': [
+        {'kwargs': {}, 'body': VALID_ZIP, 'expected': (VALID_ZIP, False)},
+        {'kwargs': {'spill_size': 1}, 'body': VALID_ZIP,
+         'expected': (VALID_ZIP, True)},
+        {'kwargs': {'spill_size': 1}, 'body': '<html>',
+         'expected': (None, None)},
+    ],
+    'adaptive_chunk_size': [
+        {'args': (128, None), 'expected': 128},
+        {'args': (128, 1000), 'expected': 128},
+        {'args': (128, 64 * 1024 ** 2), 'expected': 1024 ** 2},
+        {'args': (128, 10 * 1024 ** 3), 'expected': DOWNLOAD_MAX_CHUNK_SIZE},
+        {'args': (32 * 1024 ** 2, 10 * 1024 ** 3),
+         'expected': 32 * 1024 ** 2},
+    ],
+    'backoff_time': [
+        {'args': (1, 1)},
+        {'args': (1, 2)},
+        {'args': (2, 4)},
+        {'args': (5, 10)},
+    ],
+    'token_bucket': [
+        {'kwargs': {'rate': 20, 'capacity': 1},
+         'n': 5,
+         'expected': 4 / 20},
+        {'kwargs': {'rate': 10},
+         'n': 10,
+         'expected': 0},
+    ],
     'get_mock': [
         {'args': ('risk', '31-03-2020', '01-10-2020'),
          'expected': ([r for r in TEST_RESPONSES['200_risk']],
@@ -116,6 +331,75 @@ TESTCASES = {
                       ['2020q2_notes.zip', '2020q3_notes.zip',
                        '2020_10_notes.zip', '2020_11_notes.zip'])},
     ],
+    'get_async': [
+        {'args': ('risk', '13-03-2020', '13-12-2020'),
+         'routes': {
+             f'{ASYNC_RISK_PATH}/2020q2_rr1.zip': [(200, zip_bytes('1'))],
+             f'{ASYNC_RISK_PATH}/2020q3_rr1.zip': [(200, zip_bytes('2'))],
+             f'{ASYNC_RISK_PATH}/2020q4_rr1.zip': [(503, b''),
+                                                   (200, zip_bytes('3'))],
+         },
+         'expected': ({'2020q2_rr1.zip': zip_bytes('1'),
+                       '2020q3_rr1.zip': zip_bytes('2'),
+                       '2020q4_rr1.zip': zip_bytes('3')}, [])},
+        {'args': ('risk', '13-03-2020', '13-08-2020'),
+         'routes': {
+             f'{ASYNC_RISK_PATH}/2020q2_rr1.zip': [(200, zip_bytes('1'))],
+             f'{ASYNC_RISK_PATH}/2020q3_rr1.zip': [(403, b'')],
+         },
+         'expected': ({'2020q2_rr1.zip': zip_bytes('1')},
+                      ['2020q3_rr1.zip'])},
+        # Interrupted transfer is not saved
+        {'args': ('risk', '13-03-2020', '13-08-2020'),
+         'routes': {
+             f'{ASYNC_RISK_PATH}/2020q2_rr1.zip': [(200, zip_bytes('1'))],
+             f'{ASYNC_RISK_PATH}/2020q3_rr1.zip': [
+                 (200, zip_bytes('2')[:-10], len(zip_bytes('2')))],
+         },
+         'expected': ({'2020q2_rr1.zip': zip_bytes('1')},
+                      ['2020q3_rr1.zip'])},
+        # HTML error page is not saved as a zipfile
+        {'args': ('risk', '13-03-2020', '13-08-2020'),
+         'routes': {
+             f'{ASYNC_RISK_PATH}/2020q2_rr1.zip': [(200, zip_bytes('1'))],
+             f'{ASYNC_RISK_PATH}/2020q3_rr1.zip': [(200, b'<html>')],
+         },
+         'expected': ({'2020q2_rr1.zip': zip_bytes('1')},
+                      ['2020q3_rr1.zip'])},
+    ],
+    'client': [
+        {'args': (['risk', 'statements'], '13-06-2019', '13-03-2020'),
+         'kwargs': {'workers': 2},
+         'routes': {
+             **{f'{ASYNC_RISK_PATH}/{q}_rr1.zip': [(200, zip_bytes(q))]
+                for q in ['2019q3', '2019q4', '2020q1']},
+             **{f'{STATEMENTS_PATH}/{q}_notes.zip': [(200, zip_bytes(q))]
+                for q in ['2019q3', '2019q4', '2020q1']},
+         },
+         'expected': 6},
+        {'args': ('risk', '13-03-2020', '13-08-2020'),
+         'kwargs': {'workers': 1},
+         'routes': {
+             f'{ASYNC_RISK_PATH}/2020q2_rr1.zip': [(200, VALID_ZIP)],
+             f'{ASYNC_RISK_PATH}/2020q3_rr1.zip': [(403, b'')],
+         },
+         'expected': 1},
+    ],
+    'client_failed': [
+        # 503 after retries
+        {'args': ('risk', '13-03-2020', '13-08-2020'),
+         'routes': {
+             f'{ASYNC_RISK_PATH}/2020q2_rr1.zip': [(200, VALID_ZIP)],
+             f'{ASYNC_RISK_PATH}/2020q3_rr1.zip': [(503, b'')],
+         },
+         'refused': False,
+         'expected': (['2020q2_rr1.zip'], ['2020q3_rr1.zip'])},
+        # Connection refused
+        {'args': ('risk', '13-03-2020', '13-08-2020'),
+         'routes': {},
+         'refused': True,
+         'expected': ([], ['2020q2_rr1.zip', '2020q3_rr1.zip'])},
+    ],
     'get_live': [
         {'args': ('risk', '01-05-2019', '15-12-2019'),
          'expected': ['2019q3_rr1.zip', '2019q4_rr1.zip']},
@@ -130,6 +414,37 @@ def register_mock_responses(mocks):
         responses.add(responses.Response(**r))
 
 
+def serve_routes(routes, keep_alive=False):
+    """Starts a local HTTP server in a background thread.
+    Each route maps a path to a list of (status, body) responses
+    returned in order (the last response is repeated). A response
+    (status, body, length) advertises length bytes but sends body, as
+    an interrupted transfer. If keep_alive, connections are kept open
+    between requests (HTTP/1.1).
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1' if keep_alive else 'HTTP/1.0'
+
+        def do_GET(self):
+            rsps = routes.get(self.path, [(404, b'')])
+            status, body, *length = rsps.pop(0) if len(rsps) > 1 \
+                else rsps[0]
+            self.send_response(status)
+            length = length[0] if length else len(body)
+            self.send_header('Content-Length', str(length))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
 @pytest.fixture(scope='function', params=TESTCASES['_get'])
 def _get_params(request):
 
@@ -146,6 +461,67 @@ def _get_error_params(request):
     return kwargs, rsps
 
 
+@pytest.fixture(scope='function', params=TESTCASES['_get_resume'])
+def _get_resume_params(request):
+
+    existing = request.param['existing']
+    rsp = request.param['response']
+    expected = request.param['expected']
+    return existing, rsp, expected
+
+
+@pytest.fixture(scope='function', params=TESTCASES['_get_checksum'])
+def _get_checksum_params(request):
+
+    existing = request.param['existing']
+    kwargs = request.param['kwargs']
+    rsp = request.param['response']
+    expected = request.param['expected']
+    return existing, kwargs, rsp, expected
+
+
+@pytest.fixture(scope='function', params=TESTCASES['_get_verify'])
+def _get_verify_params(request):
+
+    rsp = {'url': f'{TEST_URL}/2019q1_rr1.zip', 'method': 'GET',
+           'status': 200, **request.param['response']}
+    expected = request.param['expected']
+    return rsp, expected
+
+
+@pytest.fixture(scope='function', params=TESTCASES['_get_buffer'])
+def _get_buffer_params(request):
+
+    kwargs = request.param['kwargs']
+    rsp = {'url': f'{TEST_URL}/2019q1_rr1.zip', 'method': 'GET',
+           'status': 200, 'body': request.param['body']}
+    expected = request.param['expected']
+    return kwargs, rsp, expected
+
+
+@pytest.fixture(scope='function', params=TESTCASES['adaptive_chunk_size'])
+def adaptive_chunk_size_params(request):
+
+    args = request.param['args']
+    expected = request.param['expected']
+    return args, expected
+
+
+@pytest.fixture(scope='function', params=TESTCASES['backoff_time'])
+def backoff_time_params(request):
+
+    return request.param['args']
+
+
+@pytest.fixture(scope='function', params=TESTCASES['token_bucket'])
+def token_bucket_params(request):
+
+    kwargs = request.param['kwargs']
+    n = request.param['n']
+    expected = request.param['expected']
+    return kwargs, n, expected
+
+
 @pytest.fixture(scope='function', params=TESTCASES['get_mock'])
 def get_mock_params(request):
 
@@ -155,6 +531,53 @@ def get_mock_params(request):
     return args, rsps, file_names
 
 
+@pytest.fixture(scope='function', params=TESTCASES['get_async'])
+def get_async_params(request):
+
+    args = request.param['args']
+    server = serve_routes({k: list(v) for k, v
+                           in request.param['routes'].items()})
+    base_url = 'http://{}:{}'.format(*server.server_address)
+    expected = request.param['expected']
+    yield args, base_url, expected
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(scope='function', params=TESTCASES['client'])
+def client_params(request):
+
+    args = request.param['args']
+    kwargs = request.param['kwargs']
+    server = serve_routes({k: list(v) for k, v
+                           in request.param['routes'].items()},
+                          keep_alive=True)
+    base_url = 'http://{}:{}'.format(*server.server_address)
+    expected = request.param['expected']
+    yield args, kwargs, base_url, expected
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(scope='function', params=TESTCASES['client_failed'])
+def client_failed_params(request):
+
+    args = request.param['args']
+    server = serve_routes({k: list(v) for k, v
+                           in request.param['routes'].items()})
+    base_url = 'http://{}:{}'.format(*server.server_address)
+    refused = request.param['refused']
+    if refused:
+        # Nothing listens on the closed server's port
+        server.shutdown()
+        server.server_close()
+    expected = request.param['expected']
+    yield args, base_url, expected
+    if not refused:
+        server.shutdown()
+        server.server_close()
+
+
 @pytest.fixture(scope='function', params=TESTCASES['get_live'])
 def get_live_params(request):
 
@@ -214,6 +637,155 @@ def test_get_error(_get_error_params, tmp_data_directory, caplog):
     assert all([str(r['status']) in caplog.text for r in rsps])
 
 
+@responses.activate
+def test_get_resume(_get_resume_params, tmp_data_directory):
+    """Resumes partial downloads and revalidates existing files.
+    """
+
+    existing, rsp, expected = _get_resume_params
+    tmpdir = tmp_data_directory
+    utils.make_path(tmpdir)
+    for filename, content in existing.items():
+        with open(os.path.join(tmpdir, filename), 'w') as f:
+            f.write(content)
+
+    rsps = rsp if isinstance(rsp, list) else [rsp]
+    register_mock_responses(rsps)
+    result = _get([rsps[0]['url'].split('/')[-1]], tmpdir, test_http,
+                  timeout=1, retry=0, resume=True, verify=False)
+
+    files = {}
+    for filename in os.listdir(tmpdir):
+        with open(os.path.join(tmpdir, filename), 'r') as f:
+            files[filename] = f.read()
+    shutil.rmtree(str(tmpdir))
+    assert not result['failed']
+    assert files == expected
+
+
+@responses.activate
+def test_get_checksum(_get_checksum_params, tmp_data_directory):
+    """Saves the checksum of downloaded files in their sidecar files.
+    """
+
+    existing, kwargs, rsp, expected = _get_checksum_params
+    tmpdir = tmp_data_directory
+    utils.make_path(tmpdir)
+    for filename, content in existing.items():
+        with open(os.path.join(tmpdir, filename), 'w') as f:
+            f.write(content)
+
+    responses.add(responses.Response(**rsp))
+    _get([rsp['url'].split('/')[-1]], tmpdir, test_http,
+         timeout=1, retry=0, checksum='sha256', verify=False, **kwargs)
+
+    path = os.path.join(tmpdir, '2019q1_rr1.zip')
+    with open(path, 'r') as f:
+        content = f.read()
+    with open(f'{path}.meta.json', 'r') as f:
+        meta = json.load(f)
+    shutil.rmtree(str(tmpdir))
+    assert content == expected
+    assert meta['sha256'] == hashlib.sha256(expected.encode()).hexdigest()
+
+
+@responses.activate
+def test_get_verify(_get_verify_params, tmp_data_directory):
+    """Saves only verified files and reports failed files.
+    """
+
+    rsp, (status, reason) = _get_verify_params
+    tmpdir = tmp_data_directory
+    utils.make_path(tmpdir)
+
+    responses.add(responses.Response(**rsp))
+    result = _get(['2019q1_rr1.zip'], tmpdir, test_http, timeout=1,
+                  retry=0)
+
+    saved = os.listdir(tmpdir)
+    shutil.rmtree(str(tmpdir))
+    if status == 'downloaded':
+        assert result == {'downloaded': ['2019q1_rr1.zip'],
+                          'not_modified': [], 'failed': {}}
+        assert saved == ['2019q1_rr1.zip']
+    else:
+        assert result['failed']['2019q1_rr1.zip'].startswith(reason)
+        assert not result['downloaded'] and not saved
+
+
+@responses.activate
+def test_get_buffer(_get_buffer_params, tmp_path):
+    """Downloads into memory, spilling large files to temporary files,
+    and reports invalid files.
+    """
+
+    kwargs, rsp, (content, spilled) = _get_buffer_params
+    responses.add(responses.Response(**rsp))
+    buffer, error = _get_buffer('2019q1_rr1.zip', test_http,
+                                spill_dir=str(tmp_path), **kwargs)
+    if content is None:
+        assert buffer is None and error.startswith('invalid zipfile')
+        return
+    with buffer:
+        assert error is None
+        assert buffer._rolled == spilled
+        assert buffer.read() == content
+
+
+def test_adaptive_chunk_size(adaptive_chunk_size_params):
+    """Reads large files in larger chunks, up to a maximum.
+    """
+
+    args, expected = adaptive_chunk_size_params
+    assert _adaptive_chunk_size(*args) == expected
+
+
+def test_retry_strategy_limiter():
+    """Each retry consumes a token of the rate limiter.
+    """
+
+    class CountingBucket(_TokenBucket):
+        acquired = 0
+
+        def acquire(self):
+            self.acquired += 1
+            super().acquire()
+
+    limiter = CountingBucket(rate=1000)
+    retries = _retry_strategy(2, 0, limiter)
+    for n in range(1, 3):
+        retries = retries.increment(method='GET', url='/')
+        retries.sleep()
+        assert limiter.acquired == n
+
+
+def test_backoff_time(backoff_time_params):
+    """The async engine backs off between retries as urllib3's Retry
+    (used by the sync engine) does.
+    """
+
+    delay, retries = backoff_time_params
+    expected = Retry(total=retries, backoff_factor=delay)
+    for _ in range(retries):
+        expected = expected.increment(method='GET', url='/')
+    assert _backoff_time(delay, retries) == expected.get_backoff_time()
+    assert _backoff_time(delay, retries, '3') == 3
+
+
+def test_token_bucket(token_bucket_params):
+    """Acquiring more tokens than the bucket's capacity blocks
+    until tokens are refilled at the given rate.
+    """
+
+    kwargs, n, expected = token_bucket_params
+    limiter = _TokenBucket(**kwargs)
+    start = time.monotonic()
+    for _ in range(n):
+        limiter.acquire()
+    elapsed = time.monotonic() - start
+    assert expected * 0.9 <= elapsed < expected + 0.1
+
+
 @responses.activate
 def test_get_mock(get_mock_params, tmp_data_directory):
     """(Mock test) Downloads and saves every relevant DERA
@@ -236,6 +808,105 @@ def test_get_mock(get_mock_params, tmp_data_directory):
     assert all(saved)
 
 
+def test_get_async(get_async_params, tmp_data_directory):
+    """(Local server test) Concurrently downloads, verifies and saves
+    every relevant DERA dataset, retrying on 5xx responses.
+    """
+
+    pytest.importorskip('aiohttp')
+    (dataset, *args), base_url, (expected, failed) = get_async_params
+    tmpdir = tmp_data_directory
+    utils.make_path(tmpdir)
+
+    result = asyncio.run(get_DERA_async(dataset, tmpdir, *args, retry=2,
+                                        delay=0, timeout=5,
+                                        base_url=base_url))
+
+    files = {}
+    for filename in os.listdir(tmpdir):
+        with open(os.path.join(tmpdir, filename), 'rb') as f:
+            files[filename] = f.read()
+    shutil.rmtree(str(tmpdir))
+    assert files == expected
+    assert result['downloaded'] == sorted(expected)
+    assert sorted(result['failed']) == failed
+
+
+def test_client(client_params, tmp_data_directory):
+    """(Local server test) Downloads datasets through connection pools
+    kept alive across datasets and calls.
+    """
+
+    (dataset, *args), kwargs, base_url, n_files = client_params
+    tmpdir = tmp_data_directory
+    utils.make_path(tmpdir)
+
+    with DERAClient(**kwargs, rate_limit=100, delay=0,
+                    base_url=base_url) as client:
+        client.get(dataset, tmpdir, *args)
+        client.get(dataset, tmpdir, *args)  # Reuses connections
+        stats = client.stats()
+
+    saved = os.listdir(tmpdir)
+    shutil.rmtree(str(tmpdir))
+    assert len(saved) == n_files
+    (host, host_stats), = stats.items()
+    assert host == base_url
+    assert host_stats['connections'] <= kwargs['workers']
+    assert host_stats['requests'] >= 2 * n_files
+    # The server keeps connections alive, so most requests reuse one
+    assert host_stats['connections'] < host_stats['requests']
+    assert host_stats['reused'] > 0
+
+
+def test_client_verify(tmp_path):
+    """(Local server test) Passes checksum and verify through to the
+    downloads, as get_DERA does.
+    """
+
+    server = serve_routes({
+        f'{ASYNC_RISK_PATH}/2020q2_rr1.zip': [(200, VALID_ZIP)],
+        f'{ASYNC_RISK_PATH}/2020q3_rr1.zip': [(200, b'<html>')],
+    })
+    base_url = 'http://{}:{}'.format(*server.server_address)
+    args = ('risk', '13-03-2020', '13-08-2020')
+    for d in ['a', 'b']:
+        utils.make_path(str(tmp_path / d))
+    try:
+        with DERAClient(rate_limit=100, delay=0, base_url=base_url) as client:
+            result = client.get(args[0], str(tmp_path / 'a'), *args[1:],
+                                checksum='sha256')
+            assert list(result['failed']) == ['2020q3_rr1.zip']
+            with open(tmp_path / 'a' / '2020q2_rr1.zip.meta.json') as f:
+                assert json.load(f)['sha256'] == \
+                    hashlib.sha256(VALID_ZIP).hexdigest()
+            result = client.get(args[0], str(tmp_path / 'b'), *args[1:],
+                                verify=False)
+            assert result['failed'] == {}
+    finally:
+        server.shutdown()
+
+
+def test_client_failed(client_failed_params, tmp_data_directory):
+    """(Local server test) Reports files failing after retries (or
+    whose connection is refused) without aborting other downloads.
+    """
+
+    (dataset, *args), base_url, (downloaded, failed) = client_failed_params
+    tmpdir = tmp_data_directory
+    utils.make_path(tmpdir)
+
+    with DERAClient(workers=2, rate_limit=100, retry=1, delay=0,
+                    base_url=base_url) as client:
+        result = client.get(dataset, tmpdir, *args)
+
+    saved = os.listdir(tmpdir)
+    shutil.rmtree(str(tmpdir))
+    assert result['downloaded'] == downloaded
+    assert sorted(result['failed']) == failed
+    assert sorted(saved) == downloaded
+
+
 @pytest.mark.webtest
 def test_get_live(get_live_params, tmp_data_directory):
     """(Live test) Downloads and saves every relevant DERA dataset
@@ -0,0 +1,133 @@
+import io
+import os
+import shutil
+import pytest
+
+from zipfile import ZipFile
+from pandas.testing import assert_frame_equal
+
+from getdera.company import CompanyIndex
+from getdera.company import read_ranges
+from getdera.dera import process
+
+
+# TESTCASES
+
+APPLE = 320193
+MICROSOFT = 789019
+
+TESTCASES = {
+    'process_cik': [
+        {'args': ('num', [APPLE]), 'expected': 4},
+        {'args': ('num', [MICROSOFT]), 'expected': 1},
+        {'args': ('txt', [APPLE, MICROSOFT]), 'expected': 3},
+        {'args': ('sub', [MICROSOFT]), 'expected': 1},
+        {'args': ('pre', [APPLE]), 'expected': 3},
+        {'args': ('ren', [1]), 'expected': 0},
+    ],
+}
+
+
+# FIXTURES
+
+@pytest.fixture(scope='function')
+def company_data_directory(dera_data_directory, tmp_path):
+    """Copies the synthetic DERA zipfiles into a fresh directory
+    (so that tests can modify them) and returns its path.
+    """
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'data')
+    shutil.copytree(dera_data_directory, path)
+    return path
+
+
+@pytest.fixture(scope='function', params=TESTCASES['process_cik'])
+def process_cik_params(request, company_data_directory):
+    args = (company_data_directory, 'statements', request.param['args'][0],
+            '13-03-2020', '13-08-2020')
+    cik = request.param['args'][1]
+    expected = request.param['expected']
+    return args, cik, expected
+
+
+# UNIT TESTS
+
+def test_process_cik(process_cik_params):
+    """Reads only rows of companies' filings, as filtering the full
+    tables by adsh does.
+    """
+    args, cik, n_rows = process_cik_params
+    sub = process(*args[:2], 'sub', *args[3:])
+    adsh = sub.index[sub['cik'].isin(cik)].to_list()
+    result = process(*args, cik=cik)
+    expected = process(*args, filters={'adsh': adsh})
+    assert len(result) == n_rows
+    # Dtypes of columns without rows are not inferred
+    assert_frame_equal(result, expected, check_categorical=False,
+                       check_index_type=False, check_dtype=n_rows > 0)
+
+
+def test_process_cik_tables(company_data_directory):
+    """Reads rows of companies' filings from multiple tables.
+    """
+    args = (company_data_directory, 'statements', ['sub', 'num'],
+            '13-03-2020', '13-08-2020')
+    result = process(*args, cik=[MICROSOFT], columns={'num': ['value']})
+    assert result['sub']['name'].to_list() == ['MICROSOFT CORP']
+    assert result['num']['value'].to_list() == [285449000000.0]
+
+
+def test_company_index(company_data_directory, tmp_path):
+    """Saves the index in its directory and rebuilds it when the
+    zipfile changes.
+    """
+    zipfile = os.path.join(company_data_directory, '2019q3_rr1.zip')
+    args = (str(tmp_path / 'index'), 'risk')
+    index = CompanyIndex(*args, tables=['sub', 'txt'])
+    adsh = '0000000001-01-000003'
+    ranges = index.ranges(zipfile, 'txt', adsh=[adsh])
+    assert sorted(os.listdir(index.path)) == ['2019q3_rr1.json',
+                                              '2019q3_rr1.parquet']
+    assert CompanyIndex(*args, tables=['sub', 'txt'])\
+        .ranges(zipfile, 'txt', adsh=[adsh]) == ranges
+    with ZipFile(zipfile, 'r') as zipObj, zipObj.open('txt.tsv') as f:
+        rows = read_ranges(f, ranges).read().decode().splitlines()
+    assert rows[1:] == [f'{adsh}\tipsum2019q3']
+
+    with ZipFile(zipfile, 'w') as zipObj:
+        zipObj.writestr('sub.tsv', f'adsh\tcik\n{adsh}\t1\n')
+        zipObj.writestr('txt.tsv', 'adsh\tdummy_val\n'
+                                   f'{adsh}\tchanged\n{adsh}\tchanged\n')
+    index = CompanyIndex(*args, tables=['sub', 'txt'])
+    with ZipFile(zipfile, 'r') as zipObj, zipObj.open('txt.tsv') as f:
+        rows = read_ranges(f, index.ranges(zipfile, 'txt', cik=[1]))
+        assert rows.read().decode().splitlines()[1:] == \
+            [f'{adsh}\tchanged'] * 2
+    with pytest.raises(ValueError):
+        index.ranges(zipfile, 'tag')
+
+
+def test_company_index_multiline(company_data_directory, tmp_path):
+    """Raises if a row spans several lines, and indexes zipfiles
+    without a SUB table (with unknown CIKs).
+    """
+    zipfile = os.path.join(company_data_directory, '2019q3_rr1.zip')
+    adsh = '0000000001-01-000003'
+    with ZipFile(zipfile, 'w') as zipObj:
+        zipObj.writestr('txt.tsv', 'adsh\tdummy_val\n'
+                                   f'{adsh}\tone\n{adsh}\t"two\nlines"\n')
+    index = CompanyIndex(str(tmp_path / 'index'), 'risk', tables=['txt'])
+    with pytest.raises(ValueError, match='several lines'):
+        index.build(zipfile)
+
+    with ZipFile(zipfile, 'w') as zipObj:
+        zipObj.writestr('txt.tsv', f'adsh\tdummy_val\n{adsh}\tone\n')
+    assert index.build(zipfile)['cik'].to_list() == [-1]
+
+
+def test_read_ranges():
+    """Reads the header line and byte ranges of a stream.
+    """
+    f = io.BytesIO(b'h\na\nb\nc\nd\n')
+    result = read_ranges(f, [(2, 4), (6, 10)])
+    assert result.read() == b'h\na\nc\nd\n'
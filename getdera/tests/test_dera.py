@@ -1,11 +1,19 @@
+import shutil
 import pytest
 
+from zipfile import ZipFile
+from zipfile import ZIP_DEFLATED
+
 import pandas as pd
 
 from getdera import utils
+from getdera.utils import decode_adsh
 
 from pandas.testing import assert_frame_equal
 from getdera.dera import process
+from getdera.dera import process_iter
+from getdera.dera import join
+from getdera.dera import semi_join
 
 
 # TESTCASES
@@ -74,6 +82,149 @@ TESTCASES = {
              'dummy_val': ['lorem2020q1', None, 'ipsum2020q1',
                            'lorem2019q4', None, 'ipsum2019q4']})}
     ],
+    'process_stream': [
+        {'args': ('risk', 'txt', '13-06-2019', '13-12-2019'),
+         'kwargs': {'stream': True}},
+        {'args': ('risk', 'sub', '13-06-2019', '13-03-2020'),
+         'kwargs': {'stream': True}},
+        {'args': ('risk', 'tag', '13-06-2019', '13-03-2020'),
+         'kwargs': {'stream': True}},
+        {'args': ('risk', 'txt', '13-06-2019', '13-03-2020'),
+         'kwargs': {'workers': 2}},
+        {'args': ('risk', 'sub', '13-06-2019', '13-03-2020'),
+         'kwargs': {'workers': 2}},
+        {'args': ('risk', 'tag', '13-06-2019', '13-03-2020'),
+         'kwargs': {'workers': 3}},
+        {'args': ('risk', 'txt', '13-06-2019', '13-03-2020'),
+         'kwargs': {'threads': 3}},
+        {'args': ('statements', 'num', '13-03-2020', '13-08-2020'),
+         'kwargs': {'workers': 2}},
+    ],
+    'process_pushdown': [
+        {'args': ('risk', 'sub', '13-06-2019', '13-03-2020'),
+         'kwargs': {'columns': [],
+                    'filters': {'dummy_val': ['lorem2019q3', 'dolor2020q1']}},
+         'expected': pd.DataFrame(
+             index=pd.Index(['0000000001-01-000001',
+                             '0000000001-01-000003'], name='adsh'))},
+        {'args': ('risk', 'txt', '13-06-2019', '13-12-2019'),
+         'kwargs': {'columns': ['dummy_val'],
+                    'filters': {'adsh': '0000000001-01-000003'}},
+         'expected': pd.DataFrame({'dummy_val': ['ipsum2019q3',
+                                                 'ipsum2019q4']})},
+        {'args': ('risk', 'tag', '13-06-2019', '13-03-2020'),
+         'kwargs': {'filters': {'version': 'dei/2014'}},
+         'expected': pd.DataFrame({
+             'tag': ['AmendmentFlag'],
+             'version': ['dei/2014'],
+             'dummy_value': ['dolor2019q4']}).set_index(['tag', 'version'])},
+    ],
+    'process_schema': [
+        {'args': ('statements', 'sub', '13-03-2020', '13-08-2020'),
+         'kwargs': {},
+         'expected': {'cik': 'Int64', 'sic': 'Int16', 'form': 'category',
+                      'wksi': 'boolean', 'period': 'datetime64',
+                      'accepted': 'datetime64', 'fy': 'Int16'}},
+        {'args': ('statements', 'sub', '13-03-2020', '13-08-2020'),
+         'kwargs': {'dtype': {'form': str, 'period': 'Int32'}},
+         'expected': {'form': 'str', 'period': 'Int32'}},
+        {'args': ('statements', 'txt', '13-03-2020', '13-08-2020'),
+         'kwargs': {'stream': True},
+         'expected': {'version': 'category', 'escaped': 'boolean',
+                      'qtrs': 'int32', 'durp': 'float32',
+                      'ddate': 'datetime64'}},
+        {'args': ('statements', 'num', '13-03-2020', '13-08-2020'),
+         'kwargs': {},
+         'expected': {'adsh': 'category', 'tag': 'category',
+                      'version': 'category', 'uom': 'category',
+                      'coreg': 'category', 'value': 'float64',
+                      'qtrs': 'int32', 'ddate': 'datetime64'}},
+        {'args': ('statements', 'sub', '13-03-2020', '13-08-2020'),
+         'kwargs': {'schema': False},
+         'expected': {'cik': 'int64', 'form': 'str', 'period': 'int64'}},
+    ],
+    'process_dates': [
+        {'kwargs': {}},
+        {'kwargs': {'stream': True}},
+        {'kwargs': {'workers': 2}},
+    ],
+    'process_iter': [
+        {'args': ('risk', 'txt', '13-06-2019', '13-03-2020'),
+         'kwargs': {},
+         'expected': 3},
+        {'args': ('risk', 'txt', '13-06-2019', '13-03-2020'),
+         'kwargs': {'chunksize': 2},
+         'expected': 6},
+        {'args': ('risk', 'sub', '13-06-2019', '13-03-2020'),
+         'kwargs': {'chunksize': 1, 'dtype': {'dummy_val': str}},
+         'expected': 9},
+        {'args': ('risk', 'tag', '13-06-2019', '13-03-2020'),
+         'kwargs': {'chunksize': 1},
+         'expected': 5},
+    ],
+    'process_tables': [
+        {'args': ('statements', ['sub', 'num', 'pre', 'cal', 'dim', 'ren'],
+                  '13-03-2020', '13-08-2020'),
+         'kwargs': {}},
+        {'args': ('statements', ['pre', 'ren'], '13-03-2020', '13-08-2020'),
+         'kwargs': {'workers': 2}},
+        {'args': ('statements', ['sub', 'num', 'txt'], '13-03-2020',
+                  '13-08-2020'),
+         'kwargs': {'threads': 3}},
+        {'args': ('risk', ['sub', 'tag', 'txt'], '13-06-2019', '13-03-2020'),
+         'kwargs': {'columns': {'txt': ['dummy_val']},
+                    'filters': {'sub': {'dummy_val': 'lorem2019q3'}}}},
+    ],
+    'process_engine': [
+        {'args': ('risk', 'txt', '13-06-2019', '13-03-2020'),
+         'kwargs': {}},
+        {'args': ('risk', 'sub', '13-06-2019', '13-03-2020'),
+         'kwargs': {'stream': True}},
+        {'args': ('risk', 'tag', '13-06-2019', '13-03-2020'),
+         'kwargs': {'filters': {'version': 'dei/2014'}}},
+        {'args': ('risk', 'txt', '13-06-2019', '13-12-2019'),
+         'kwargs': {'columns': ['dummy_val'],
+                    'filters': {'adsh': '0000000001-01-000003'}}},
+        {'args': ('statements', 'num', '13-03-2020', '13-08-2020'),
+         'kwargs': {'workers': 2}},
+        {'args': ('statements', 'sub', '13-03-2020', '13-08-2020'),
+         'kwargs': {'dtype': {'form': str, 'period': 'Int32'}}},
+        {'args': ('statements', 'txt', '13-03-2020', '13-08-2020'),
+         'kwargs': {'schema': False}},
+        {'args': ('statements', 'dim', '13-03-2020', '13-08-2020'),
+         'kwargs': {'schema': False}},
+        {'args': ('statements', 'num', '13-03-2020', '13-08-2020'),
+         'kwargs': {'cik': [320193]}},
+        {'args': ('statements', ['sub', 'num', 'pre', 'cal', 'dim', 'ren'],
+                  '13-03-2020', '13-08-2020'),
+         'kwargs': {'threads': 3}},
+    ],
+    'join': [
+        {'args': ('sub', 'adsh'),
+         'kwargs': {'columns': ['name', 'form']}},
+        {'args': ('sub', 'adsh'),
+         'kwargs': {'columns': ['cik'], 'how': 'inner'}},
+        {'args': ('tag', ['tag', 'version']),
+         'kwargs': {'columns': ['tlabel', 'crdr']}},
+        {'args': ('tag', ['tag', 'version']),
+         'kwargs': {'columns': ['datatype'], 'how': 'inner'}},
+    ],
+    'process_index': [
+        {'args': ('pre', '13-03-2020', '13-08-2020'),
+         'expected': (['adsh', 'report', 'line'], 4)},
+        {'args': ('cal', '13-03-2020', '13-08-2020'),
+         'expected': (['adsh', 'grp', 'arc'], 2)},
+        {'args': ('dim', '13-03-2020', '13-08-2020'),
+         'expected': (['dimhash'], 1)},
+        {'args': ('ren', '13-03-2020', '13-08-2020'),
+         'expected': (['adsh', 'report'], 3)},
+    ],
+    'process_num_coreg': [
+        {'kwargs': {}},
+        {'kwargs': {'engine': 'pyarrow'}},
+        {'kwargs': {'stream': True}},
+        {'kwargs': {'workers': 2}},
+    ],
 }
 
 # FIXTURES
@@ -99,6 +250,102 @@ def process_params(request, tmp_data_directory):
     return args, expected
 
 
+@pytest.fixture(scope='function', params=TESTCASES['process_stream'])
+def process_stream_params(request, dera_data_directory):
+    args = (dera_data_directory, *request.param['args'])
+    kwargs = request.param['kwargs']
+    return args, kwargs
+
+
+@pytest.fixture(scope='function', params=TESTCASES['process_pushdown'])
+def process_pushdown_params(request, dera_data_directory):
+    args = (dera_data_directory, *request.param['args'])
+    kwargs = request.param['kwargs']
+    expected = request.param['expected']
+    return args, kwargs, expected
+
+
+@pytest.fixture(scope='function', params=TESTCASES['process_schema'])
+def process_schema_params(request, dera_data_directory):
+    args = (dera_data_directory, *request.param['args'])
+    kwargs = request.param['kwargs']
+    expected = request.param['expected']
+    return args, kwargs, expected
+
+
+@pytest.fixture(scope='function', params=TESTCASES['process_dates'])
+def process_dates_params(request, dera_data_directory):
+    args = (dera_data_directory, 'statements', 'sub', '13-03-2020',
+            '13-08-2020')
+    kwargs = request.param['kwargs']
+    return args, kwargs
+
+
+@pytest.fixture(scope='function', params=TESTCASES['process_iter'])
+def process_iter_params(request, dera_data_directory):
+    args = (dera_data_directory, *request.param['args'])
+    kwargs = request.param['kwargs']
+    expected = request.param['expected']
+    return args, kwargs, expected
+
+
+@pytest.fixture(scope='function', params=TESTCASES['process_tables'])
+def process_tables_params(request, dera_data_directory):
+    args = (dera_data_directory, *request.param['args'])
+    kwargs = request.param['kwargs']
+    return args, kwargs
+
+
+@pytest.fixture(scope='function', params=TESTCASES['process_index'])
+def process_index_params(request, dera_data_directory):
+    args = (dera_data_directory, 'statements', *request.param['args'])
+    expected = request.param['expected']
+    return args, expected
+
+
+@pytest.fixture(scope='function', params=TESTCASES['process_engine'])
+def process_engine_params(request, dera_data_directory, tmp_path):
+    # cik lookups write company index files in the data directory
+    path = str(tmp_path / 'data')
+    shutil.copytree(dera_data_directory, path)
+    args = (path, *request.param['args'])
+    kwargs = request.param['kwargs']
+    return args, kwargs
+
+
+@pytest.fixture(scope='function', params=TESTCASES['join'])
+def join_params(request, dera_data_directory):
+    args = (dera_data_directory, 'statements')
+    dates = ('13-03-2020', '13-08-2020')
+    num = process(*args, 'num', *dates)
+    other = process(*args, request.param['args'][0], *dates)
+    on = request.param['args'][1]
+    kwargs = request.param['kwargs']
+    return num, other, on, kwargs
+
+
+@pytest.fixture(scope='function', params=TESTCASES['process_num_coreg'])
+def process_num_coreg_params(request, dera_data_directory, tmp_path):
+    """Copies the synthetic zipfiles, giving a coreg value to the first
+    NUM row of 2020q3 only (coreg is empty for the whole of 2020q2).
+    """
+    if request.param['kwargs'].get('engine') == 'pyarrow':
+        pytest.importorskip('pyarrow')
+    path = tmp_path / 'data'
+    shutil.copytree(dera_data_directory, path)
+    zipfile = path / '2020q3_notes.zip'
+    with ZipFile(zipfile, 'r') as zipObj:
+        tables = {f: zipObj.read(f).decode() for f in zipObj.namelist()}
+    header, first, *rows = tables['num.tsv'].splitlines(keepends=True)
+    fields = first.rstrip('\n').split('\t')
+    fields[header.rstrip('\n').split('\t').index('coreg')] = 'Segment'
+    tables['num.tsv'] = ''.join([header, '\t'.join(fields) + '\n', *rows])
+    with ZipFile(zipfile, 'w', ZIP_DEFLATED) as zipObj:
+        for filename, content in tables.items():
+            zipObj.writestr(filename, content)
+    return str(path), request.param['kwargs']
+
+
 # UNIT TESTS
 
 def test_process_tag(process_tag_params):
@@ -119,3 +366,190 @@ def test_process(process_params):
     expected = process_params[1].sort_values('dummy_val')\
                                 .reset_index(drop=True)
     assert_frame_equal(result, expected)
+
+
+def test_process_stream(process_stream_params):
+    """Parsing tables directly from zipfile members, serially or in a
+    process pool, or extracting them on threads, returns the same data
+    as parsing tables extracted serially into a temporary directory.
+    """
+    args, kwargs = process_stream_params
+    result = process(*args, **kwargs)
+    expected = process(*args)
+    assert_frame_equal(result, expected)
+
+
+def test_process_pushdown(process_pushdown_params):
+    """Parses only selected columns and rows matching filters.
+    """
+    args, kwargs, expected = process_pushdown_params
+    result = process(*args, **kwargs)
+    streamed = process(*args, stream=True, **kwargs)
+    assert_frame_equal(result, expected,
+                       check_index_type=False, check_column_type=False)
+    assert_frame_equal(streamed, expected,
+                       check_index_type=False, check_column_type=False)
+
+
+def test_process_schema(process_schema_params):
+    """Parses columns with the table's compact schema by default,
+    overridden by dtype.
+    """
+    args, kwargs, expected = process_schema_params
+    result = process(*args, **kwargs)
+    for col, t in expected.items():
+        assert str(result[col].dtype).startswith(t)
+
+
+def test_process_dates(process_dates_params):
+    """Parses empty date cells as NaT.
+    """
+    args, kwargs = process_dates_params
+    result = process(*args, **kwargs)
+    assert result['changed'].isna().to_list() == [True, False, True]
+    assert result.loc['0000789019-20-000062', 'changed'] == \
+        pd.Timestamp('1999-07-01')
+    assert result['period'].notna().all()
+
+
+def test_process_iter(process_iter_params):
+    """Yields chunks per period (or per chunksize rows) that
+    concatenate to the output of process.
+    """
+    args, kwargs, n_chunks = process_iter_params
+    chunks = list(process_iter(*args, **kwargs))
+    kwargs.pop('chunksize', None)
+    expected = process(*args, **kwargs)
+    result = pd.concat(chunks, axis=0)
+    if args[2] == 'txt':
+        result = result.reset_index(drop=True)
+    assert len(chunks) == n_chunks
+    assert_frame_equal(result, expected)
+
+
+def test_process_num(dera_data_directory):
+    """Concatenates NUM tables with parsed values and dates.
+    """
+    result = process(dera_data_directory, 'statements', 'num',
+                     '13-03-2020', '13-08-2020')
+    assert result['value'].to_list() == [320400000000.0, 58313000000.0,
+                                         285449000000.0, 317344000000.0,
+                                         59685000000.0]
+    assert result['ddate'].dt.strftime('%Y%m%d').to_list() == \
+        ['20200331'] * 3 + ['20200630'] * 2
+    assert sorted(result['adsh'].cat.categories) == \
+        ['0000320193-20-000052', '0000320193-20-000062',
+         '0000789019-20-000062']
+
+
+def test_process_num_coreg(process_num_coreg_params):
+    """Keeps a schema categorical column categorical when it has no
+    values at all in one period.
+    """
+    path, kwargs = process_num_coreg_params
+    result = process(path, 'statements', 'num', '13-03-2020', '13-08-2020',
+                     **kwargs)
+    assert isinstance(result['coreg'].dtype, pd.CategoricalDtype)
+    assert result['coreg'].astype(object).fillna('').to_list() == \
+        ['', '', '', 'Segment', '']
+
+
+def test_process_tables(process_tables_params):
+    """Processing a list of tables in a single pass over each zipfile
+    returns the same tables as processing each table separately.
+    """
+    args, kwargs = process_tables_params
+    dir, dataset, tables, start_date, end_date = args
+    result = process(*args, **kwargs)
+    assert list(result) == tables
+    for table in tables:
+        expected = process(
+            dir, dataset, table, start_date, end_date,
+            columns=kwargs.get('columns', {}).get(table),
+            filters=kwargs.get('filters', {}).get(table))
+        assert_frame_equal(result[table], expected)
+
+
+def test_process_index(process_index_params):
+    """Indexes PRE, CAL, DIM and REN tables by their natural keys.
+    Removes duplicate dimensions.
+    """
+    args, (index, n_rows) = process_index_params
+    result = process(*args)
+    assert list(result.index.names) == index
+    assert len(result) == n_rows
+    assert result.index.is_unique
+
+
+def test_process_encode_adsh(dera_data_directory):
+    """Encodes accession numbers as int64 index and join keys.
+    """
+    args = (dera_data_directory, 'statements')
+    dates = ('13-03-2020', '13-08-2020')
+    sub = process(*args, 'sub', *dates, encode_adsh=True)
+    num = process(*args, 'num', *dates, encode_adsh=True)
+    expected = process(*args, 'sub', *dates)
+    assert sub.index.dtype == 'int64' and num['adsh'].dtype == 'int64'
+    assert decode_adsh(sub.index).tolist() == expected.index.to_list()
+    result = num.join(sub[['name']], on='adsh')
+    assert result['name'].to_list() == ['APPLE INC'] * 2 + \
+        ['MICROSOFT CORP'] + ['APPLE INC'] * 2
+
+
+def test_process_engine(process_engine_params):
+    """Parsing tables with pyarrow's CSV reader returns the same data
+    as parsing them with pandas.
+    """
+    pytest.importorskip('pyarrow')
+    args, kwargs = process_engine_params
+    result = process(*args, engine='pyarrow', **kwargs)
+    expected = process(*args, **kwargs)
+    if isinstance(expected, dict):
+        assert result.keys() == expected.keys()
+        for table in expected:
+            assert_frame_equal(result[table], expected[table])
+    else:
+        assert_frame_equal(result, expected)
+
+
+def test_process_engine_unsupported(dera_data_directory):
+    """Raises on an unsupported engine.
+    """
+    with pytest.raises(ValueError):
+        process(dera_data_directory, 'risk', 'txt', '13-06-2019',
+                '13-03-2020', engine='python')
+
+
+def test_join(join_params):
+    """Joins columns of an indexed table to rows of a fact table, as
+    pandas merge does.
+    """
+    num, other, on, kwargs = join_params
+    result = join(num, other, on, **kwargs)
+    expected = num.merge(other[kwargs['columns']], how='left',
+                         left_on=on, right_index=True)
+    if kwargs.get('how') == 'inner':
+        expected = expected.dropna(subset=kwargs['columns'], how='all')
+    assert result.index.to_list() == expected.index.to_list()
+    for column in kwargs['columns']:
+        assert result[column].astype(object).fillna('').to_list() == \
+            expected[column].astype(object).fillna('').to_list()
+
+
+def test_join_missing(dera_data_directory):
+    """Rows without a matching key are kept (with missing values) by a
+    left join and dropped by an inner join or semi-join.
+    """
+    args = (dera_data_directory, 'statements')
+    num = process(*args, 'num', '13-03-2020', '13-08-2020')
+    sub = process(*args, 'sub', '13-03-2020', '13-08-2020')
+    sub = sub[sub['name'] == 'MICROSOFT CORP']
+    left = join(num, sub, 'adsh', columns=['name'])
+    inner = join(num, sub, 'adsh', columns=['name'], how='inner')
+    assert left['name'].isna().sum() == 4
+    assert inner['name'].to_list() == ['MICROSOFT CORP']
+    assert_frame_equal(semi_join(num, sub, 'adsh'), num.iloc[[2]])
+    with pytest.raises(ValueError):
+        join(num, sub, 'adsh', columns=['name'], how='outer')
+    with pytest.raises(ValueError):
+        join(num, num.set_index('adsh'), 'adsh', columns=['value'])
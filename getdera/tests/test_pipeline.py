@@ -0,0 +1,165 @@
+import os
+import shutil
+import threading
+import pytest
+import responses
+
+from pandas.testing import assert_frame_equal
+
+from getdera.dera import process
+from getdera.pipeline import get_and_process
+from getdera.tests.test_client import ASYNC_RISK_PATH
+from getdera.tests.test_client import serve_routes
+
+
+# TESTCASES
+
+RISK_URL = 'https://www.sec.gov/files/dera/data/mutual-fund-prospectus-risk/return-summary-data-sets'
+DATE_RANGE = ('13-06-2019', '13-03-2020')
+ZIPFILES = ['2019q3_rr1.zip', '2019q4_rr1.zip', '2020q1_rr1.zip']
+
+TESTCASES = {
+    'get_and_process': [
+        {'args': ('txt',), 'kwargs': {}},
+        {'args': ('tag',), 'kwargs': {'workers': 2, 'queue_size': 1}},
+        {'args': ('sub',), 'kwargs': {'columns': ['dummy_val']}},
+        {'args': (['sub', 'tag'],),
+         'kwargs': {'columns': {'sub': ['dummy_val']}}},
+    ],
+}
+
+
+# FIXTURES
+
+def register_zipfiles(rsps, directory, status=200, forbidden=()):
+    """Registers mock responses serving the synthetic zipfiles of the
+    risk dataset (with a 403 for zipfiles in forbidden).
+    """
+    for zipfile in ZIPFILES:
+        with open(os.path.join(directory, zipfile), 'rb') as f:
+            body = f.read()
+        rsps.add(responses.GET, f'{RISK_URL}/{zipfile}', body=body,
+                 status=403 if zipfile in forbidden else status)
+
+
+@pytest.fixture(scope='function', params=TESTCASES['get_and_process'])
+def get_and_process_params(request):
+    return request.param['args'], request.param['kwargs']
+
+
+# UNIT TESTS
+
+@responses.activate
+def test_get_and_process(get_and_process_params, dera_data_directory,
+                         tmp_path):
+    """(Mock test) Downloads and processes zipfiles, as processing the
+    downloaded zipfiles does.
+    """
+    args, kwargs = get_and_process_params
+    register_zipfiles(responses, dera_data_directory)
+    columns = kwargs.pop('columns', None)
+    result = get_and_process('risk', str(tmp_path), *args, *DATE_RANGE,
+                             columns=columns, rate_limit=100, **kwargs)
+    expected = process(dera_data_directory, 'risk', *args, *DATE_RANGE,
+                       columns=columns)
+    assert sorted(os.listdir(tmp_path)) == ZIPFILES
+    if isinstance(expected, dict):
+        assert result.keys() == expected.keys()
+        for table in expected:
+            assert_frame_equal(result[table], expected[table])
+    else:
+        assert_frame_equal(result, expected)
+
+
+@responses.activate
+def test_get_and_process_not_found(dera_data_directory, tmp_path):
+    """(Mock test) Raises if no zipfiles were downloaded.
+    """
+    register_zipfiles(responses, dera_data_directory, status=404)
+    with pytest.raises(FileNotFoundError):
+        get_and_process('risk', str(tmp_path), 'txt', *DATE_RANGE,
+                        retry=0, rate_limit=100)
+
+
+@responses.activate
+def test_get_and_process_in_memory(dera_data_directory, tmp_path):
+    """(Mock test) Processes zipfiles downloaded into memory, and
+    spills zipfiles larger than spill_size to temporary files.
+    """
+    register_zipfiles(responses, dera_data_directory)
+    expected = process(dera_data_directory, 'risk', 'txt', *DATE_RANGE)
+    result = get_and_process('risk', None, 'txt', *DATE_RANGE,
+                             rate_limit=100)
+    assert_frame_equal(result, expected)
+
+    result = get_and_process('risk', None, 'txt', *DATE_RANGE,
+                             rate_limit=100, spill_size=1,
+                             spill_dir=str(tmp_path))
+    assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize('in_memory', [False, True])
+@responses.activate
+def test_get_and_process_failed(dera_data_directory, tmp_path, in_memory):
+    """(Mock test) Returns the processed tables of the other zipfiles,
+    warning about the zipfiles that failed to download or returning
+    them.
+    """
+    register_zipfiles(responses, dera_data_directory,
+                      forbidden=['2019q4_rr1.zip'])
+    dir = None if in_memory else str(tmp_path / 'data')
+    with pytest.warns(UserWarning, match='2019q4_rr1.zip'):
+        warned = get_and_process('risk', dir, 'txt', *DATE_RANGE, retry=0,
+                                 rate_limit=100)
+
+    result, failed = get_and_process('risk', dir, 'txt', *DATE_RANGE,
+                                     retry=0, rate_limit=100,
+                                     return_failed=True)
+    assert list(failed) == ['2019q4_rr1.zip']
+    assert '403' in failed['2019q4_rr1.zip']
+    downloaded = tmp_path / 'downloaded'
+    downloaded.mkdir()
+    for zipfile in ['2019q3_rr1.zip', '2020q1_rr1.zip']:
+        shutil.copy(os.path.join(dera_data_directory, zipfile), downloaded)
+    expected = process(str(downloaded), 'risk', 'txt', *DATE_RANGE)
+    assert_frame_equal(result, expected)
+    assert_frame_equal(warned, expected)
+
+
+@pytest.mark.parametrize('in_memory', [False, True])
+def test_get_and_process_http(dera_data_directory, tmp_path, in_memory):
+    """(Local server test) Retries requests to an http:// base_url.
+    """
+    routes = {}
+    for zipfile in ZIPFILES:
+        with open(os.path.join(dera_data_directory, zipfile), 'rb') as f:
+            routes[f'{ASYNC_RISK_PATH}/{zipfile}'] = [(503, b''), (200, f.read())]
+    server = serve_routes(routes)
+    base_url = 'http://{}:{}'.format(*server.server_address)
+    dir = None if in_memory else str(tmp_path / 'data')
+    try:
+        result = get_and_process('risk', dir, 'txt', *DATE_RANGE, retry=1,
+                                 delay=0, rate_limit=100, base_url=base_url)
+    finally:
+        server.shutdown()
+    expected = process(dera_data_directory, 'risk', 'txt', *DATE_RANGE)
+    assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize('in_memory', [False, True])
+@responses.activate
+def test_get_and_process_error(dera_data_directory, tmp_path, monkeypatch,
+                               in_memory):
+    """(Mock test) Stops downloading when processing a zipfile raises.
+    """
+    def _read_period(zipfile, options):
+        raise ValueError('unparseable')
+
+    register_zipfiles(responses, dera_data_directory)
+    monkeypatch.setattr('getdera.pipeline._read_period', _read_period)
+    dir = None if in_memory else str(tmp_path / 'data')
+    threads = threading.active_count()
+    with pytest.raises(ValueError, match='unparseable'):
+        get_and_process('risk', dir, 'txt', *DATE_RANGE, rate_limit=100,
+                        queue_size=1)
+    assert threading.active_count() == threads
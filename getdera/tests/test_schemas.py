@@ -0,0 +1,71 @@
+import pytest
+
+from getdera.schemas import DATE_FORMATS
+from getdera.schemas import DERA_SCHEMAS
+from getdera.schemas import get_schema
+from getdera.schemas import split_schema
+
+
+# TESTCASES
+
+TESTCASES = {
+    'get_schema': [
+        {'args': ('statements', 'tag', ['tag', 'version']),
+         'expected': {'custom': 'boolean',
+                      'abstract': 'boolean',
+                      'datatype': 'category',
+                      'iord': 'category',
+                      'crdr': 'category'}},
+        {'args': ('risk', 'pre'),
+         'expected': {}},
+        {'args': ('unknown', 'sub'),
+         'expected': {}},
+    ],
+    'split_schema': [
+        {'args': ({'form': 'category', 'filed': 'date',
+                   'accepted': 'datetime'},),
+         'expected': ({'form': 'category', 'filed': 'Int32',
+                       'accepted': str},
+                      {'filed': DATE_FORMATS['date'],
+                       'accepted': DATE_FORMATS['datetime']})},
+    ],
+}
+
+
+# FIXTURES
+
+@pytest.fixture(scope='function', params=TESTCASES['get_schema'])
+def get_schema_params(request):
+    args = request.param['args']
+    expected = request.param['expected']
+    return args, expected
+
+
+@pytest.fixture(scope='function', params=TESTCASES['split_schema'])
+def split_schema_params(request):
+    args = request.param['args']
+    expected = request.param['expected']
+    return args, expected
+
+
+# UNIT TESTS
+
+def test_get_schema(get_schema_params):
+    args, expected = get_schema_params
+    assert get_schema(*args) == expected
+
+
+def test_split_schema(split_schema_params):
+    args, expected = split_schema_params
+    assert split_schema(*args) == expected
+
+
+def test_schema_dtypes():
+    """Every schema type is a DATE/DATETIME field type or a valid
+    pandas dtype.
+    """
+    import pandas as pd
+    for tables in DERA_SCHEMAS.values():
+        for schema in tables.values():
+            for t in schema.values():
+                assert t in DATE_FORMATS or pd.api.types.pandas_dtype(t)
@@ -0,0 +1,135 @@
+import os
+import shutil
+import pytest
+
+from zipfile import ZipFile
+
+from getdera.dera import process
+from getdera.search import TextIndex
+from getdera.search import tokenize
+
+
+# TESTCASES
+
+ZIPFILES = ['2020q2_notes.zip', '2020q3_notes.zip']
+
+TESTCASES = {
+    'search': [
+        {'args': ('supply chain',),
+         'expected': [('2020q2_notes.zip', 0), ('2020q3_notes.zip', 0)]},
+        {'args': ('Supply-Chain disruption', True),
+         'expected': [('2020q2_notes.zip', 0), ('2020q3_notes.zip', 0)]},
+        {'args': ('chain supply', True),
+         'expected': []},
+        {'args': ('may',),
+         'expected': [('2020q2_notes.zip', 0), ('2020q2_notes.zip', 1)]},
+        {'args': ('affect results', False, ['2020q2_notes.zip']),
+         'expected': [('2020q2_notes.zip', 0)]},
+        {'args': ('cloud revenue',),
+         'expected': []},
+        {'args': ('...',),
+         'expected': []},
+    ],
+    'tokenize': [
+        {'args': (['Supply-chain  disruption, may', None, '', ' Résumé 2'],),
+         'expected': ([0, 0, 0, 0, 3, 3], [0, 1, 2, 3, 0, 1],
+                      ['supply', 'chain', 'disruption', 'may', 'résumé',
+                       '2'])},
+    ],
+}
+
+
+# FIXTURES
+
+@pytest.fixture(scope='function')
+def search_data_directory(dera_data_directory, tmp_path):
+    """Copies the synthetic DERA zipfiles into a fresh directory
+    (so that tests can add and modify them) and returns its path.
+    """
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'data')
+    shutil.copytree(dera_data_directory, path)
+    return path
+
+
+@pytest.fixture(scope='function', params=TESTCASES['search'])
+def search_params(request):
+    args = request.param['args']
+    expected = request.param['expected']
+    return args, expected
+
+
+@pytest.fixture(scope='function', params=TESTCASES['tokenize'])
+def tokenize_params(request):
+    args = request.param['args']
+    expected = request.param['expected']
+    return args, expected
+
+
+# UNIT TESTS
+
+def test_tokenize(tokenize_params):
+    """Splits texts into lowercased terms of letters and digits.
+    """
+    pytest.importorskip('pyarrow')
+    args, (docs, positions, terms) = tokenize_params
+    result = tokenize(*args)
+    assert result[0].tolist() == docs
+    assert result[1].tolist() == positions
+    assert result[2].tolist() == terms
+
+
+def test_search(search_params, search_data_directory, tmp_path):
+    """Returns the rows (and their keys) whose value contains the
+    query's terms, or its phrase.
+    """
+    args, expected = search_params
+    index = TextIndex(str(tmp_path / 'index'), 'statements')
+    index.update([os.path.join(search_data_directory, f) for f in ZIPFILES])
+    result = index.search(*args)
+    assert list(zip(result['period'], result['row'])) == expected
+    assert list(result.columns) == ['period', 'row', 'adsh', 'tag',
+                                    'version']
+    # Reopened index returns the same rows
+    reopened = TextIndex(str(tmp_path / 'index'), 'statements')
+    assert reopened.search(*args).equals(result)
+
+
+def test_search_order(search_data_directory, tmp_path):
+    """Returns rows in period order, whatever the order in which
+    periods were indexed or given.
+    """
+    index = TextIndex(str(tmp_path / 'index'), 'statements')
+    zipfiles = [os.path.join(search_data_directory, f) for f in ZIPFILES]
+    assert index.update(zipfiles[::-1]) == ZIPFILES[::-1]
+    expected = [('2020q2_notes.zip', 0), ('2020q3_notes.zip', 0)]
+    result = index.search('supply chain')
+    assert list(zip(result['period'], result['row'])) == expected
+    result = index.search('supply chain', periods=ZIPFILES[::-1])
+    assert list(zip(result['period'], result['row'])) == expected
+
+
+def test_search_update(search_data_directory, tmp_path):
+    """Indexes only periods that are new or changed since they were
+    indexed, including periods processed with process(text_index=).
+    """
+    index = TextIndex(str(tmp_path / 'index'), 'statements')
+    process(search_data_directory, 'statements', 'sub', '13-03-2020',
+            '13-06-2020', text_index=index)
+    assert list(index.periods) == ZIPFILES[:1]
+    zipfiles = [os.path.join(search_data_directory, f) for f in ZIPFILES]
+    assert index.update(zipfiles) == ZIPFILES[1:]
+    assert index.update(zipfiles) == []
+    assert len(index) == 3
+
+    with ZipFile(zipfiles[1], 'w') as zipObj:
+        zipObj.writestr('txt.tsv', 'adsh\ttag\tversion\tvalue\n'
+                        '0000320193-20-000062\tRiskFactors\tus-gaap/2020\t'
+                        'Pandemic may disrupt supply.\n')
+    index = TextIndex(str(tmp_path / 'index'), 'statements')
+    assert index.search('pandemic').empty
+    assert index.update(zipfiles) == ZIPFILES[1:]
+    result = index.search('may')
+    assert list(zip(result['period'], result['row'])) == \
+        [('2020q2_notes.zip', 0), ('2020q2_notes.zip', 1),
+         ('2020q3_notes.zip', 0)]
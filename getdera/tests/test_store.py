@@ -0,0 +1,120 @@
+import os
+import shutil
+import pytest
+
+from zipfile import ZipFile
+from pandas.testing import assert_frame_equal
+
+from getdera.store import DERAStore
+from getdera.dera import process
+
+
+# TESTCASES
+
+TESTCASES = {
+    'store_read': [
+        {'args': ('risk', 'txt'),
+         'kwargs': {}},
+        {'args': ('risk', 'tag'),
+         'kwargs': {'start_date': '13-09-2019', 'end_date': '13-03-2020'}},
+        {'args': ('statements', 'num'),
+         'kwargs': {'columns': ['value']}},
+        {'args': ('statements', 'dim'),
+         'kwargs': {}},
+        {'args': ('statements', 'sub'),
+         'kwargs': {'start_date': '13-06-2020', 'end_date': '13-08-2020'}},
+        {'args': ('risk', 'sub'),
+         'kwargs': {'end_date': '13-12-2019'}},
+        {'args': ('risk', 'tag'),
+         'kwargs': {'start_date': '13-09-2019'}},
+    ],
+}
+
+DATE_RANGE = {
+    'risk': ('13-06-2019', '13-03-2020'),
+    'statements': ('13-03-2020', '13-08-2020'),
+}
+
+
+# FIXTURES
+
+@pytest.fixture(scope='function')
+def store_data_directory(dera_data_directory, tmp_path):
+    """Copies the synthetic DERA zipfiles into a fresh directory
+    (so that tests can add and modify them) and returns its path.
+    """
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'data')
+    shutil.copytree(dera_data_directory, path)
+    return path
+
+
+@pytest.fixture(scope='function', params=TESTCASES['store_read'])
+def store_read_params(request):
+    args = request.param['args']
+    kwargs = request.param['kwargs']
+    return args, kwargs
+
+
+# UNIT TESTS
+
+def test_store_read(store_read_params, store_data_directory, tmp_path):
+    """Reads stored tables as process does.
+    """
+    (dataset, table), kwargs = store_read_params
+    store = DERAStore(str(tmp_path / 'store'), dataset)
+    store.update(store_data_directory)
+    result = store.read(table, **kwargs)
+    start_date = kwargs.get('start_date', DATE_RANGE[dataset][0])
+    end_date = kwargs.get('end_date', DATE_RANGE[dataset][1])
+    expected = process(store_data_directory, dataset, table, start_date,
+                       end_date, columns=kwargs.get('columns'))
+    assert_frame_equal(result, expected)
+
+
+def test_store_update(store_data_directory, tmp_path):
+    """Ingests only zipfiles that are new or changed since the last
+    update.
+    """
+    path = str(tmp_path / 'store')
+    result = DERAStore(path, 'risk').update(store_data_directory)
+    assert result == ['2019q3_rr1.zip', '2019q4_rr1.zip', '2020q1_rr1.zip']
+    assert DERAStore(path, 'risk').update(store_data_directory) == []
+
+    adsh = '0000000001-01-000009'
+    with ZipFile(os.path.join(store_data_directory, '2019q4_rr1.zip'),
+                 'w') as zipObj:
+        zipObj.writestr('sub.tsv', f'adsh\tdummy_val\n{adsh}\tchanged\n')
+    shutil.copy(os.path.join(store_data_directory, '2020q1_rr1.zip'),
+                os.path.join(store_data_directory, '2020q2_rr1.zip'))
+    store = DERAStore(path, 'risk')
+    assert store.update(store_data_directory) == ['2019q4_rr1.zip',
+                                                  '2020q2_rr1.zip']
+    assert store.periods == ['2019q3_rr1.zip', '2019q4_rr1.zip',
+                             '2020q1_rr1.zip', '2020q2_rr1.zip']
+    sub = store.read('sub', '13-09-2019', '13-12-2019')
+    assert sub['dummy_val'].to_list() == ['changed']
+    assert len(store.read('txt')) == 9
+    with pytest.raises(ValueError):
+        store.read('pre')
+
+    # Other options re-ingest all zipfiles
+    store = DERAStore(path, 'risk', tables=['sub'], schema=False)
+    assert len(store.update(store_data_directory, workers=2)) == 4
+
+
+@pytest.mark.parametrize('columns', [None, ['tag', 'value'], ['tag']])
+def test_store_texts(store_data_directory, tmp_path, columns):
+    """Stores TXT values in text blobs and reads them back as a lazy
+    column of the values stored in Parquet otherwise.
+    """
+    store = DERAStore(str(tmp_path / 'texts'), 'statements', texts=True)
+    store.update(store_data_directory)
+    result = store.read('txt', columns=columns)
+    store = DERAStore(str(tmp_path / 'store'), 'statements')
+    store.update(store_data_directory)
+    expected = store.read('txt', columns=columns)
+    if columns != ['tag']:
+        assert result['value'].dtype == 'text'
+        result['value'] = result['value'].astype(expected['value'].dtype)
+    assert_frame_equal(result, expected)
@@ -0,0 +1,125 @@
+import os
+import pytest
+
+import pandas as pd
+
+from pandas.testing import assert_frame_equal
+
+from getdera.tags import TagDictionary
+from getdera.dera import process
+from getdera.dera import process_iter
+
+
+# TESTCASES
+
+TESTCASES = {
+    'process_tags': [
+        {'args': ('statements', 'num', '13-03-2020', '13-08-2020'),
+         'expected': {'tag_id': ('tag', 'version')}},
+        {'args': ('statements', 'pre', '13-03-2020', '13-08-2020'),
+         'expected': {'tag_id': ('tag', 'version')}},
+        {'args': ('statements', 'cal', '13-03-2020', '13-08-2020'),
+         'expected': {'ptag_id': ('ptag', 'pversion'),
+                      'ctag_id': ('ctag', 'cversion')}},
+        {'args': ('risk', 'txt', '13-06-2019', '13-03-2020'),
+         'expected': {}},
+    ],
+    'tags_add_missing': [
+        {'args': (['C', None, 'B'], ['v3', 'v1', None]),
+         'expected': ([2, -1, -1], [('A', 'v1'), ('B', 'v2'), ('C', 'v3')])},
+        {'args': (['A', 'B', 'C'], [None, None, None]),
+         'expected': ([-1, -1, -1], [('A', 'v1'), ('B', 'v2')])},
+    ],
+}
+
+
+# FIXTURES
+
+@pytest.fixture(scope='function')
+def tags_directory(tmp_path):
+    pytest.importorskip('pyarrow')
+    return str(tmp_path / 'tags')
+
+
+@pytest.fixture(scope='function', params=TESTCASES['process_tags'])
+def process_tags_params(request, dera_data_directory):
+    args = (dera_data_directory, *request.param['args'])
+    expected = request.param['expected']
+    return args, expected
+
+
+@pytest.fixture(scope='function', params=TESTCASES['tags_add_missing'])
+def tags_add_missing_params(request):
+    args = request.param['args']
+    expected = request.param['expected']
+    return args, expected
+
+
+# UNIT TESTS
+
+def test_tags_update(dera_data_directory, tags_directory):
+    """Assigns IDs to (tag, version) pairs in order of first appearance
+    across periods. IDs persist and periods already added are skipped.
+    """
+    zipfiles = [os.path.join(dera_data_directory, f)
+                for f in ['2020q2_notes.zip', '2020q3_notes.zip']]
+    tags = TagDictionary(tags_directory, 'statements')
+    tags.update(zipfiles[:1])
+    tags.update(zipfiles)
+    expected = process(dera_data_directory, 'statements', 'tag',
+                       '13-03-2020', '13-08-2020').index.to_frame(index=False)
+    assert_frame_equal(tags.tags, expected, check_dtype=False)
+
+    reloaded = TagDictionary(tags_directory, 'statements')
+    assert reloaded.periods == tags.periods
+    assert reloaded.ids(['Revenues', 'Assets', 'Missing'],
+                        ['us-gaap/2020', 'us-gaap/2019', 'x']).tolist() == \
+        [4, 0, -1]
+    assert reloaded.add(['NewTag', 'Assets'],
+                        ['custom/2020', 'us-gaap/2019']).tolist() == [5, 0]
+    reloaded.update(zipfiles)
+    assert len(TagDictionary(tags_directory, 'statements')) == 6
+
+
+def test_tags_add_missing(tags_add_missing_params, tags_directory):
+    """Pairs with a missing tag or version get ID -1 and are not added
+    (nor collide with other pairs).
+    """
+    args, (ids, pairs) = tags_add_missing_params
+    tags = TagDictionary(tags_directory, 'statements')
+    tags.add(['A', 'B'], ['v1', 'v2'])
+    assert tags.add(*args).tolist() == ids
+    assert list(tags.tags.itertuples(index=False, name=None)) == pairs
+    assert tags.lookup(ids)['tag'].isna().tolist() == \
+        [i == -1 for i in ids]
+
+
+def test_process_tags(process_tags_params, tags_directory):
+    """Replaces (tag, version) column pairs with int32 tag IDs that
+    look up the original tags.
+    """
+    args, expected = process_tags_params
+    tags = TagDictionary(tags_directory, args[1])
+    result = process(*args, tags=tags)
+    strings = process(*args)
+    for id_column, (tag, version) in expected.items():
+        assert result[id_column].dtype == 'int32'
+        assert tag not in result.columns and version not in result.columns
+        looked_up = tags.lookup(result[id_column])
+        assert looked_up['tag'].to_list() == strings[tag].astype(str).to_list()
+        assert looked_up['version'].to_list() == \
+            strings[version].astype(str).to_list()
+    if not expected:
+        assert_frame_equal(result, strings)
+
+
+def test_process_iter_tags(dera_data_directory, tags_directory):
+    """Yields chunks with the same tag IDs as process.
+    """
+    args = (dera_data_directory, 'statements', 'num',
+            '13-03-2020', '13-08-2020')
+    tags = TagDictionary(tags_directory, 'statements')
+    result = pd.concat(process_iter(*args, chunksize=2, tags=tags),
+                       ignore_index=True)
+    expected = process(*args, tags=tags)
+    assert result['tag_id'].to_list() == expected['tag_id'].to_list()
@@ -0,0 +1,119 @@
+import pickle
+import pytest
+
+import numpy as np
+import pandas as pd
+
+from pandas.testing import assert_series_equal
+
+from getdera.texts import TextArray
+from getdera.texts import TextBlob
+from getdera.texts import read_texts
+from getdera.texts import write_texts
+
+
+# TESTCASES
+
+TESTCASES = {
+    'write_texts': [
+        ['Supply chain disruption may affect results.', None,
+         'Cloud revenue growth – €, 日本'],
+        ['', 'a', '', None, None],
+        [],
+    ],
+}
+
+
+# FIXTURES
+
+@pytest.fixture(scope='function')
+def texts_directory(tmp_path):
+    pytest.importorskip('pyarrow')
+    return tmp_path
+
+
+@pytest.fixture(scope='function', params=TESTCASES['write_texts'])
+def write_texts_params(request):
+    return pd.Series(request.param, dtype='str')
+
+
+# UNIT TESTS
+
+def test_write_texts(write_texts_params, texts_directory):
+    """Saves texts as a blob that is memory-mapped back as the same
+    values.
+    """
+    values = write_texts_params
+    path = str(texts_directory / 'txt')
+    result = write_texts(values, path)
+    reloaded = read_texts(path)
+    assert isinstance(reloaded._blobs[0].data, (np.memmap, np.ndarray))
+    for texts in [result, reloaded]:
+        assert len(texts) == len(values)
+        assert_series_equal(pd.Series(texts).astype('str'), values)
+        assert texts.isna().tolist() == values.isna().tolist()
+        assert texts.lengths().tolist() == \
+            [len(v.encode()) if isinstance(v, str) else 0 for v in values]
+
+
+def test_texts_frame(texts_directory):
+    """Filters, sorts and concatenates lazy text columns in DataFrames.
+    Pickled columns refer to their blob's path instead of copying texts.
+    """
+    first = pd.DataFrame({'row': [0, 1, 2], 'value': write_texts(
+        ['lorem', None, 'ipsum'], str(texts_directory / 'first'))})
+    second = pd.DataFrame({'row': [0, 1], 'value': write_texts(
+        ['dolor', 'sit'], str(texts_directory / 'second'))})
+    data = pd.concat([first, second], ignore_index=True)
+    assert data['value'].dtype == 'text'
+    assert data['value'].array.nbytes == 5 * 12
+    result = data[data['row'] > 0].sort_values('value', na_position='first')
+    assert result['value'].to_list()[1:] == ['ipsum', 'sit']
+    assert pd.isna(result['value'].iloc[0])
+    assert (data['value'] == 'dolor').to_list() == \
+        [False, False, False, True, False]
+
+    unpickled = pickle.loads(pickle.dumps(data))
+    assert unpickled['value'].to_list()[2:] == ['ipsum', 'dolor', 'sit']
+    blob = unpickled['value'].array._blobs[1]
+    assert isinstance(blob.data, np.memmap)
+    assert blob.path == str(texts_directory / 'second')
+
+
+def test_texts_operations(write_texts_params, texts_directory):
+    """String methods, equality, fillna and Parquet round trips of lazy
+    text columns (across blobs) return the same as on strings.
+    """
+    values = write_texts_params
+    half = len(values) // 2
+    texts = pd.Series(TextArray._concat_same_type([
+        write_texts(values[:half], str(texts_directory / 'first')),
+        write_texts(values[half:], str(texts_directory / 'second'))]))
+    assert_series_equal(texts.str.contains('a'), values.str.contains('a'))
+    assert_series_equal(texts.str.upper(), values.str.upper())
+    assert_series_equal(texts.str.len(), values.str.len())
+    for other in ['a', '', 'Cloud revenue growth – €, 日本']:
+        assert (texts == other).tolist() == (values == other).tolist()
+    filled = texts.fillna('missing')
+    assert filled.dtype == 'text' and not filled.isna().any()
+    assert_series_equal(filled.astype('str'), values.fillna('missing'))
+
+    path = texts_directory / 'texts.parquet'
+    single = pd.Series(write_texts(values, str(texts_directory / 'all')))
+    for column in [texts, single]:
+        pd.DataFrame({'value': column}).to_parquet(path)
+        result = pd.read_parquet(path)['value']
+        assert result.dtype == 'text'
+        assert_series_equal(result.astype('str'), values, check_names=False)
+
+
+def test_text_blob_in_memory():
+    """Creates lazy columns of texts without a blob on disk.
+    """
+    texts = pd.array(['lorem', np.nan, 'ipsum'], dtype='text')
+    assert isinstance(texts, TextArray)
+    assert texts[0] == 'lorem' and pd.isna(texts[1])
+    assert isinstance(pickle.loads(pickle.dumps(texts))._blobs[0],
+                      TextBlob)
+    assert texts.take([2, -1], allow_fill=True).isna().tolist() == \
+        [False, True]
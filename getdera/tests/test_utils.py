@@ -3,8 +3,15 @@ import os
 import pytest
 import tempfile
 
+import numpy as np
+
+from zipfile import ZipFile
+
 from getdera.utils import unzip
+from getdera.utils import unzip_members
 from getdera.utils import make_path
+from getdera.utils import encode_adsh
+from getdera.utils import decode_adsh
 
 
 # TESTCASES
@@ -21,7 +28,22 @@ TESTCASES = {
     'make_path': [
         {'args': False},
         {'args': str(TEST_DATA_PATH)}
-    ]
+    ],
+    'encode_adsh': [
+        {'args': ['0000320193-20-000052', '0000789019-20-000062'],
+         'expected': [32019320000052, 78901920000062]},
+        {'args': ['9999999999-99-999999', '0000000000-00-000000'],
+         'expected': [999999999999999999, 0]},
+        {'args': [],
+         'expected': []},
+    ],
+    'encode_adsh_error': [
+        {'args': ['0000320193-20-00005']},
+        {'args': ['0000320193-20-0000521']},
+        {'args': ['0000320193_20_000052']},
+        {'args': ['00003201a3-20-000052']},
+        {'args': [None]},
+    ],
 }
 
 
@@ -40,6 +62,19 @@ def make_path_params(request):
     return args
 
 
+@pytest.fixture(scope='function', params=TESTCASES['encode_adsh'])
+def encode_adsh_params(request):
+    args = request.param['args']
+    expected = request.param['expected']
+    return args, expected
+
+
+@pytest.fixture(scope='function', params=TESTCASES['encode_adsh_error'])
+def encode_adsh_error_params(request):
+    args = request.param['args']
+    return args
+
+
 # UNIT TESTS
 
 def test_make_path(make_path_params):
@@ -70,3 +105,34 @@ def test_unzip(unzip_params, tmp_data_directory):
     result = sorted(''.join([str(f) for f in os.listdir(tmpdir)]))
     expected = unzip_params[1]
     assert result == expected
+
+
+def test_unzip_members(dera_data_directory, tmp_path):
+    """Extracts members of several zip files on threads.
+    """
+    zipfiles = sorted(os.listdir(dera_data_directory))
+    members = [(os.path.join(dera_data_directory, z), f, str(tmp_path / z))
+               for z in zipfiles for f in ['sub.tsv', 'txt.tsv']]
+    unzip_members(members, threads=4)
+    for zipfile, filename, path in members:
+        with ZipFile(zipfile, 'r') as zipObj:
+            expected = zipObj.read(filename)
+        with open(os.path.join(path, filename), 'rb') as f:
+            assert f.read() == expected
+
+
+def test_encode_adsh(encode_adsh_params):
+    """Encodes accession numbers as int64 and decodes them losslessly.
+    """
+    adsh, expected = encode_adsh_params
+    result = encode_adsh(adsh)
+    assert result.dtype == np.int64
+    assert result.tolist() == expected
+    assert decode_adsh(result).tolist() == adsh
+
+
+def test_encode_adsh_error(encode_adsh_error_params):
+    """Raises ValueError if an accession number is malformed.
+    """
+    with pytest.raises(ValueError):
+        encode_adsh(encode_adsh_error_params)
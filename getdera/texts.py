@@ -0,0 +1,481 @@
+"""The `texts` module contains a memory-mappable store of the text
+values of DERA TXT tables.
+
+A text blob keeps a column of texts as one contiguous UTF-8 file with
+an int64 offsets array (and a missing value mask) next to it, instead
+of one Python string object per text. Opening a blob memory-maps its
+files, so it loads almost instantly and pages of text are only read
+when accessed. Processes that open (or unpickle) the same blob share
+its pages through the OS page cache, without copying the corpus.
+
+A `TextArray` is a lazy pandas column of positions in one or more
+blobs: filtering, sorting and concatenating a DataFrame only moves
+positions, and texts are decoded when accessed (or converted with
+`astype`). String methods (`Series.str`) and conversion to Arrow (e.g.
+`DataFrame.to_parquet`) read the blobs' buffers directly.
+
+Writing blobs (and string methods) requires the optional `pyarrow`
+dependency.
+"""
+
+import os
+import numbers
+import numpy as np
+import pandas as pd
+
+from pandas.api.extensions import ExtensionArray
+from pandas.api.extensions import ExtensionDtype
+from pandas.api.extensions import register_extension_dtype
+from pandas.api.extensions import take
+from pandas.api.indexers import check_array_indexer
+from typing import Iterable
+from typing import List
+from typing import Tuple
+from typing import Union
+
+from getdera.utils import _import_pyarrow
+
+
+TEXT_BLOB_EXT = '.blob'  # UTF-8 texts
+TEXT_OFFSETS_EXT = '.offsets.npy'  # int64 start of each text, and end
+TEXT_MISSING_EXT = '.missing.npy'  # bool mask of missing texts
+
+
+def _load(path: str) -> np.ndarray:
+    """Memory-maps the array saved (with np.save) at path.
+    """
+    try:
+        return np.load(path, mmap_mode='r')
+    except ValueError:
+        # Empty arrays cannot be memory-mapped
+        return np.load(path)
+
+
+class TextBlob:
+    """Texts stored as one UTF-8 blob with an offsets array.
+
+    Args:
+        data (np.ndarray):
+            uint8 array of UTF-8 encoded texts.
+
+        offsets (np.ndarray):
+            int64 array of the start of each text in data, followed by
+            the end of the last text.
+
+        missing (np.ndarray):
+            Optional; bool mask of missing texts (default none).
+
+        path (str):
+            Optional; path (without extension) the blob was loaded
+            from. Blobs with a path are pickled by path and memory-mapped
+            again when unpickled.
+    """
+
+    def __init__(self,
+                 data: np.ndarray,
+                 offsets: np.ndarray,
+                 missing: np.ndarray = None,
+                 path: str = None):
+        self.data = data
+        self.offsets = offsets
+        self.missing = missing if missing is not None \
+            else np.zeros(len(offsets) - 1, dtype=bool)
+        self.path = path
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __reduce__(self):
+        if self.path is not None:
+            return (TextBlob.open, (self.path,))
+        return (TextBlob, (self.data, self.offsets, self.missing))
+
+    @classmethod
+    def open(cls, path: str) -> 'TextBlob':
+        """Memory-maps the blob saved at path (without extension).
+        """
+        offsets = _load(f'{path}{TEXT_OFFSETS_EXT}')
+        missing = _load(f'{path}{TEXT_MISSING_EXT}')
+        if offsets[-1] > 0:
+            data = np.memmap(f'{path}{TEXT_BLOB_EXT}', dtype=np.uint8,
+                             mode='r')
+        else:
+            data = np.empty(0, dtype=np.uint8)
+        return cls(data, offsets, missing, path)
+
+    @classmethod
+    def from_strings(cls, values: Iterable[str]) -> 'TextBlob':
+        """Returns an in-memory blob of values (None or NaN if missing).
+        """
+        data, offsets, missing = _encode(values)
+        return cls(np.frombuffer(data, dtype=np.uint8), offsets, missing)
+
+    @classmethod
+    def from_arrow(cls, array) -> 'TextBlob':
+        """Returns an in-memory blob of the texts of a pyarrow string
+        array (or chunked array).
+        """
+        data, offsets, missing = _encode_arrow(array)
+        return cls(np.frombuffer(data, dtype=np.uint8), offsets, missing)
+
+    @classmethod
+    def write(cls, values: Iterable[str], path: str) -> 'TextBlob':
+        """Saves values (None or NaN if missing) as a blob at path
+        (without extension) and returns the memory-mapped blob.
+        """
+        data, offsets, missing = _encode(values)
+        for ext, save in [
+                (TEXT_BLOB_EXT, lambda f: f.write(data)),
+                (TEXT_OFFSETS_EXT, lambda f: np.save(f, offsets)),
+                (TEXT_MISSING_EXT, lambda f: np.save(f, missing))]:
+            with open(f'{path}{ext}.tmp', 'wb') as f:
+                save(f)
+            os.replace(f'{path}{ext}.tmp', f'{path}{ext}')
+        return cls.open(path)
+
+    @staticmethod
+    def remove(path: str) -> None:
+        """Removes the blob saved at path (without extension), if any.
+        """
+        for ext in [TEXT_BLOB_EXT, TEXT_OFFSETS_EXT, TEXT_MISSING_EXT]:
+            if os.path.exists(f'{path}{ext}'):
+                os.remove(f'{path}{ext}')
+
+    def to_arrow(self):
+        """Returns the texts as a pyarrow large_string array that shares
+        the blob's buffers (texts are not decoded or copied).
+        """
+        pa = _import_pyarrow('Arrow arrays of texts')
+        validity = None
+        if self.missing.any():
+            validity = pa.array(~np.asarray(self.missing)).buffers()[1]
+        return pa.Array.from_buffers(
+            pa.large_string(), len(self),
+            [validity, pa.py_buffer(np.ascontiguousarray(self.offsets)),
+             pa.py_buffer(self.data)])
+
+    def texts(self, rows: np.ndarray) -> np.ndarray:
+        """Returns the texts at rows as an object array (NaN if
+        missing).
+        """
+        data = memoryview(self.data)
+        offsets = self.offsets
+        missing = self.missing
+        texts = np.empty(len(rows), dtype=object)
+        for i, row in enumerate(rows):
+            texts[i] = np.nan if missing[row] else \
+                str(data[offsets[row]:offsets[row + 1]], 'utf-8')
+        return texts
+
+
+def _encode(values: Iterable[str]) -> Tuple[memoryview, np.ndarray,
+                                            np.ndarray]:
+    """Encodes values with pyarrow into one UTF-8 buffer.
+
+    Returns:
+        data (memoryview) -- UTF-8 encoded texts,
+        offsets (np.ndarray) -- int64 start of each text, and end,
+        missing (np.ndarray) -- bool mask of missing values.
+    """
+    pa = _import_pyarrow('text blobs')
+    if not isinstance(values, (pd.Series, pd.Index, np.ndarray)):
+        values = list(values)
+    return _encode_arrow(
+        pa.array(values, type=pa.large_string(), from_pandas=True))
+
+
+def _encode_arrow(array) -> Tuple[memoryview, np.ndarray, np.ndarray]:
+    """Encodes a pyarrow string array (or chunked array) into one UTF-8
+    buffer. See `_encode`.
+    """
+    pa = _import_pyarrow('text blobs')
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    if array.type != pa.large_string():
+        array = array.cast(pa.large_string())
+    offsets = np.frombuffer(array.buffers()[1], dtype=np.int64)
+    offsets = offsets[array.offset:array.offset + len(array) + 1]
+    start, end = int(offsets[0]), int(offsets[-1])
+    data = array.buffers()[2]
+    data = memoryview(data)[start:end] if data is not None \
+        else memoryview(b'')
+    missing = array.is_null().to_numpy(zero_copy_only=False)
+    return data, offsets - start, missing.astype(bool)
+
+
+def _equal_bytes(data: np.ndarray,
+                 starts: np.ndarray,
+                 target: bytes) -> np.ndarray:
+    """Returns whether the len(target) bytes of data at each of starts
+    are equal to target.
+    """
+    target = np.frombuffer(target, dtype=np.uint8)
+    equal = np.ones(len(starts), dtype=bool)
+    # Compare about 1 MiB of bytes at a time
+    step = max((1 << 20) // max(len(target), 1), 1)
+    for i in range(0, len(starts), step):
+        positions = starts[i:i + step, None] + np.arange(len(target))
+        equal[i:i + step] = (data[positions] == target).all(axis=1)
+    return equal
+
+
+@register_extension_dtype
+class TextDtype(ExtensionDtype):
+    """Dtype of lazy text columns (see `TextArray`).
+    """
+    name = 'text'
+    type = str
+    kind = 'O'
+    na_value = np.nan
+
+    @classmethod
+    def construct_array_type(cls):
+        return TextArray
+
+    def __from_arrow__(self, array) -> 'TextArray':
+        """Returns the texts of a pyarrow string array (e.g. read back
+        by pd.read_parquet) as a lazy column of an in-memory blob.
+        """
+        return TextArray.from_blob(TextBlob.from_arrow(array))
+
+
+class TextArray(ExtensionArray):
+    """Lazy column of texts stored in text blobs.
+
+    Holds the position (blob, row) of each text. Texts are decoded
+    from the blobs when accessed.
+
+    Args:
+        blobs (Tuple[TextBlob]):
+            Blobs of the texts.
+
+        blob (np.ndarray):
+            int32 index in blobs of each text's blob (-1 if missing).
+
+        rows (np.ndarray):
+            int64 row of each text in its blob.
+    """
+
+    def __init__(self,
+                 blobs: Tuple[TextBlob],
+                 blob: np.ndarray,
+                 rows: np.ndarray):
+        self._blobs = tuple(blobs)
+        self._blob = np.asarray(blob, dtype=np.int32)
+        self._rows = np.asarray(rows, dtype=np.int64)
+
+    @classmethod
+    def from_blob(cls, blob: TextBlob, rows: np.ndarray = None) -> 'TextArray':
+        """Returns the texts at rows (default all) of blob.
+        """
+        if rows is None:
+            rows = np.arange(len(blob))
+        rows = np.asarray(rows, dtype=np.int64)
+        return cls((blob,), np.zeros(len(rows), dtype=np.int32), rows)
+
+    @classmethod
+    def _from_sequence(cls, scalars, *, dtype=None, copy=False):
+        if isinstance(scalars, TextArray):
+            return scalars.copy() if copy else scalars
+        return cls.from_blob(TextBlob.from_strings(
+            [None if pd.isna(s) else s for s in scalars]))
+
+    @classmethod
+    def _from_factorized(cls, values, original):
+        return cls._from_sequence(values)
+
+    def _values_for_factorize(self):
+        return self.to_numpy(), np.nan
+
+    @property
+    def dtype(self) -> TextDtype:
+        return TextDtype()
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of the text positions held in memory (texts stay in
+        their blobs).
+        """
+        return self._blob.nbytes + self._rows.nbytes
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, key):
+        if isinstance(key, numbers.Integral):
+            blob = self._blob[key]
+            if blob < 0:
+                return np.nan
+            return self._blobs[blob].texts([self._rows[key]])[0]
+        if not isinstance(key, slice):
+            key = check_array_indexer(self, key)
+        return TextArray(self._blobs, self._blob[key], self._rows[key])
+
+    def __setitem__(self, key, value) -> None:
+        key = check_array_indexer(self, key)
+        scalar = pd.api.types.is_scalar(value)
+        if scalar and pd.isna(value):
+            self._blob[key] = -1
+            return
+        if not isinstance(value, TextArray):
+            value = TextArray._from_sequence([value] if scalar else value)
+        # New texts are kept in their own (in-memory) blob
+        blobs = list(self._blobs)
+        codes, rows = _blob_codes(blobs, value), value._rows
+        if scalar:
+            codes, rows = codes[0], rows[0]
+        self._blob[key] = codes
+        self._rows[key] = rows
+        self._blobs = tuple(blobs)
+
+    def __getattr__(self, name: str):
+        # String methods (Series.str) of a pandas string array of the
+        # texts
+        if name.startswith('_str_'):
+            return getattr(self._str_array(), name)
+        raise AttributeError(f"'{type(self).__name__}' object has no "
+                             f"attribute '{name}'")
+
+    def _str_array(self):
+        """Returns the texts as a pandas string array backed by the
+        blobs' buffers (or, without pyarrow, as decoded objects).
+        """
+        try:
+            array = self.__arrow_array__()
+        except ImportError:
+            return pd.array(self.to_numpy(), dtype=object)
+        return pd.array(array, dtype='str')
+
+    def __eq__(self, other):
+        if not isinstance(other, str):
+            return self.to_numpy() == other
+        # Compare the bytes of texts of the same length, without
+        # decoding texts
+        target = other.encode('utf-8')
+        equal = (self.lengths() == len(target)) & ~self.isna()
+        for i, blob in enumerate(self._blobs):
+            candidates = np.flatnonzero(equal & (self._blob == i))
+            if len(candidates):
+                starts = blob.offsets[self._rows[candidates]]
+                equal[candidates] = _equal_bytes(blob.data, starts, target)
+        return equal
+
+    def __arrow_array__(self, type=None):
+        """Returns the texts as a pyarrow large_string array (e.g. for
+        DataFrame.to_parquet), gathered from the blobs' buffers without
+        decoding texts.
+        """
+        pa = _import_pyarrow('Arrow arrays of texts')
+        missing = self._blob < 0
+        if len(self._blobs) == 1:
+            array = self._blobs[0].to_arrow().take(
+                pa.array(self._rows, mask=missing))
+        else:
+            # Gather the texts of each blob (missing texts last), then
+            # restore their order
+            codes = np.where(missing, len(self._blobs), self._blob)
+            order = np.argsort(codes, kind='stable')
+            counts = np.bincount(codes, minlength=len(self._blobs) + 1)
+            ends = np.cumsum(counts)
+            pieces = [blob.to_arrow().take(pa.array(
+                          self._rows[order[end - count:end]]))
+                      for blob, count, end in zip(self._blobs, counts, ends)]
+            pieces.append(pa.nulls(counts[-1], pa.large_string()))
+            inverse = np.empty(len(self), dtype=np.int64)
+            inverse[order] = np.arange(len(self))
+            array = pa.concat_arrays(pieces).take(pa.array(inverse))
+        if type is not None and type != array.type:
+            array = array.cast(type)
+        return array
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        return np.asarray(self.to_numpy(), dtype=dtype)
+
+    def to_numpy(self, dtype=None, copy=False, na_value=np.nan):
+        """Decodes the texts into an object array (na_value if
+        missing).
+        """
+        texts = np.full(len(self), na_value, dtype=object)
+        for i, blob in enumerate(self._blobs):
+            mask = self._blob == i
+            if mask.any():
+                decoded = blob.texts(self._rows[mask])
+                decoded[pd.isna(decoded)] = na_value
+                texts[mask] = decoded
+        return texts if dtype is None else texts.astype(dtype)
+
+    def isna(self) -> np.ndarray:
+        missing = self._blob < 0
+        for i, blob in enumerate(self._blobs):
+            mask = self._blob == i
+            missing[mask] = blob.missing[self._rows[mask]]
+        return missing
+
+    def lengths(self) -> np.ndarray:
+        """Returns the UTF-8 length in bytes of each text (0 if
+        missing), without decoding the texts.
+        """
+        lengths = np.zeros(len(self), dtype=np.int64)
+        for i, blob in enumerate(self._blobs):
+            mask = self._blob == i
+            rows = self._rows[mask]
+            lengths[mask] = blob.offsets[rows + 1] - blob.offsets[rows]
+        return lengths
+
+    def take(self, indices, allow_fill=False, fill_value=None):
+        if allow_fill and not pd.isna(fill_value):
+            raise ValueError('TextArray can only be filled with missing '
+                             'values')
+        blob = take(self._blob, indices, allow_fill=allow_fill,
+                    fill_value=-1)
+        rows = take(self._rows, indices, allow_fill=allow_fill,
+                    fill_value=0)
+        return TextArray(self._blobs, blob, rows)
+
+    def copy(self) -> 'TextArray':
+        return TextArray(self._blobs, self._blob.copy(), self._rows.copy())
+
+    @classmethod
+    def _concat_same_type(cls, to_concat: List['TextArray']) -> 'TextArray':
+        blobs = []
+        blob = [_blob_codes(blobs, array) for array in to_concat]
+        return cls(blobs,
+                   np.concatenate(blob) if blob else [],
+                   np.concatenate([a._rows for a in to_concat])
+                   if to_concat else [])
+
+
+def _blob_codes(blobs: List[TextBlob], array: TextArray) -> np.ndarray:
+    """Returns the index in blobs of the blob of each of array's texts
+    (-1 if missing). Array's blobs not in blobs are appended to blobs.
+    """
+    codes = []
+    for b in array._blobs:
+        index = next((i for i, other in enumerate(blobs) if other is b),
+                     None)
+        if index is None:
+            index = len(blobs)
+            blobs.append(b)
+        codes.append(index)
+    codes = np.append(np.asarray(codes, dtype=np.int32), -1)
+    return codes[array._blob]
+
+
+def write_texts(values: Union[pd.Series, Iterable[str]],
+                path: str) -> TextArray:
+    """Saves values (e.g. the value column of a TXT table) as a text
+    blob at path (without extension) and returns them as a lazy
+    column of the memory-mapped blob.
+    """
+    return TextArray.from_blob(TextBlob.write(values, path))
+
+
+def read_texts(path: str) -> TextArray:
+    """Memory-maps the text blob saved at path (without extension) and
+    returns its texts as a lazy column.
+    """
+    return TextArray.from_blob(TextBlob.open(path))
+
+
+if __name__ == "__main__":
+    pass
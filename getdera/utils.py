@@ -2,12 +2,16 @@
 """
 
 import os
+import numpy as np
 import pandas as pd
 import dateutil.parser
 
 from datetime import date
 from zipfile import ZipFile
+from concurrent.futures import ThreadPoolExecutor
 
+from typing import Dict
+from typing import Iterable
 from typing import Union
 from typing import List
 from typing import Tuple
@@ -19,6 +23,15 @@ STRFTIME_FORMATS = {
     'year_month': '%Y_%m',
 }  # Striftime formats used in getdera
 
+ADSH_LENGTH = 20  # NNNNNNNNNN-YY-NNNNNN
+ADSH_DASHES = (10, 13)  # Positions of dashes in adsh
+ADSH_DIGITS = [i for i in range(ADSH_LENGTH) if i not in ADSH_DASHES]
+ADSH_POWERS = 10 ** np.arange(len(ADSH_DIGITS) - 1, -1, -1, dtype=np.int64)
+
+# Maximum number of threads decompressing zipfile members (as the
+# default of ThreadPoolExecutor)
+UNZIP_MAX_THREADS = min(32, (os.cpu_count() or 1) + 4)
+
 
 def get_start_end_strftimes(
         start_date: str,
@@ -74,7 +87,47 @@ def get_year_months(
     return year_months
 
 
-def unzip(zipfile: str, filename: Union[str, List[str]], path: str) -> None:
+def _extract(member: Tuple[str, str, str]) -> None:
+    """Extracts a (zipfile, filename, path) member. Each call opens its
+    own handle of the zipfile, so members are read concurrently.
+    """
+    zipfile, filename, path = member
+    with ZipFile(zipfile, 'r') as zipObj:
+        zipObj.extract(filename, path)
+
+
+def unzip_members(members: List[Tuple[str, str, str]],
+                  threads: int = 1) -> None:
+    """Extracts (zipfile, filename, path) members, e.g. members of
+    several zipfiles, on a pool of threads.
+
+    Args:
+        members (List[Tuple[str, str, str]]): 
+            (path to zip file, file to extract, path to save it into).
+        threads (int): 
+            Optional; number of members decompressed concurrently
+            (at most UNZIP_MAX_THREADS). zlib releases the GIL while
+            inflating, so threads decompress in parallel.
+
+    Returns: 
+        None
+    """
+    threads = min(threads, len(members), UNZIP_MAX_THREADS)
+    for path in set(path for _, _, path in members):
+        make_path(path)
+    if threads > 1:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            # Consume results to propagate exceptions
+            list(executor.map(_extract, members))
+    else:
+        for member in members:
+            _extract(member)
+
+
+def unzip(zipfile: str,
+          filename: Union[str, List[str]],
+          path: str,
+          threads: int = 1) -> None:
     """Unzip, extract, and save content of a zip file.
 
     Args:
@@ -84,10 +137,16 @@ def unzip(zipfile: str, filename: Union[str, List[str]], path: str) -> None:
             File(s) to extract from the zip.
         path (str): 
             Path to save extracted files into.
+        threads (int): 
+            Optional; number of files decompressed concurrently.
+            See `unzip_members`.
 
     Returns: 
         None
     """
+    if threads > 1 and isinstance(filename, list):
+        unzip_members([(zipfile, f, path) for f in filename], threads)
+        return
     with ZipFile(zipfile, 'r') as zipObj:
         make_path(path)
         if type(filename) == list:
@@ -97,6 +156,53 @@ def unzip(zipfile: str, filename: Union[str, List[str]], path: str) -> None:
             zipObj.extract(filename, path)
 
 
+def encode_adsh(adsh: Iterable[str]) -> np.ndarray:
+    """Encodes EDGAR accession numbers (adsh) losslessly as 64-bit
+    integers, i.e. the 18 digits of NNNNNNNNNN-YY-NNNNNN read as one
+    integer (filer CIK * 10^8 + year * 10^6 + sequence number).
+
+    Args:
+        adsh (Iterable[str]): 
+            20 character accession numbers.
+
+    Returns:
+        codes (np.ndarray) -- int64 array of encoded accession numbers.
+
+    Raises:
+        ValueError: if any adsh is not of the form NNNNNNNNNN-YY-NNNNNN.
+    """
+    values = np.asarray(adsh, dtype=object).ravel()
+    try:
+        # One extra byte to detect values longer than ADSH_LENGTH
+        chars = values.astype(f'S{ADSH_LENGTH + 1}')
+    except (TypeError, ValueError, UnicodeEncodeError):
+        raise ValueError('Invalid adsh: expected NNNNNNNNNN-YY-NNNNNN')
+    chars = chars.view(np.uint8).reshape(-1, ADSH_LENGTH + 1)
+    digits = chars[:, ADSH_DIGITS].astype(np.int64) - ord('0')
+    if (chars[:, ADSH_DASHES] != ord('-')).any() \
+            or (chars[:, ADSH_LENGTH] != 0).any() \
+            or ((digits < 0) | (digits > 9)).any():
+        raise ValueError('Invalid adsh: expected NNNNNNNNNN-YY-NNNNNN')
+    return digits @ ADSH_POWERS
+
+
+def decode_adsh(codes: Iterable[int]) -> np.ndarray:
+    """Decodes 64-bit integers encoded by `encode_adsh` back into
+    20 character accession numbers.
+
+    Args:
+        codes (Iterable[int]): 
+            Encoded accession numbers.
+
+    Returns:
+        adsh (np.ndarray) -- object array of accession numbers.
+    """
+    codes = np.asarray(codes, dtype=np.int64).reshape(-1, 1)
+    chars = np.full((len(codes), ADSH_LENGTH), ord('-'), dtype=np.uint8)
+    chars[:, ADSH_DIGITS] = codes // ADSH_POWERS % 10 + ord('0')
+    return chars.view(f'S{ADSH_LENGTH}').ravel().astype(str).astype(object)
+
+
 def make_path(path: str) -> str:
     """Make directory.
 
@@ -112,5 +218,38 @@ def make_path(path: str) -> str:
     return path
 
 
+def _fingerprint(zipfile: str) -> Dict[str, int]:
+    """Returns the zipfile's size and modification time, to detect
+    zipfiles that changed since they were read.
+    """
+    stat = os.stat(zipfile)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _period_key(zipfile: str) -> Tuple[int, int]:
+    """Returns the (year, first month) of a DERA dataset zipfile's
+    period (e.g. 2020q2_notes.zip, 2020_10_notes.zip) for sorting.
+    """
+    period = os.path.basename(zipfile).split('_')
+    if 'q' in period[0]:
+        year, quarter = period[0].split('q')
+        return int(year), (int(quarter) - 1) * 3 + 1
+    return int(period[0]), int(period[1])
+
+
+def _import_pyarrow(purpose: str):
+    """Imports the optional pyarrow dependency (with its compute and
+    csv modules) required for purpose.
+    """
+    try:
+        import pyarrow
+        import pyarrow.compute  # noqa: F401 (used as pyarrow.compute)
+        import pyarrow.csv  # noqa: F401 (used as pyarrow.csv)
+    except ImportError as err:
+        raise ImportError(f'pyarrow is required for {purpose}. '
+                          'Install it with `pip install pyarrow`.') from err
+    return pyarrow
+
+
 if __name__ == "__main__":
     pass
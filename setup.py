@@ -38,7 +38,13 @@ setup(
             "responses",
             "check-manifest",
             "wheel",
-        ]
+        ],
+        "async": [
+            "aiohttp",
+        ],
+        "cache": [
+            "pyarrow",
+        ],
     },
     python_requires=">=3.7",
     project_urls={